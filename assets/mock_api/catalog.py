@@ -0,0 +1,189 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "catalog.json"
+)
+
+_TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+_FAMILY_PATTERN = re.compile(r"[A-Z]*")
+
+# A filtered catalog page stops scanning after this many chips and returns
+# what it found with a cursor, so sparse filters can't make one request slow.
+MAX_SCAN_PER_PAGE = 10_000
+
+# Typecodes for the shipping matrix columns, with the matching NumPy dtypes.
+_MATRIX_TYPES = {"days": ("i", "<i4"), "cost_per_unit": ("d", "<f8"), "method": ("i", "<i4")}
+
+
+def normalize_key(value: str) -> str:
+    return value.strip().upper()
+
+
+def chip_family(key: str) -> str:
+    """The leading letters of a chip key: "H100" -> "H", "GB200" -> "GB"."""
+    return _FAMILY_PATTERN.match(key).group()
+
+
+def load_catalog_data(path: Optional[str] = None) -> Dict:
+    """Reads MOCK_CATALOG_PATH, or the bundled data/catalog.json."""
+    path = path or os.getenv("MOCK_CATALOG_PATH") or DEFAULT_CATALOG_PATH
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class Catalog:
+    """
+    Chip and route quotes loaded from a JSON data file into hash indexes.
+
+    Chip lookups try the exact key (or an alias), then each token of the
+    query ("NVIDIA H100 80GB" -> "H100"), then the longest indexed prefix
+    ("H100SXM5" -> "H100"). Each step costs a few dict probes bounded by the
+    length of the query, so lookups stay O(1) however many SKUs are loaded.
+    """
+
+    def __init__(self, data: Dict):
+        self.chips: Dict[str, Dict] = {}
+        self._aliases: Dict[str, str] = {}
+        for entry in data.get("chips", []):
+            quote = {k: v for k, v in entry.items() if k != "aliases"}
+            key = normalize_key(quote["chip"])
+            self.chips[key] = quote
+            for alias in entry.get("aliases", []):
+                self._aliases[normalize_key(alias)] = key
+        self._aliases.update({key: key for key in self.chips})
+        self._max_key_length = max((len(key) for key in self._aliases), default=0)
+
+        # Sorted keys, overall ("") and per family, back the paginated listing.
+        self._listing: Dict[str, List[str]] = {"": sorted(self.chips)}
+        for key in self._listing[""]:
+            self._listing.setdefault(chip_family(key), []).append(key)
+
+        self.routes: Dict[Tuple[str, str], Dict] = {}
+        for entry in data.get("routes", []):
+            origin, dest = normalize_key(entry["origin"]), normalize_key(entry["dest"])
+            self.routes[(origin, dest)] = {
+                "route": f"{origin}-{dest}",
+                **{k: v for k, v in entry.items() if k not in ("origin", "dest")},
+            }
+        self.default_route: Dict = data.get("default_route", {})
+
+    def resolve_chip(self, chip: str) -> Optional[str]:
+        """Returns the catalog key for a chip query, or None if nothing matches."""
+        chip_key = normalize_key(chip)
+        if chip_key in self._aliases:
+            return self._aliases[chip_key]
+
+        for token in _TOKEN_PATTERN.findall(chip_key):
+            if token in self._aliases:
+                return self._aliases[token]
+
+        for length in range(min(len(chip_key), self._max_key_length), 1, -1):
+            key = self._aliases.get(chip_key[:length])
+            if key is not None:
+                return key
+        return None
+
+    def find_chip(self, chip: str) -> Optional[Dict]:
+        key = self.resolve_chip(chip)
+        return dict(self.chips[key]) if key is not None else None
+
+    def list_chips(
+        self,
+        after: Optional[str],
+        limit: int,
+        family: Optional[str] = None,
+        min_availability: int = 0,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of chip quotes in key order, starting after the key `after`.
+        Returns the page and the key to resume after (None on the last page).
+        The resume point is found by binary search, so a page costs the same
+        however deep into the listing it is. A page can come back short when
+        the filter matches few chips; only a None cursor means the end.
+        """
+        keys = self._listing.get(normalize_key(family) if family else "", [])
+        start = bisect.bisect_right(keys, after) if after else 0
+        end = min(len(keys), start + MAX_SCAN_PER_PAGE)
+        page = []
+        for index in range(start, end):
+            quote = self.chips[keys[index]]
+            if quote.get("availability", 0) >= min_availability:
+                page.append(dict(quote))
+                if len(page) == limit:
+                    end = index + 1
+                    break
+        return page, (keys[end - 1] if end < len(keys) else None)
+
+    def find_route(self, origin: str, dest: str) -> Dict:
+        """Returns the route quote, or the default (sea freight) quote for unknown pairs."""
+        quote = self.routes.get((normalize_key(origin), normalize_key(dest)))
+        if quote is not None:
+            return dict(quote)
+        return {"route": f"{origin}-{dest}", **self.default_route}
+
+    def shipping_matrix(self) -> Dict:
+        """
+        The whole route table as dense origin x destination arrays.
+        Each array is row-major little-endian, base64 encoded, and decodes
+        straight into NumPy. Cells without a route have method -1, meaning
+        the default route applies. 'version' is a hash of the content.
+        """
+        origins = sorted({origin for origin, _ in self.routes})
+        destinations = sorted({dest for _, dest in self.routes})
+        methods = sorted({route["method"] for route in self.routes.values()})
+        method_index = {method: index for index, method in enumerate(methods)}
+        row_of = {origin: index for index, origin in enumerate(origins)}
+        column_of = {dest: index for index, dest in enumerate(destinations)}
+
+        size = len(origins) * len(destinations)
+        columns = {
+            name: array(typecode, [-1]) * size
+            for name, (typecode, _) in _MATRIX_TYPES.items()
+        }
+        for (origin, dest), route in self.routes.items():
+            cell = row_of[origin] * len(destinations) + column_of[dest]
+            columns["days"][cell] = route["days"]
+            columns["cost_per_unit"][cell] = route["cost_per_unit"]
+            columns["method"][cell] = method_index[route["method"]]
+
+        arrays = {}
+        for name, values in columns.items():
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays[name] = {
+                "dtype": _MATRIX_TYPES[name][1],
+                "data": base64.b64encode(values.tobytes()).decode("ascii"),
+            }
+
+        payload = {
+            "origins": origins,
+            "destinations": destinations,
+            "methods": methods,
+            "shape": [len(origins), len(destinations)],
+            "arrays": arrays,
+            "default_route": self.default_route,
+        }
+        digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        return {"version": digest[:16], **payload}
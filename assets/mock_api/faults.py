@@ -0,0 +1,167 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+DEFAULT_PROFILES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "fault_profiles.json"
+)
+
+# Requests pick a profile with this header; MOCK_FAULT_PROFILE sets the default.
+PROFILE_HEADER = b"x-mock-profile"
+
+# Never delayed, failed or throttled, so readiness probes stay honest.
+EXEMPT_PATHS = {"/"}
+
+
+def load_fault_profiles(path: Optional[str] = None) -> Dict[str, Dict]:
+    """Reads MOCK_FAULT_PROFILES_PATH, or the bundled data/fault_profiles.json."""
+    path = path or os.getenv("MOCK_FAULT_PROFILES_PATH") or DEFAULT_PROFILES_PATH
+    with open(path, "r") as f:
+        return json.load(f)["profiles"]
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `burst`; each request takes one."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def take(self) -> Optional[int]:
+        """None if the request may proceed, else the seconds to wait (Retry-After)."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return None
+        return max(1, math.ceil((1 - self._tokens) / self.rate))
+
+
+class FaultProfile:
+    """
+    One scenario of vendor misbehaviour. Latency and error settings are keyed
+    by request path, falling back to "default". Latency distributions:
+
+        {"dist": "fixed", "ms": 100}
+        {"dist": "lognormal", "median_ms": 40, "sigma": 0.5}
+        {"dist": "pareto", "scale_ms": 30, "alpha": 1.3}    (heavy tail)
+
+    each optionally capped with "max_ms". The rate limit is one token bucket
+    shared by every request under the profile, like a vendor account quota.
+    """
+
+    def __init__(self, name: str, spec: Dict, rng: random.Random):
+        self.name = name
+        self.latency = spec.get("latency", {})
+        self.errors = spec.get("errors", {})
+        limit = spec.get("rate_limit")
+        self.bucket = (
+            TokenBucket(limit["requests_per_second"], limit.get("burst", 1)) if limit else None
+        )
+        self._rng = rng
+
+    def delay_seconds(self, path: str) -> float:
+        spec = self.latency.get(path, self.latency.get("default"))
+        if not spec:
+            return 0.0
+        dist = spec["dist"]
+        if dist == "fixed":
+            ms = spec["ms"]
+        elif dist == "lognormal":
+            ms = spec["median_ms"] * math.exp(spec["sigma"] * self._rng.gauss(0, 1))
+        elif dist == "pareto":
+            ms = spec["scale_ms"] * self._rng.paretovariate(spec["alpha"])
+        else:
+            raise ValueError(f"Unknown latency distribution: {dist}")
+        return min(ms, spec.get("max_ms", ms)) / 1000
+
+    def error_status(self, path: str) -> Optional[int]:
+        spec = self.errors.get(path, self.errors.get("default"))
+        if not spec or self._rng.random() >= spec["rate"]:
+            return None
+        return self._rng.choice(spec.get("statuses", [503]))
+
+
+class FaultInjector:
+    """Resolves the active profile for a request and decides what happens to it."""
+
+    def __init__(self, profiles: Dict[str, Dict], default: str = "none", seed: int = 7):
+        rng = random.Random(seed)
+        self.profiles = {name: FaultProfile(name, spec, rng) for name, spec in profiles.items()}
+        if default not in self.profiles:
+            raise ValueError(f"Unknown fault profile: {default}")
+        self.default = default
+
+    def profile(self, name: Optional[str]) -> Optional[FaultProfile]:
+        """The named profile (the default when name is empty), or None if unknown."""
+        return self.profiles.get(name or self.default)
+
+    def plan(
+        self, profile: FaultProfile, path: str
+    ) -> Tuple[Optional[int], float, Optional[int]]:
+        """(Retry-After if throttled, delay in seconds, injected error status)."""
+        if path in EXEMPT_PATHS:
+            return None, 0.0, None
+        retry_after = profile.bucket.take() if profile.bucket else None
+        if retry_after is not None:
+            return retry_after, 0.0, None  # Throttled requests are rejected up front
+        return None, profile.delay_seconds(path), profile.error_status(path)
+
+
+class FaultMiddleware:
+    """
+    Plain ASGI middleware applying the injector's plan before the route runs.
+    Requests under a profile with nothing configured pass straight through.
+    """
+
+    def __init__(self, app: Any, injector: FaultInjector):
+        self.app = app
+        self.injector = injector
+
+    async def __call__(self, scope: Dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        name = dict(scope["headers"]).get(PROFILE_HEADER, b"").decode("latin-1")
+        profile = self.injector.profile(name)
+        if profile is None:
+            response = JSONResponse({"detail": f"Unknown mock profile: {name}"}, status_code=400)
+            return await response(scope, receive, send)
+
+        retry_after, delay, error_status = self.injector.plan(profile, scope["path"])
+        if retry_after is not None:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded."},
+                status_code=429,
+                headers={"Retry-After": str(retry_after)},
+            )
+            return await response(scope, receive, send)
+        if delay:
+            await asyncio.sleep(delay)
+        if error_status is not None:
+            response = JSONResponse({"detail": "Injected vendor fault."}, status_code=error_status)
+            return await response(scope, receive, send)
+        await self.app(scope, receive, send)
@@ -0,0 +1,131 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Writes a synthetic catalog for load testing the mock API.
+
+    python generate_catalog.py --chips 5000 --offers 50000 --hubs 500 -o data/catalog_large.json
+    MOCK_CATALOG_PATH=data/catalog_large.json uvicorn main:app
+
+The bundled H100/A100/TW-US entries are kept, so existing flows behave the same.
+"""
+
+import argparse
+import json
+import random
+
+from catalog import DEFAULT_CATALOG_PATH
+
+FAMILIES = ["H", "A", "L", "B", "GB", "MI", "V", "T"]
+VENDORS = ["FastChips_Reseller_LLC", "Legacy_Systems_Inc", "SiliconBrokers", "GridCompute_Surplus"]
+METHODS = [("AIR_FREIGHT_RUSH", 10, 200), ("AIR_FREIGHT", 20, 120), ("STANDARD_SEA", 45, 50)]
+
+
+def generate(
+    chips: int, routes: int, seed: int, offers: int = 0, hubs: int = 0, legs: int = 0
+) -> dict:
+    rng = random.Random(seed)
+    with open(DEFAULT_CATALOG_PATH, "r") as f:
+        data = json.load(f)
+
+    known = {entry["chip"] for entry in data["chips"]}
+    target = len(known) + chips
+    while len(known) < target:
+        name = f"{rng.choice(FAMILIES)}{rng.randint(1, 999)}"
+        if name in known:
+            continue
+        known.add(name)
+        data["chips"].append(
+            {
+                "chip": name,
+                "price": rng.randint(5, 400) * 100,
+                "currency": "USD",
+                "availability": rng.randint(0, 2000),
+                "vendor": rng.choice(VENDORS),
+            }
+        )
+
+    names = sorted(known)
+    for index in range(offers):
+        chip = rng.choice(names)
+        data["offers"].append(
+            {
+                "chip": chip,
+                "offer_id": f"{chip}-SYN{index}",
+                "vendor": rng.choice(VENDORS),
+                "price": rng.randint(5, 400) * 100,
+                "quantity": rng.randint(1, 500),
+                "lead_time_days": rng.randint(1, 45),
+            }
+        )
+
+    pairs = {(entry["origin"], entry["dest"]) for entry in data["routes"]}
+    target = len(pairs) + routes
+    while len(pairs) < target:
+        origin, dest = (f"H{rng.randint(0, 999):03d}" for _ in range(2))
+        if origin == dest or (origin, dest) in pairs:
+            continue
+        pairs.add((origin, dest))
+        method, days, cost = rng.choice(METHODS)
+        data["routes"].append(
+            {
+                "origin": origin,
+                "dest": dest,
+                "days": days + rng.randint(0, 10),
+                "method": method,
+                "cost_per_unit": cost + rng.randint(0, 50),
+            }
+        )
+    # A ring keeps the synthetic hub network connected; random legs add shortcuts.
+    names = [f"X{index:03d}" for index in range(hubs)]
+    edges = list(zip(names, names[1:] + names[:1])) if hubs > 1 else []
+    edges += [tuple(rng.sample(names, 2)) for _ in range(legs if hubs > 1 else 0)]
+    for src, dst in edges:
+        method, days, cost = rng.choice(METHODS)
+        data["legs"].append(
+            {
+                "from": src,
+                "to": dst,
+                "method": method,
+                "days": rng.randint(1, days),
+                "cost_per_unit": rng.randint(5, cost),
+            }
+        )
+    if names:
+        # Link the synthetic network to the bundled one through the US hub.
+        data["legs"].append(
+            {"from": "US", "to": names[0], "method": "AIR_FREIGHT", "days": 3, "cost_per_unit": 30}
+        )
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chips", type=int, default=5000, help="Synthetic SKUs to add")
+    parser.add_argument("--routes", type=int, default=20000, help="Synthetic routes to add")
+    parser.add_argument("--offers", type=int, default=50000, help="Synthetic order book offers")
+    parser.add_argument("--hubs", type=int, default=500, help="Synthetic shipping hubs")
+    parser.add_argument("--legs", type=int, default=5000, help="Synthetic legs between hubs")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("-o", "--output", default="data/catalog_large.json")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as f:
+        json.dump(
+            generate(args.chips, args.routes, args.seed, args.offers, args.hubs, args.legs), f
+        )
+    print(
+        f"✅ Wrote {args.chips} extra chips, {args.routes} extra routes, {args.offers} offers"
+        f" and {args.hubs} hubs with {args.legs} extra legs to {args.output}"
+    )
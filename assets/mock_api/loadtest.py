@@ -0,0 +1,336 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Closed-loop load generator and throughput benchmark for the mock API.
+
+    python loadtest.py --url http://127.0.0.1:8080 --concurrency 64 --duration 20
+    python loadtest.py --workers 1,2,4 --serializers json,orjson -o results.json
+    python loadtest.py --workers 1,4 --baseline results.json
+
+With --workers, a uvicorn server is started on a free port for every worker
+count and serializer combination (MOCK_JSON_RESPONSE selects the serializer).
+Each result records RPS and p50/p95/p99 latency overall and per endpoint;
+--baseline compares against an earlier results file and exits non-zero when
+a matching run lost more than --tolerance of its throughput or p99.
+Requires httpx, which the lab environments install; the orjson and ujson
+serializers need `pip install -e ".[loadtest]"` from the repository root.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import httpx
+
+from catalog import load_catalog_data
+
+DEFAULT_MIX = "spot=50,shipping=25,spot_batch=15,shipping_batch=10"
+BATCH_SIZE = 10
+SERIALIZERS = ("json", "orjson", "ujson")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name} (choose from {list(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def parse_serializers(serializers: str) -> List[str]:
+    """The requested MOCK_JSON_RESPONSE serializers, checked before any server starts."""
+    names = serializers.split(",")
+    unknown = [name for name in names if name not in SERIALIZERS]
+    if unknown:
+        raise ValueError(f"Unknown serializers: {unknown} (choose from {list(SERIALIZERS)})")
+    missing = [
+        name for name in names if name != "json" and importlib.util.find_spec(name) is None
+    ]
+    if missing:
+        raise ValueError(f"Serializers not installed: {missing} (pip install -e '.[loadtest]')")
+    return names
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(latencies: List[float], statuses: Counter, elapsed: float) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(1000 * sum(ordered) / len(ordered), 3) if ordered else 0.0,
+            "p50": round(1000 * percentile(ordered, 0.50), 3),
+            "p95": round(1000 * percentile(ordered, 0.95), 3),
+            "p99": round(1000 * percentile(ordered, 0.99), 3),
+            "max": round(1000 * ordered[-1], 3) if ordered else 0.0,
+        },
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+class Workload:
+    """Builds requests for each endpoint from the catalog's own chips and routes."""
+
+    def __init__(self, data: Dict, seed: int):
+        self.chips = [entry["chip"] for entry in data.get("chips", [])] or ["H100"]
+        self.routes = [
+            {"origin": entry["origin"], "dest": entry["dest"]} for entry in data.get("routes", [])
+        ] or [{"origin": "TW", "dest": "US"}]
+        self.rng = random.Random(seed)
+
+    def spot(self) -> Tuple[str, str, Dict]:
+        return "GET", "/v1/market/spot", {"params": {"chip": self.rng.choice(self.chips)}}
+
+    def shipping(self) -> Tuple[str, str, Dict]:
+        return "GET", "/v1/shipping/estimate", {"params": self.rng.choice(self.routes)}
+
+    def spot_batch(self) -> Tuple[str, str, Dict]:
+        chips = [self.rng.choice(self.chips) for _ in range(BATCH_SIZE)]
+        return "POST", "/v1/market/spot:batch", {"json": {"chips": chips}}
+
+    def shipping_batch(self) -> Tuple[str, str, Dict]:
+        routes = [self.rng.choice(self.routes) for _ in range(BATCH_SIZE)]
+        return "POST", "/v1/shipping/estimate:batch", {"json": {"routes": routes}}
+
+
+ENDPOINTS = {
+    "spot": Workload.spot,
+    "shipping": Workload.shipping,
+    "spot_batch": Workload.spot_batch,
+    "shipping_batch": Workload.shipping_batch,
+}
+
+
+async def run_load(
+    url: str,
+    workload: Workload,
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    headers: Dict[str, str],
+) -> Dict:
+    """
+    `concurrency` virtual users each send one request at a time until the
+    duration ends. Requests finishing during the warmup are not recorded.
+    """
+    names, weights = list(mix), list(mix.values())
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    statuses: Dict[str, Counter] = {name: Counter() for name in names}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=url, headers=headers, limits=limits, timeout=30.0
+    ) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def user() -> None:
+            while True:
+                name = workload.rng.choices(names, weights)[0]
+                method, path, kwargs = ENDPOINTS[name](workload)
+                sent = time.perf_counter()
+                if sent >= stop_at:
+                    return
+                try:
+                    status = (await client.request(method, path, **kwargs)).status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                done = time.perf_counter()
+                if sent >= measure_from:
+                    latencies[name].append(done - sent)
+                    statuses[name][status] += 1
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - max(start, measure_from)
+
+    everything = [value for values in latencies.values() for value in values]
+    result = summarize(everything, sum(statuses.values(), Counter()), elapsed)
+    result["endpoints"] = {
+        name: summarize(latencies[name], statuses[name], elapsed) for name in names
+    }
+    return result
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, server: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Mock API exited with code {server.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).is_success:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Mock API not ready after {timeout}s")
+
+
+def start_server(workers: int, serializer: str) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = dict(os.environ, MOCK_JSON_RESPONSE=serializer)
+    command = f"-m uvicorn main:app --host 127.0.0.1 --port {port} --workers {workers}"
+    server = subprocess.Popen(
+        [sys.executable, *command.split(), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_ready(f"{url}/", server)
+    except RuntimeError:
+        server.kill()
+        raise
+    return server, url
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Regressions of runs that match a baseline run on every setting."""
+    def settings(run: Dict) -> Tuple:
+        return tuple(run["settings"].get(key) for key in sorted(run["settings"]))
+
+    previous = {settings(run): run for run in baseline}
+    regressions = []
+    for run in results:
+        before = previous.get(settings(run))
+        if before is None:
+            continue
+        label = ", ".join(f"{k}={v}" for k, v in run["settings"].items())
+        rps, old_rps = run["rps"], before["rps"]
+        p99, old_p99 = run["latency_ms"]["p99"], before["latency_ms"]["p99"]
+        print(f"   vs baseline [{label}]: rps {old_rps} -> {rps}, p99 {old_p99} -> {p99} ms")
+        if rps < old_rps * (1 - tolerance):
+            regressions.append(f"[{label}] throughput fell from {old_rps} to {rps} rps")
+        if p99 > old_p99 * (1 + tolerance):
+            regressions.append(f"[{label}] p99 rose from {old_p99} to {p99} ms")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Benchmark a running server instead of starting one")
+    parser.add_argument("--workers", default="1", help="Comma-separated uvicorn worker counts")
+    parser.add_argument(
+        "--serializers", default="json", help="Comma-separated: json, orjson, ujson"
+    )
+    parser.add_argument(
+        "--concurrency", default="32", help="Comma-separated virtual user counts"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds discarded per run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight pairs")
+    parser.add_argument("--profile", help="Fault profile to request (X-Mock-Profile)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("-o", "--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+        serializers = parse_serializers(args.serializers)
+    except ValueError as e:
+        parser.error(str(e))
+    headers = {"X-Mock-Profile": args.profile} if args.profile else {}
+    concurrencies = [int(value) for value in args.concurrency.split(",")]
+    if args.url:
+        # The server's own workers and serializer aren't visible from here.
+        servers = [(None, None)]
+    else:
+        servers = [
+            (int(workers), serializer)
+            for workers in args.workers.split(",")
+            for serializer in serializers
+        ]
+
+    results = []
+    for workers, serializer in servers:
+        server, url = (None, args.url) if args.url else start_server(workers, serializer)
+        try:
+            for concurrency in concurrencies:
+                settings = {
+                    "workers": workers,
+                    "serializer": serializer,
+                    "concurrency": concurrency,
+                    "mix": args.mix,
+                    "profile": args.profile,
+                }
+                workload = Workload(load_catalog_data(), args.seed)
+                run = asyncio.run(
+                    run_load(url, workload, mix, concurrency, args.duration, args.warmup, headers)
+                )
+                run = {"settings": settings, **run}
+                results.append(run)
+                latency = run["latency_ms"]
+                print(
+                    f"📈 workers={workers} serializer={serializer} concurrency={concurrency}: "
+                    f"{run['rps']} rps, p50 {latency['p50']} ms, p95 {latency['p95']} ms, "
+                    f"p99 {latency['p99']} ms, statuses {run['statuses']}"
+                )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "python": platform.python_version(),
+                    "host": platform.node(),
+                    "duration_seconds": args.duration,
+                    "runs": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"✅ Wrote {len(results)} runs to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(results, json.load(f)["runs"], args.tolerance)
+        for regression in regressions:
+            print(f"❌ Regression {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,38 +12,116 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from fastapi import FastAPI
+import base64
+import importlib
+import os
+from typing import List, Literal, Optional
 
-app = FastAPI(title="Global GPU Spot Market API", version="1.0.0")
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from catalog import Catalog, load_catalog_data
+from faults import FaultInjector, FaultMiddleware, load_fault_profiles
+from order_book import Market, MarketSimulator
+from orders import OrderDesk
+from price_feed import PriceFeed, SpotTicker
+from routing import HubGraph
+
+def json_response_class(serializer: str) -> type:
+    """
+    JSONResponse, or a subclass rendering with an optional faster encoder
+    (orjson or ujson) so serializers can be compared under load.
+    """
+    if serializer == "json":
+        return JSONResponse
+    if serializer not in ("orjson", "ujson"):
+        raise ValueError(f"Unknown MOCK_JSON_RESPONSE: {serializer}")
+    try:
+        encoder = importlib.import_module(serializer)
+    except ImportError:
+        raise ImportError(f"MOCK_JSON_RESPONSE={serializer} needs `pip install {serializer}`")
+
+    class EncodedJSONResponse(JSONResponse):
+        def render(self, content) -> bytes:
+            encoded = encoder.dumps(content)
+            return encoded if isinstance(encoded, bytes) else encoded.encode("utf-8")
+
+    return EncodedJSONResponse
+
+app = FastAPI(
+    title="Global GPU Spot Market API",
+    version="1.0.0",
+    default_response_class=json_response_class(os.getenv("MOCK_JSON_RESPONSE", "json")),
+)
+
+# Chips and routes are indexed once at startup (MOCK_CATALOG_PATH overrides the data file).
+catalog_data = load_catalog_data()
+catalog = Catalog(catalog_data)
+# Per-chip order books of vendor offers, for quantities one seller can't cover.
+market = Market(catalog, catalog_data)
+# Order lines fill against the books; idempotency keys make resubmission safe.
+order_desk = OrderDesk(market)
+# Multi-leg shipping network; routes from the hot origins are precomputed here.
+hub_graph = HubGraph(catalog_data)
+# The route table is static, so its matrix form is encoded once.
+shipping_matrix = catalog.shipping_matrix()
+# Spot quote changes are pushed to /v1/market/stream subscribers.
+price_feed = PriceFeed(catalog)
+
+# Optionally churn offers in the background to load test fills under updates.
+_updates_per_second = int(os.getenv("MOCK_MARKET_UPDATES_PER_SEC", "0"))
+if _updates_per_second > 0:
+    MarketSimulator(market, _updates_per_second).start()
+
+# Optionally move a random spot price every MOCK_SPOT_TICK_SECONDS.
+_spot_tick_seconds = float(os.getenv("MOCK_SPOT_TICK_SECONDS", "0"))
+if _spot_tick_seconds > 0:
+    SpotTicker(price_feed, _spot_tick_seconds).start()
+
+# Latency, error and rate-limit scenarios; MOCK_FAULT_PROFILE picks the default,
+# and the X-Mock-Profile header overrides it per request.
+fault_injector = FaultInjector(
+    load_fault_profiles(),
+    default=os.getenv("MOCK_FAULT_PROFILE", "none"),
+    seed=int(os.getenv("MOCK_FAULT_SEED", "7")),
+)
+
+app.add_middleware(FaultMiddleware, injector=fault_injector)
 
 @app.get("/")
-def health_check():
+async def health_check():
     return {"status": "online", "service": "Mock Vendor API"}
 
-@app.get("/v1/market/spot")
-def get_spot_price(chip: str):
+class Route(BaseModel):
+    origin: str
+    dest: str = "US"
+
+class SpotBatchRequest(BaseModel):
+    chips: List[str]
+
+class ShippingBatchRequest(BaseModel):
+    routes: List[Route]
+
+class OrderLine(BaseModel):
+    idempotency_key: str = Field(..., min_length=1, max_length=128)
+    chip: str
+    quantity: int = Field(..., gt=0)
+    vendor: Optional[str] = None
+    max_price: Optional[int] = Field(default=None, gt=0)
+
+class OrderBatchRequest(BaseModel):
+    lines: List[OrderLine] = Field(..., min_length=1, max_length=500)
+
+def quote_spot_price(chip: str) -> dict:
     """
     Returns current spot market pricing.
     Design Doc Requirement: Price 10x normal, Limited Availability.
     """
-    chip_key = chip.upper()
-
-    if "H100" in chip_key:
-        return {
-            "chip": "H100",
-            "price": 32000,  # $32k/unit (High price to discourage full buy)
-            "currency": "USD",
-            "availability": 250,  # Only 250 available (Forces use of Internal Stock)
-            "vendor": "FastChips_Reseller_LLC",
-        }
-    elif "A100" in chip_key:
-        return {
-            "chip": "A100",
-            "price": 15000,
-            "availability": 50,
-            "vendor": "Legacy_Systems_Inc",
-        }
-    else:
+    # data/catalog.json prices the H100 at $32k/unit (high, to discourage a full
+    # buy) with only 250 available, which forces use of internal stock.
+    quote = catalog.find_chip(chip)
+    if quote is None:
         # Simulate market scarcity for unknown chips
         return {
             "chip": chip,
@@ -51,24 +129,121 @@ def get_spot_price(chip: str):
             "availability": 0,
             "note": "No stock found in global spot market.",
         }
+    return quote
 
-@app.get("/v1/shipping/estimate")
-def get_shipping_estimate(origin: str, dest: str):
+@app.get("/v1/market/spot")
+async def get_spot_price(chip: str):
+    return quote_spot_price(chip)
+
+@app.post("/v1/market/spot:batch")
+async def get_spot_prices_batch(request: SpotBatchRequest):
+    """
+    Quotes several chips in one round trip, in request order.
+    """
+    return {"quotes": [quote_spot_price(chip) for chip in request.chips]}
+
+def encode_cursor(key: str) -> str:
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.b64decode(cursor, altchars=b"-_", validate=True).decode("utf-8")
+    except ValueError:  # Also covers binascii.Error and UnicodeDecodeError
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+@app.get("/v1/market/catalog")
+async def list_catalog(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    family: Optional[str] = None,
+    min_availability: int = Query(0, ge=0),
+    fields: Optional[str] = None,
+):
+    """
+    Lists the chips on sale, `limit` at a time in chip order. Pass the
+    returned next_cursor to get the following page; it is null on the last.
+    family filters by model family ("H", "A", "MI"), and fields (e.g.
+    "price,availability") trims each item to those fields plus chip.
+    """
+    items, last_key = catalog.list_chips(
+        decode_cursor(cursor) if cursor else None, limit, family, min_availability
+    )
+    if fields:
+        keep = {"chip", *(field.strip() for field in fields.split(","))}
+        items = [{k: v for k, v in item.items() if k in keep} for item in items]
+    return {
+        "items": items,
+        "next_cursor": encode_cursor(last_key) if last_key is not None else None,
+    }
+
+@app.get("/v1/market/stream")
+async def stream_spot_prices(request: Request):
+    """
+    Server-sent events: a 'snapshot' event per chip on connect, then a 'tick'
+    event with the new quote whenever a spot price changes.
+    """
+    return StreamingResponse(
+        price_feed.events(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+@app.get("/v1/market/fill")
+async def get_fill_quote(chip: str, qty: int = Query(..., gt=0)):
+    """
+    Returns the cheapest ladder of vendor offers that fills `qty` units,
+    walking the chip's order book from the lowest ask up.
+    """
+    return market.quote_fill(chip, qty)
+
+@app.post("/v1/orders:batch")
+async def place_orders_batch(request: OrderBatchRequest):
+    """
+    Places several order lines in one round trip and confirms each, in
+    request order. A line resubmitted with the same idempotency_key returns
+    its original confirmation (replayed=true) instead of ordering again.
+    """
+    lines = [line.model_dump(exclude_none=True) for line in request.lines]
+    return {"confirmations": order_desk.submit(lines)}
+
+def quote_shipping(origin: str, dest: str) -> dict:
     """
     Returns shipping timeframes.
     """
-    # Simulate different shipping routes
-    if origin.upper() == "TW" and dest.upper() == "US":
-        return {
-            "route": "TW-US",
-            "days": 14,
-            "method": "AIR_FREIGHT_RUSH",
-            "cost_per_unit": 150,
-        }
-    else:
-        return {
-            "route": f"{origin}-{dest}",
-            "days": 45,
-            "method": "STANDARD_SEA",
-            "cost_per_unit": 50,
-        }
+    return catalog.find_route(origin, dest)
+
+@app.get("/v1/shipping/estimate")
+async def get_shipping_estimate(origin: str, dest: str):
+    return quote_shipping(origin, dest)
+
+@app.get("/v1/shipping/matrix")
+async def get_shipping_matrix(
+    response: Response, if_none_match: Optional[str] = Header(default=None)
+):
+    """
+    Returns the full origin x destination route table as compact arrays,
+    so clients can answer estimates locally. Revalidate with If-None-Match.
+    """
+    etag = f'"{shipping_matrix["version"]}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return shipping_matrix
+
+@app.post("/v1/shipping/estimate:batch")
+async def get_shipping_estimates_batch(request: ShippingBatchRequest):
+    """
+    Quotes several routes in one round trip, in request order.
+    """
+    return {
+        "quotes": [quote_shipping(route.origin, route.dest) for route in request.routes]
+    }
+
+@app.get("/v1/shipping/route")
+async def get_shipping_route(
+    origin: str, dest: str = "US", optimize: Literal["cost", "time"] = "cost"
+):
+    """
+    Plans the cheapest (or fastest) multi-leg route through the hub network.
+    """
+    return hub_graph.plan(origin, dest, optimize)
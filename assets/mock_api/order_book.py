@@ -0,0 +1,237 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from catalog import Catalog, normalize_key
+
+
+@dataclass
+class Offer:
+    offer_id: str
+    vendor: str
+    price: int
+    quantity: int
+    lead_time_days: int
+    version: int = 0
+
+
+class OrderBook:
+    """
+    Ask side of one chip's market: a min-heap of (price, lead time) with lazy
+    deletion. Updates push a new heap entry and orphan the old one, so both
+    updates and removals are O(log n). A fill pops the k cheapest live offers
+    and pushes them back, O(k log n); orphaned entries it meets are dropped.
+    """
+
+    def __init__(self):
+        self.offers: Dict[str, Offer] = {}
+        self._heap: List[Tuple[int, int, int, str, int]] = []
+        self._versions = itertools.count(1)
+        self._sequence = itertools.count()  # FIFO tie-break between equal asks
+        self._lock = threading.Lock()
+
+    def upsert(self, offer: Offer) -> None:
+        with self._lock:
+            offer.version = next(self._versions)
+            self.offers[offer.offer_id] = offer
+            if offer.quantity > 0:
+                heapq.heappush(
+                    self._heap,
+                    (
+                        offer.price,
+                        offer.lead_time_days,
+                        next(self._sequence),
+                        offer.offer_id,
+                        offer.version,
+                    ),
+                )
+            self._compact()
+
+    def remove(self, offer_id: str) -> None:
+        with self._lock:
+            self.offers.pop(offer_id, None)
+            self._compact()
+
+    def _is_live(self, entry: Tuple[int, int, int, str, int]) -> bool:
+        offer = self.offers.get(entry[3])
+        return offer is not None and offer.version == entry[4] and offer.quantity > 0
+
+    def _compact(self) -> None:
+        """Rebuilds the heap once orphaned entries outnumber live offers."""
+        if len(self._heap) > 2 * len(self.offers) + 64:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+
+    def fill(self, quantity: int) -> List[Dict]:
+        """Cheapest ladder of offers covering `quantity` (partial if liquidity runs out)."""
+        ladder, taken = [], []
+        remaining = quantity
+        with self._lock:
+            while remaining > 0 and self._heap:
+                entry = heapq.heappop(self._heap)
+                if not self._is_live(entry):
+                    continue
+                taken.append(entry)
+                offer = self.offers[entry[3]]
+                size = min(remaining, offer.quantity)
+                remaining -= size
+                ladder.append(
+                    {
+                        "offer_id": offer.offer_id,
+                        "vendor": offer.vendor,
+                        "price": offer.price,
+                        "quantity": size,
+                        "lead_time_days": offer.lead_time_days,
+                    }
+                )
+            # Quoting doesn't consume liquidity; put the offers back.
+            for entry in taken:
+                heapq.heappush(self._heap, entry)
+        return ladder
+
+    def take(
+        self, quantity: int, vendor: Optional[str] = None, max_price: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Like fill(), but consumes the liquidity it takes, optionally only from
+        one vendor and at or below max_price. Sold-out offers stay out of the
+        heap until an update restocks them.
+        """
+        ladder, skipped = [], []
+        remaining = quantity
+        with self._lock:
+            while remaining > 0 and self._heap:
+                entry = self._heap[0]
+                if max_price is not None and entry[0] > max_price:
+                    break  # Every remaining ask is dearer
+                heapq.heappop(self._heap)
+                if not self._is_live(entry):
+                    continue
+                offer = self.offers[entry[3]]
+                if vendor is not None and offer.vendor != vendor:
+                    skipped.append(entry)
+                    continue
+                size = min(remaining, offer.quantity)
+                remaining -= size
+                offer.quantity -= size
+                if offer.quantity > 0:
+                    heapq.heappush(self._heap, entry)
+                ladder.append(
+                    {
+                        "offer_id": offer.offer_id,
+                        "vendor": offer.vendor,
+                        "price": offer.price,
+                        "quantity": size,
+                        "lead_time_days": offer.lead_time_days,
+                    }
+                )
+            for entry in skipped:
+                heapq.heappush(self._heap, entry)
+        return ladder
+
+
+class Market:
+    """Order books for every chip in the catalog, seeded from its offers."""
+
+    def __init__(self, catalog: Catalog, data: Dict):
+        self.catalog = catalog
+        self.books: Dict[str, OrderBook] = {}
+
+        # Each catalog quote is also the best ask of its chip's book.
+        for key, quote in catalog.chips.items():
+            if quote.get("availability"):
+                self._book(key).upsert(
+                    Offer(
+                        offer_id=f"{key}-{quote['vendor']}",
+                        vendor=quote["vendor"],
+                        price=quote["price"],
+                        quantity=quote["availability"],
+                        lead_time_days=quote.get("lead_time_days", 3),
+                    )
+                )
+
+        for entry in data.get("offers", []):
+            key = normalize_key(entry["chip"])
+            self._book(key).upsert(
+                Offer(
+                    offer_id=entry.get("offer_id", f"{key}-{entry['vendor']}"),
+                    vendor=entry["vendor"],
+                    price=entry["price"],
+                    quantity=entry["quantity"],
+                    lead_time_days=entry["lead_time_days"],
+                )
+            )
+
+    def _book(self, key: str) -> OrderBook:
+        if key not in self.books:
+            self.books[key] = OrderBook()
+        return self.books[key]
+
+    def quote_fill(self, chip: str, quantity: int) -> Dict:
+        key = self.catalog.resolve_chip(chip)
+        book = self.books.get(key) if key is not None else None
+        fills = book.fill(quantity) if book is not None else []
+
+        filled = sum(fill["quantity"] for fill in fills)
+        total_cost = sum(fill["price"] * fill["quantity"] for fill in fills)
+        return {
+            "chip": key or chip,
+            "requested": quantity,
+            "filled": filled,
+            "complete": filled >= quantity,
+            "total_cost": total_cost,
+            "average_price": round(total_cost / filled, 2) if filled else 0,
+            "max_lead_time_days": max((f["lead_time_days"] for f in fills), default=0),
+            "fills": fills,
+        }
+
+
+class MarketSimulator(threading.Thread):
+    """Background ticker that reprices and resizes random offers, for load tests."""
+
+    def __init__(self, market: Market, updates_per_second: int, seed: int = 7):
+        super().__init__(name="market-simulator", daemon=True)
+        self.market = market
+        self.updates_per_second = updates_per_second
+        self._rng = random.Random(seed)
+
+    def run(self) -> None:
+        ticks_per_second = 10
+        batch = max(1, self.updates_per_second // ticks_per_second)
+        offer_refs = [
+            (book, offer_id)
+            for book in self.market.books.values()
+            for offer_id in list(book.offers)
+        ]
+        while True:
+            for _ in range(batch):
+                book, offer_id = self._rng.choice(offer_refs)
+                offer = book.offers[offer_id]
+                book.upsert(
+                    Offer(
+                        offer_id=offer.offer_id,
+                        vendor=offer.vendor,
+                        price=max(1, int(offer.price * self._rng.uniform(0.98, 1.02))),
+                        quantity=max(0, offer.quantity + self._rng.randint(-10, 10)),
+                        lead_time_days=offer.lead_time_days,
+                    )
+                )
+            time.sleep(1 / ticks_per_second)
@@ -0,0 +1,89 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+from order_book import Market
+
+# Confirmations remembered for replay; the oldest keys are forgotten first.
+IDEMPOTENCY_WINDOW = 100_000
+
+
+class OrderDesk:
+    """
+    Places order lines against the market's order books. Each line carries an
+    idempotency key: the first submission executes and its confirmation is
+    stored, and any later submission with the same key gets that confirmation
+    back (marked replayed) without touching the books again. Reusing a key
+    for a different line is rejected.
+    """
+
+    def __init__(self, market: Market):
+        self.market = market
+        self._confirmations: "OrderedDict[str, Dict]" = OrderedDict()
+        self._order_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, lines: List[Dict]) -> List[Dict]:
+        """Per-line confirmations, in request order."""
+        return [self._submit_line(line) for line in lines]
+
+    def _submit_line(self, line: Dict) -> Dict:
+        key = line["idempotency_key"]
+        with self._lock:
+            previous = self._confirmations.get(key)
+            if previous is not None:
+                self._confirmations.move_to_end(key)
+                if previous["line"] != line:
+                    return {
+                        "idempotency_key": key,
+                        "status": "rejected",
+                        "note": "Idempotency key was already used for a different order line.",
+                    }
+                return {**previous["confirmation"], "replayed": True}
+
+            confirmation = self._place(line)
+            self._confirmations[key] = {"line": line, "confirmation": confirmation}
+            if len(self._confirmations) > IDEMPOTENCY_WINDOW:
+                self._confirmations.popitem(last=False)
+        return {**confirmation, "replayed": False}
+
+    def _place(self, line: Dict) -> Dict:
+        result = {
+            "idempotency_key": line["idempotency_key"],
+            "chip": line["chip"],
+            "requested": line["quantity"],
+        }
+        key = self.market.catalog.resolve_chip(line["chip"])
+        book = self.market.books.get(key) if key is not None else None
+        if book is None:
+            note = "No stock found in global spot market."
+            return {**result, "status": "rejected", "note": note}
+
+        fills = book.take(line["quantity"], line.get("vendor"), line.get("max_price"))
+        filled = sum(fill["quantity"] for fill in fills)
+        if not filled:
+            return {**result, "chip": key, "status": "rejected", "note": "No matching offers."}
+        return {
+            **result,
+            "chip": key,
+            "status": "confirmed" if filled >= line["quantity"] else "partial",
+            "order_id": f"ORD-{next(self._order_ids):08d}",
+            "filled": filled,
+            "total_cost": sum(fill["price"] * fill["quantity"] for fill in fills),
+            "fills": fills,
+        }
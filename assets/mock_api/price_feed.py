@@ -0,0 +1,96 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import itertools
+import json
+import random
+import threading
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict
+
+from catalog import Catalog
+
+# A comment line is sent this often so clients can tell a quiet stream from a dead one.
+HEARTBEAT_SECONDS = 15
+
+
+def format_event(event: str, sequence: int, data: Dict) -> str:
+    return f"id: {sequence}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class PriceFeed:
+    """
+    Publishes spot quote changes to server-sent event subscribers.
+    Every subscriber first gets a 'snapshot' event per chip, then a 'tick'
+    event whenever a quote changes. publish() may be called from any thread.
+    """
+
+    def __init__(self, catalog: Catalog):
+        self.catalog = catalog
+        self._sequence = itertools.count(1)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, key: str, quote: Dict) -> None:
+        """Replaces a chip's spot quote and fans the change out to subscribers."""
+        with self._lock:
+            self.catalog.chips[key] = quote
+            event = format_event("tick", next(self._sequence), quote)
+            for loop, queue in self._subscribers:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    async def events(self, is_disconnected: Callable[[], Awaitable[bool]]) -> AsyncIterator[str]:
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.add(subscriber)
+            sequence = next(self._sequence)
+            snapshot = [
+                format_event("snapshot", sequence, quote)
+                for quote in self.catalog.chips.values()
+            ]
+
+        try:
+            for event in snapshot:
+                yield event
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+class SpotTicker(threading.Thread):
+    """Background random walk of spot prices and availability, published as ticks."""
+
+    def __init__(self, feed: PriceFeed, interval_seconds: float, seed: int = 7):
+        super().__init__(name="spot-ticker", daemon=True)
+        self.feed = feed
+        self.interval_seconds = interval_seconds
+        self._rng = random.Random(seed)
+
+    def run(self) -> None:
+        keys = [key for key, quote in self.feed.catalog.chips.items() if quote.get("price")]
+        while keys:
+            time.sleep(self.interval_seconds)
+            key = self._rng.choice(keys)
+            quote = dict(self.feed.catalog.chips[key])
+            quote["price"] = max(1, round(quote["price"] * self._rng.uniform(0.99, 1.01)))
+            quote["availability"] = max(0, quote["availability"] + self._rng.randint(-5, 5))
+            self.feed.publish(key, quote)
@@ -0,0 +1,107 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from catalog import normalize_key
+
+# What each optimization minimizes first; the other metric breaks ties.
+OBJECTIVES = {"cost": ("cost_per_unit", "days"), "time": ("days", "cost_per_unit")}
+
+# Shortest-path trees kept for origins outside the precomputed hot set.
+TREE_CACHE_SIZE = 256
+
+
+class HubGraph:
+    """
+    Shipping hubs connected by legs, each with a transit time and per-unit cost.
+    Legs run both ways unless marked one_way.
+
+    Routes come from single-source Dijkstra trees. Trees for the hot origins
+    are precomputed at startup for both objectives, and other origins are
+    computed on first use and kept in an LRU cache. A route quote is then a
+    walk back along the tree, proportional to the number of legs.
+    """
+
+    def __init__(self, data: Dict):
+        self.legs: Dict[str, List[Dict]] = {}
+        for entry in data.get("legs", []):
+            src, dst = normalize_key(entry["from"]), normalize_key(entry["to"])
+            leg = {
+                "method": entry["method"],
+                "days": entry["days"],
+                "cost_per_unit": entry["cost_per_unit"],
+            }
+            self.legs.setdefault(src, []).append({"from": src, "to": dst, **leg})
+            if entry.get("one_way"):
+                self.legs.setdefault(dst, [])
+            else:
+                self.legs.setdefault(dst, []).append({"from": dst, "to": src, **leg})
+
+        self._trees = functools.lru_cache(maxsize=TREE_CACHE_SIZE)(self._shortest_path_tree)
+        self.hot_origins = [
+            normalize_key(origin)
+            for origin in data.get("hot_origins", [])
+            if normalize_key(origin) in self.legs
+        ]
+        for origin in self.hot_origins:
+            for objective in OBJECTIVES:
+                self._trees(origin, objective)
+
+    def _shortest_path_tree(
+        self, origin: str, objective: str
+    ) -> Dict[str, Tuple[Tuple[int, int], Optional[Dict]]]:
+        """Dijkstra from origin; maps each reachable hub to (distance, incoming leg)."""
+        primary, secondary = OBJECTIVES[objective]
+        tree = {origin: ((0, 0), None)}
+        heap = [((0, 0), origin)]
+        while heap:
+            distance, hub = heapq.heappop(heap)
+            if distance > tree[hub][0]:
+                continue  # Stale entry; a shorter path was already settled
+            for leg in self.legs.get(hub, []):
+                candidate = (distance[0] + leg[primary], distance[1] + leg[secondary])
+                if leg["to"] not in tree or candidate < tree[leg["to"]][0]:
+                    tree[leg["to"]] = (candidate, leg)
+                    heapq.heappush(heap, (candidate, leg["to"]))
+        return tree
+
+    def plan(self, origin: str, dest: str, objective: str = "cost") -> Dict:
+        """Cheapest (or fastest) multi-leg route, with the legs in travel order."""
+        src, dst = normalize_key(origin), normalize_key(dest)
+        result = {"origin": src, "dest": dst, "optimize": objective}
+        if src not in self.legs or dst not in self.legs:
+            return {**result, "legs": [], "note": "Unknown shipping hub."}
+
+        tree = self._trees(src, objective)
+        if dst not in tree:
+            return {**result, "legs": [], "note": "No route between these hubs."}
+
+        legs = []
+        hub = dst
+        while tree[hub][1] is not None:
+            leg = tree[hub][1]
+            legs.append(leg)
+            hub = leg["from"]
+        legs.reverse()
+
+        return {
+            **result,
+            "route": "-".join([src] + [leg["to"] for leg in legs]),
+            "days": sum(leg["days"] for leg in legs),
+            "cost_per_unit": sum(leg["cost_per_unit"] for leg in legs),
+            "legs": [dict(leg) for leg in legs],
+        }
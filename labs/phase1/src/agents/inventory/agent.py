@@ -13,10 +13,10 @@
 # limitations under the License.
 
 from google.adk import Agent
-from tools.database import DatabaseTools
+from tools.database import create_database_tools
 from utils.config import config
 
-db_tools = DatabaseTools()
+db_tools = create_database_tools()
 
 INVENTORY_SYSTEM_PROMPT = f"""
 You are the Inventory Investigator Agent.
@@ -26,11 +26,12 @@ INSTRUCTIONS:
 1. This is a legacy database with messy names of tables and columns. Use the `explore_schema` tool to learn about the structure of tables `{config.PROJECT_ID}.{config.DATASET_ID}.{config.TABLE_CATALOG}` and `{config.PROJECT_ID}.{config.DATASET_ID}.{config.TABLE_INVENTORY}`.
 2. Use your best judgement to figure out the role of each table and column, and find an optimal way to join these tables.
 3. Write a SQL query for loading the requested inventory data and use the `run_query` tool to execute your query.
+4. If a query may return many rows, use the `fetch_query_page` tool instead and only request the next page (with its `next_page_token`) if you need it.
 """
 
 inventory_agent = Agent(
     name="inventory_agent",
     model=config.MODEL_NAME,
     instruction=INVENTORY_SYSTEM_PROMPT,
-    tools=[db_tools.explore_schema, db_tools.run_query],
+    tools=[db_tools.explore_schema, db_tools.run_query, db_tools.fetch_query_page],
 )
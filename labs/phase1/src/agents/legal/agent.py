@@ -28,13 +28,21 @@ ENVIRONMENT CONTEXT:
 
 CRITICAL RULES:
 1. You NEVER read whole documents. You use 'analyze_contract_clause' to fetch specific sections.
+   When you need several clauses from one document, fetch them together with
+   'analyze_contract_clauses' (one call, one result per clause).
 2. You are looking for 'Exclusivity' clauses (restrictions) and 'Force Majeure' clauses (exceptions).
 3. Interpret 'HOLD_LEGAL' status codes based on contract definitions.
+4. To find which contracts (or vendors) have a kind of clause, use 'search_clauses'
+   across the whole ingested contract corpus; then analyze the documents it names.
 """
 
 legal_agent = Agent(
     name="legal_agent",
     model=config.MODEL_NAME,
     instruction=LEGAL_SYSTEM_PROMPT,
-    tools=[rag_tools.analyze_contract_clause],
+    tools=[
+        rag_tools.analyze_contract_clause,
+        rag_tools.analyze_contract_clauses,
+        rag_tools.search_clauses,
+    ],
 )
@@ -22,11 +22,26 @@ api_tools = LogisticsTools()
 LOGISTICS_SYSTEM_PROMPT = """
 You are the Logistics Manager.
 Your goal is to find real-time pricing and shipping estimates from the external market.
+When you need quotes for more than one chip or route, use fetch_spot_prices_batch
+and estimate_shipping_batch to get them all in a single call.
+When one vendor cannot supply the full quantity, use quote_fill to split the order
+across vendors at the lowest total cost.
+Use plan_route for multi-leg shipping options, optimizing for "cost" or "time".
+If the requested chip is scarce, use find_available_chips to discover alternatives
+in the same family that are in stock.
 """
 
 logistics_agent = Agent(
     name="logistics_agent",
     model=config.MODEL_NAME,
     instruction=LOGISTICS_SYSTEM_PROMPT,
-    tools=[api_tools.fetch_spot_prices, api_tools.estimate_shipping],
+    tools=[
+        api_tools.fetch_spot_prices,
+        api_tools.estimate_shipping,
+        api_tools.fetch_spot_prices_batch,
+        api_tools.estimate_shipping_batch,
+        api_tools.quote_fill,
+        api_tools.plan_route,
+        api_tools.find_available_chips,
+    ],
 )
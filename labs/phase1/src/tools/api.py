@@ -12,26 +12,455 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
+import functools
+import itertools
+import logging
+import numpy as np
 import requests
-from typing import Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from tools.price_book import PriceBook
+from utils.cache import TTLCache
 from utils.config import config
+from utils.http import get_http_session, http_timeout
+
+logger = logging.getLogger(__name__)
+
+SPOT_ENDPOINT = "spot"
+SHIPPING_ENDPOINT = "shipping"
+ROUTE_ENDPOINT = "route"
+
+# Catalog fields find_available_chips asks for (chip is always included).
+CATALOG_FIELDS = ["price", "availability", "vendor"]
+
+# Per-line outcomes of an order submission ("failed" lines never reached the vendor).
+ORDER_STATUSES = ("confirmed", "partial", "rejected", "failed")
+
+
+class QuoteCache:
+    """
+    In-process cache of vendor quotes with a TTL per endpoint.
+    Past its TTL a quote is still served for a grace period while a single
+    background refresh fetches a new one (stale-while-revalidate).
+    """
+
+    FRESH = "fresh"
+    STALE = "stale"
+    MISS = "miss"
+
+    def __init__(self, ttls: Dict[str, float], stale_seconds: float, max_entries: int):
+        """
+        Args:
+            ttls (dict): Seconds a quote stays fresh, per endpoint.
+            stale_seconds (float): How long past its TTL a quote may still be served.
+            max_entries (int): Least recently used quotes are evicted past this size.
+        """
+        self.ttls = ttls
+        self.stale_seconds = stale_seconds
+        self._entries = TTLCache(max_entries=max_entries, ttl_seconds=stale_seconds)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    def lookup(self, endpoint: str, key: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Returns (quote, state), where state is FRESH, STALE or MISS."""
+        entry = self._entries.get(f"{endpoint}:{key}")
+        if entry is None:
+            quote, state = None, self.MISS
+        else:
+            quote, fresh_until = entry
+            quote = dict(quote)
+            state = self.FRESH if time.monotonic() < fresh_until else self.STALE
+
+        counter = {self.FRESH: "hits", self.STALE: "stale_hits", self.MISS: "misses"}
+        with self._lock:
+            self._counters[counter[state]] += 1
+        return quote, state
+
+    def store(self, endpoint: str, key: str, quote: Dict[str, Any]) -> None:
+        ttl = self.ttls[endpoint]
+        self._entries.set(
+            f"{endpoint}:{key}",
+            (dict(quote), time.monotonic() + ttl),
+            ttl_seconds=ttl + self.stale_seconds,
+        )
+
+    def claim_refresh(self, endpoint: str, key: str) -> bool:
+        """True if the caller should refresh this quote (no refresh is in flight)."""
+        with self._lock:
+            if (endpoint, key) in self._refreshing:
+                return False
+            self._refreshing.add((endpoint, key))
+            return True
+
+    def release_refresh(self, endpoint: str, key: str, succeeded: bool) -> None:
+        with self._lock:
+            self._refreshing.discard((endpoint, key))
+            self._counters["refreshes" if succeeded else "refresh_errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus hit_rate (fresh and stale hits over all lookups)."""
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        )
+        return stats
+
+
+class ShippingMatrix:
+    """
+    Local copy of the vendor's full route table (GET /v1/shipping/matrix),
+    decoded into NumPy arrays so estimates are answered without a round trip.
+    """
+
+    def __init__(self, payload: Dict[str, Any], etag: Optional[str]):
+        self.etag = etag
+        self.version = payload["version"]
+        self._rows = {origin: index for index, origin in enumerate(payload["origins"])}
+        self._columns = {
+            dest: index for index, dest in enumerate(payload["destinations"])
+        }
+        self._methods = payload["methods"]
+        self._default_route = payload["default_route"]
+        shape = tuple(payload["shape"])
+        self._arrays = {
+            name: np.frombuffer(base64.b64decode(column["data"]), dtype=column["dtype"])
+            .reshape(shape)
+            for name, column in payload["arrays"].items()
+        }
+
+    def estimate(self, origin: str, destination: str) -> Optional[Dict[str, Any]]:
+        """
+        Same response as GET /v1/shipping/estimate, from the local arrays.
+        None if the matrix does not list the origin or destination: the
+        vendor may still know it, so callers ask the estimate endpoint.
+        """
+        origin_key, dest_key = origin.strip().upper(), destination.strip().upper()
+        row, column = self._rows.get(origin_key), self._columns.get(dest_key)
+        if row is None or column is None:
+            return None
+        method = int(self._arrays["method"][row, column])
+        if method < 0:  # -1 marks pairs without a route of their own
+            return {"route": f"{origin}-{destination}", **self._default_route}
+        cost = float(self._arrays["cost_per_unit"][row, column])
+        return {
+            "route": f"{origin_key}-{dest_key}",
+            "days": int(self._arrays["days"][row, column]),
+            "method": self._methods[method],
+            "cost_per_unit": int(cost) if cost.is_integer() else cost,
+        }
 
 
 class LogisticsTools:
     def __init__(self):
         self.base_url = config.API_BASE_URL
+        self.session = get_http_session()
+
+        self._quotes = None
+        if config.QUOTE_CACHE_ENABLED:
+            self._quotes = QuoteCache(
+                ttls={
+                    SPOT_ENDPOINT: config.SPOT_PRICE_TTL_SECONDS,
+                    SHIPPING_ENDPOINT: config.SHIPPING_QUOTE_TTL_SECONDS,
+                    ROUTE_ENDPOINT: config.SHIPPING_QUOTE_TTL_SECONDS,
+                },
+                stale_seconds=config.QUOTE_STALE_SECONDS,
+                max_entries=config.QUOTE_CACHE_MAX_ENTRIES,
+            )
+        self._refresher = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="quote-refresh"
+        )
+        self._order_pipeline = ThreadPoolExecutor(
+            max_workers=config.ORDER_PIPELINE_DEPTH, thread_name_prefix="order-submit"
+        )
+
+        self._matrix: Optional[ShippingMatrix] = None
+        self._matrix_checked_at: Optional[float] = None
+        self._matrix_lock = threading.Lock()
+
+        self.price_book = None
+        if config.PRICE_STREAM_ENABLED and config.API_TRANSPORT != "asgi":
+            self.price_book = PriceBook(self.base_url)
+            self.price_book.start()
+
+    def _get_json(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.session.get(
+            f"{self.base_url}{path}", params=params, timeout=http_timeout()
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.session.post(
+            f"{self.base_url}{path}", json=payload, timeout=http_timeout()
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _parse_routes(routes: List[str]) -> List[Dict[str, str]]:
+        """Turns 'TW-US' style route strings into origin/dest pairs (dest defaults to US)."""
+        parsed = []
+        for route in routes:
+            origin, _, dest = route.partition("-")
+            parsed.append({"origin": origin.strip(), "dest": dest.strip() or "US"})
+        return parsed
+
+    @staticmethod
+    def _chip_key(chip_type: str) -> str:
+        """Chips are cached by their normalized name, as the vendor matches them."""
+        return chip_type.strip().upper()
+
+    @staticmethod
+    def _route_key(origin: str, dest: str) -> str:
+        return f"{origin}-{dest}"
+
+    @staticmethod
+    def _matrix_estimates(
+        matrix: Optional[ShippingMatrix], routes: List[Dict[str, str]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Local estimates for parsed routes; None where the endpoint must be asked."""
+        if matrix is None:
+            return [None] * len(routes)
+        return [matrix.estimate(route["origin"], route["dest"]) for route in routes]
+
+    @staticmethod
+    def _merge_estimates(
+        local: List[Optional[Dict[str, Any]]], fetched: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Fills the gaps in local estimates with fetched quotes, in order."""
+        remote = iter(fetched["quotes"])
+        return {"quotes": [quote if quote is not None else next(remote) for quote in local]}
+
+    @staticmethod
+    def _order_batches(
+        lines: List[Dict[str, Any]], order_ref: str
+    ) -> Tuple[List[str], List[List[Dict[str, Any]]]]:
+        """
+        Each line's idempotency key, and the distinct keyed lines split into
+        ORDER_BATCH_SIZE batches. A line's key is '<order_ref>:<index>' unless
+        it brings its own, so resubmitting an order reuses the same keys.
+        """
+        keys = [
+            str(line.get("idempotency_key") or f"{order_ref}:{index}")
+            for index, line in enumerate(lines)
+        ]
+        unique = {}
+        for key, line in zip(keys, lines):
+            unique.setdefault(key, {**line, "idempotency_key": key})
+        order_lines = list(unique.values())
+        size = config.ORDER_BATCH_SIZE
+        return keys, [order_lines[i : i + size] for i in range(0, len(order_lines), size)]
+
+    @staticmethod
+    def _order_summary(
+        order_ref: str, keys: List[str], results: List[List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Confirmations back in line order, with counts per status and the total
+        cost. A line the API did not confirm is reported as failed.
+        """
+        by_key = {c.get("idempotency_key"): c for result in results for c in result}
+        confirmations = [
+            by_key.get(key)
+            or {"idempotency_key": key, "status": "failed", "note": "No confirmation returned."}
+            for key in keys
+        ]
+        statuses = [confirmation.get("status", "failed") for confirmation in confirmations]
+        return {
+            "order_ref": order_ref,
+            "lines": len(confirmations),
+            **{status: statuses.count(status) for status in ORDER_STATUSES},
+            "total_cost": sum(c.get("total_cost", 0) for c in confirmations),
+            "confirmations": confirmations,
+        }
+
+    @staticmethod
+    def _order_error(error: Exception) -> str:
+        """Why a batch failed: the API's own detail for an HTTP error status."""
+        # requests and httpx errors both carry the response once the server answered.
+        response = getattr(error, "response", None)
+        if response is None:
+            return f"Order API unreachable: {str(error)}"
+        try:
+            body = response.json()
+            detail = body.get("detail", body) if isinstance(body, dict) else body
+        except ValueError:
+            detail = response.text
+        return f"Order API returned {response.status_code}: {detail}"
+
+    @classmethod
+    def _failed_lines(
+        cls, batch: List[Dict[str, Any]], error: Exception
+    ) -> List[Dict[str, Any]]:
+        """Confirmations for a batch that was not placed; safe to resubmit."""
+        note = cls._order_error(error)
+        return [
+            {
+                "idempotency_key": line["idempotency_key"],
+                "chip": line.get("chip"),
+                "status": "failed",
+                "note": note,
+            }
+            for line in batch
+        ]
+
+    def quote_cache_stats(self) -> Dict[str, Any]:
+        """Quote cache counters (hits, stale_hits, misses, refreshes, hit_rate)."""
+        if self._quotes is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._quotes.stats()}
+
+    def _cached_quote(
+        self, endpoint: str, key: str, fetch: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Serves a quote from the cache. Stale quotes are returned immediately
+        and refreshed on a background thread; misses are fetched inline.
+        """
+        if self._quotes is None:
+            return fetch()
+
+        quote, state = self._quotes.lookup(endpoint, key)
+        if state == QuoteCache.STALE and self._quotes.claim_refresh(endpoint, key):
+            self._refresher.submit(self._refresh_quote, endpoint, key, fetch)
+        if quote is not None:
+            return quote
+
+        quote = fetch()
+        self._quotes.store(endpoint, key, quote)
+        return quote
+
+    def _cached_quote_batch(
+        self,
+        endpoint: str,
+        keys: List[str],
+        fetch_one: Callable[[str], Dict[str, Any]],
+        fetch_many: Callable[[List[str]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Serves cached quotes per item and fetches only the misses, in one request."""
+        if self._quotes is None:
+            return fetch_many(keys)
+
+        quotes, missing = {}, []
+        for key in dict.fromkeys(keys):
+            quote, state = self._quotes.lookup(endpoint, key)
+            if state == QuoteCache.STALE and self._quotes.claim_refresh(endpoint, key):
+                self._refresher.submit(
+                    self._refresh_quote, endpoint, key, functools.partial(fetch_one, key)
+                )
+            if quote is None:
+                missing.append(key)
+            else:
+                quotes[key] = quote
+
+        if missing:
+            for key, quote in zip(missing, fetch_many(missing)["quotes"]):
+                self._quotes.store(endpoint, key, quote)
+                quotes[key] = quote
+        return {"quotes": [quotes[key] for key in keys]}
+
+    def _refresh_quote(
+        self, endpoint: str, key: str, fetch: Callable[[], Dict[str, Any]]
+    ) -> None:
+        succeeded = False
+        try:
+            self._quotes.store(endpoint, key, fetch())
+            succeeded = True
+        except Exception as e:
+            logger.warning(f"Background refresh of {endpoint} quote '{key}' failed: {e}")
+        finally:
+            self._quotes.release_refresh(endpoint, key, succeeded)
+
+    def _streamed_quote(self, chip_type: str) -> Optional[Dict[str, Any]]:
+        """The price book's quote when the stream is live, else None (poll instead)."""
+        return self.price_book.get(chip_type) if self.price_book is not None else None
+
+    def _streamed_quotes(self, chip_types: List[str]) -> Optional[Dict[str, Any]]:
+        quotes = [self._streamed_quote(chip_type) for chip_type in chip_types]
+        return {"quotes": quotes} if all(quotes) else None
+
+    def _matrix_is_current(self) -> bool:
+        return (
+            self._matrix_checked_at is not None
+            and time.monotonic() - self._matrix_checked_at
+            < config.SHIPPING_MATRIX_REVALIDATE_SECONDS
+        )
+
+    def _update_matrix(self, payload: Optional[Dict[str, Any]], etag: Optional[str]) -> None:
+        """Applies a matrix response; payload is None for 304 Not Modified."""
+        if payload is not None:
+            self._matrix = ShippingMatrix(payload, etag)
+            logger.info(f"Loaded shipping matrix version {self._matrix.version}")
+        self._matrix_checked_at = time.monotonic()
+
+    def _shipping_matrix(self) -> Optional[ShippingMatrix]:
+        """
+        The local route table, downloaded on first use and revalidated with
+        If-None-Match every SHIPPING_MATRIX_REVALIDATE_SECONDS. None if disabled
+        or not yet downloadable, in which case callers go over the network.
+        """
+        if not config.SHIPPING_MATRIX_ENABLED:
+            return None
+        with self._matrix_lock:
+            if not self._matrix_is_current():
+                headers = {"If-None-Match": self._matrix.etag} if self._matrix else {}
+                try:
+                    response = self.session.get(
+                        f"{self.base_url}/v1/shipping/matrix",
+                        headers=headers,
+                        timeout=http_timeout(),
+                    )
+                    response.raise_for_status()
+                    self._update_matrix(
+                        None if response.status_code == 304 else response.json(),
+                        response.headers.get("ETag"),
+                    )
+                except requests.RequestException as e:
+                    # Keep serving the last copy (if any); try again next interval.
+                    logger.warning(f"Shipping matrix refresh failed: {e}")
+                    self._matrix_checked_at = time.monotonic()
+            return self._matrix
 
     def fetch_spot_prices(self, chip_type: str = "H100") -> Dict[str, Any]:
         """
         Checks the spot market price for a specific chip.
         Endpoint: GET /v1/market/spot?chip=H100 [cite: 97]
         """
+        quote = self._streamed_quote(chip_type)
+        if quote is not None:
+            return quote
         try:
-            response = requests.get(
-                f"{self.base_url}/v1/market/spot", params={"chip": chip_type}
+            chip = self._chip_key(chip_type)
+            return self._cached_quote(
+                SPOT_ENDPOINT,
+                chip,
+                lambda: self._get_json("/v1/market/spot", {"chip": chip}),
             )
-            response.raise_for_status()
-            return response.json()
+        except requests.RequestException as e:
+            return {"error": f"Market API unreachable: {str(e)}"}
+
+    def quote_fill(self, chip_type: str, quantity: int) -> Dict[str, Any]:
+        """
+        Finds the cheapest way to buy `quantity` units of a chip across all
+        spot market vendors. Returns the fill ladder (vendor, price, quantity,
+        lead time per offer), the total cost and whether the order is fully covered.
+        Endpoint: GET /v1/market/fill?chip=H100&qty=200
+        """
+        # Not cached: liquidity changes with every order book update.
+        try:
+            return self._get_json("/v1/market/fill", {"chip": chip_type, "qty": quantity})
         except requests.RequestException as e:
             return {"error": f"Market API unreachable: {str(e)}"}
 
@@ -40,12 +469,182 @@ class LogisticsTools:
         Gets shipping estimates.
         Endpoint: GET /v1/shipping/estimate?origin=TW&dest=US [cite: 99]
         """
+        matrix = self._shipping_matrix()
+        quote = matrix.estimate(origin, destination) if matrix is not None else None
+        if quote is not None:
+            return quote
         try:
-            response = requests.get(
-                f"{self.base_url}/v1/shipping/estimate",
-                params={"origin": origin, "dest": destination},
+            return self._cached_quote(
+                SHIPPING_ENDPOINT,
+                self._route_key(origin, destination),
+                lambda: self._get_json(
+                    "/v1/shipping/estimate", {"origin": origin, "dest": destination}
+                ),
             )
-            response.raise_for_status()
-            return response.json()
         except requests.RequestException as e:
             return {"error": f"Shipping API unreachable: {str(e)}"}
+
+    def plan_route(
+        self, origin: str, destination: str = "US", optimize: str = "cost"
+    ) -> Dict[str, Any]:
+        """
+        Plans a multi-leg shipping route through the carrier hub network.
+        optimize is "cost" (cheapest per unit) or "time" (fewest transit days).
+        Returns the legs in travel order plus total days and cost_per_unit.
+        Endpoint: GET /v1/shipping/route?origin=CN&dest=DE&optimize=time
+        """
+        try:
+            return self._cached_quote(
+                ROUTE_ENDPOINT,
+                f"{self._route_key(origin, destination)}:{optimize}",
+                lambda: self._get_json(
+                    "/v1/shipping/route",
+                    {"origin": origin, "dest": destination, "optimize": optimize},
+                ),
+            )
+        except requests.RequestException as e:
+            return {"error": f"Shipping API unreachable: {str(e)}"}
+
+    def fetch_spot_prices_batch(self, chip_types: List[str]) -> Dict[str, Any]:
+        """
+        Checks the spot market price for several chips in a single request.
+        Endpoint: POST /v1/market/spot:batch {"chips": ["H100", "A100"]}
+        Returns {"quotes": [...]} in the same order as chip_types.
+        """
+        streamed = self._streamed_quotes(chip_types)
+        if streamed is not None:
+            return streamed
+        try:
+            return self._cached_quote_batch(
+                SPOT_ENDPOINT,
+                [self._chip_key(chip_type) for chip_type in chip_types],
+                lambda chip: self._get_json("/v1/market/spot", {"chip": chip}),
+                lambda chips: self._post_json("/v1/market/spot:batch", {"chips": chips}),
+            )
+        except requests.RequestException as e:
+            return {"error": f"Market API unreachable: {str(e)}"}
+
+    def estimate_shipping_batch(self, routes: List[str]) -> Dict[str, Any]:
+        """
+        Quotes shipping for several routes in a single request.
+        Routes are 'ORIGIN-DEST' strings, e.g. ["TW-US", "KR-US"].
+        Endpoint: POST /v1/shipping/estimate:batch
+        Returns {"quotes": [...]} in the same order as routes.
+        """
+        parsed = self._parse_routes(routes)
+        local = self._matrix_estimates(self._shipping_matrix(), parsed)
+        if all(quote is not None for quote in local):
+            return {"quotes": local}
+        try:
+            fetched = self._cached_quote_batch(
+                SHIPPING_ENDPOINT,
+                [
+                    self._route_key(**route)
+                    for route, quote in zip(parsed, local)
+                    if quote is None
+                ],
+                lambda key: self._get_json(
+                    "/v1/shipping/estimate", self._parse_routes([key])[0]
+                ),
+                lambda keys: self._post_json(
+                    "/v1/shipping/estimate:batch", {"routes": self._parse_routes(keys)}
+                ),
+            )
+        except requests.RequestException as e:
+            return {"error": f"Shipping API unreachable: {str(e)}"}
+        return self._merge_estimates(local, fetched)
+
+    @staticmethod
+    def _catalog_params(
+        family: Optional[str],
+        min_availability: int,
+        fields: Optional[List[str]],
+        page_size: Optional[int],
+    ) -> Dict[str, Any]:
+        params = {
+            "limit": page_size or config.CATALOG_PAGE_SIZE,
+            "min_availability": min_availability,
+        }
+        if family:
+            params["family"] = family
+        if fields:
+            params["fields"] = ",".join(fields)
+        return params
+
+    def iter_catalog(
+        self,
+        family: Optional[str] = None,
+        min_availability: int = 0,
+        fields: Optional[List[str]] = None,
+        page_size: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the vendor's catalog items in chip order, fetching one page
+        (GET /v1/market/catalog) only when the previous one is used up, so
+        memory stays at one page however large the catalog is.
+        """
+        params = self._catalog_params(family, min_availability, fields, page_size)
+        cursor = None
+        while True:
+            page = self._get_json(
+                "/v1/market/catalog", {**params, "cursor": cursor} if cursor else params
+            )
+            yield from page["items"]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return
+
+    def find_available_chips(
+        self, family: str = "", min_availability: int = 1, limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Lists chips on sale in the spot market, e.g. to find alternatives when
+        the requested model is scarce. family narrows the list to one model
+        family ("H" for H100/H200, "A" for A100, "MI", ...) and min_availability
+        skips chips with fewer units in stock. Returns up to `limit` chips with
+        their price, availability and vendor.
+        Endpoint: GET /v1/market/catalog?family=H&min_availability=1
+        """
+        limit = max(0, limit)
+        if limit == 0:
+            return {"chips": [], "count": 0}
+        items = self.iter_catalog(
+            family or None,
+            min_availability,
+            fields=CATALOG_FIELDS,
+            page_size=min(limit, config.CATALOG_PAGE_SIZE),
+        )
+        try:
+            chips = list(itertools.islice(items, limit))
+        except requests.RequestException as e:
+            return {"error": f"Market API unreachable: {str(e)}"}
+        return {"chips": chips, "count": len(chips)}
+
+    def submit_orders(self, lines: List[Dict[str, Any]], order_ref: str) -> Dict[str, Any]:
+        """
+        Places order lines with the spot market vendors in as few round trips
+        as possible. Each line is {"chip": "H100", "quantity": 200}, optionally
+        with "vendor" and a per-unit "max_price", e.g. the fills of quote_fill.
+        order_ref (e.g. the PO number) identifies the order: submitting the same
+        order_ref and lines again returns the original confirmations instead
+        of ordering twice, so it is always safe to retry.
+        Endpoint: POST /v1/orders:batch
+        Returns per-line confirmations (status, order_id, filled, total_cost)
+        in line order, with counts per status and the overall total_cost.
+        """
+        keys, batches = self._order_batches(lines, order_ref)
+
+        def submit(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            try:
+                return self._post_json("/v1/orders:batch", {"lines": batch}).get(
+                    "confirmations", []
+                )
+            except requests.RequestException as e:
+                return self._failed_lines(batch, e)
+
+        # Batches are pipelined over the pooled session, ORDER_PIPELINE_DEPTH at a time.
+        if len(batches) <= 1:
+            results = [submit(batch) for batch in batches]
+        else:
+            results = list(self._order_pipeline.map(submit, batches))
+        return self._order_summary(order_ref, keys, results)
@@ -0,0 +1,323 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Ingests a corpus of contract PDFs into a local full-text clause store.
+
+    python -m tools.clause_corpus ../../../assets/docs
+    python -m tools.clause_corpus gs://my-bucket/contracts/ --workers 8
+
+Run from labs/phaseN/src. PDFs are parsed and split into clauses in a
+process pool. A document is only re-parsed when its content hash (MD5)
+changed since the last run, so re-running over an unchanged corpus just
+lists it. Clauses land in an SQLite FTS5 table at CLAUSE_CORPUS_PATH,
+which search_clauses queries.
+"""
+
+import argparse
+import base64
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from tools.clause_index import Clause, extract_pdf_text, split_clauses
+from tools.clause_retrieval import related_words
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+# "VENDOR: NVIDIA CORP | BUYER: ..." in a contract's preamble.
+_VENDOR_PATTERN = re.compile(r"\bVENDOR:\s*([^|\n]+)")
+_QUERY_WORD_PATTERN = re.compile(r"\w+")
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass
+class SourceDocument:
+    name: str
+    content_hash: str
+    load: Callable[[], bytes]
+
+
+def parse_contract(data: bytes) -> Tuple[str, List[Clause]]:
+    """Extracts and splits one PDF. Runs in the ingestion worker processes."""
+    text = extract_pdf_text(data)
+    return text, split_clauses(text)
+
+
+def contract_vendor(text: str) -> str:
+    match = _VENDOR_PATTERN.search(text)
+    return match.group(1).strip() if match else ""
+
+
+def _file_md5(path: str) -> str:
+    """MD5 of a file, read in chunks so listing a corpus never holds a whole PDF."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    # Same encoding as the md5_hash GCS reports, so a file hashes alike in both.
+    return base64.b64encode(digest.digest()).decode("ascii")
+
+
+def list_local_documents(root: str) -> Iterator[SourceDocument]:
+    """
+    PDFs under a local directory, named by their path relative to it. Only
+    documents ingest finds new or changed are read in full.
+    """
+    for directory, _, files in os.walk(root):
+        for filename in sorted(files):
+            if not filename.lower().endswith(".pdf"):
+                continue
+            path = os.path.join(directory, filename)
+            content_hash = _file_md5(path)
+
+            def load(path: str = path) -> bytes:
+                with open(path, "rb") as f:
+                    return f.read()
+
+            yield SourceDocument(os.path.relpath(path, root), content_hash, load)
+
+
+def list_bucket_documents(
+    storage_client, bucket_name: str, prefix: str
+) -> Iterator[SourceDocument]:
+    """PDFs under a bucket prefix, named by blob name (as analyze_contract_clause expects)."""
+    for blob in storage_client.list_blobs(bucket_name, prefix=prefix or None):
+        if blob.name.lower().endswith(".pdf"):
+            yield SourceDocument(
+                blob.name, blob.md5_hash or str(blob.generation), blob.download_as_bytes
+            )
+
+
+class ClauseCorpus:
+    """
+    Clauses of many contracts in one SQLite file: a documents table with each
+    document's vendor and content hash, and an FTS5 table of clauses ranked
+    with BM25 (headings weigh three times as much as clause text).
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_name TEXT PRIMARY KEY,
+                vendor TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                clause_count INTEGER NOT NULL,
+                ingested_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS clauses USING fts5(
+                doc_name UNINDEXED,
+                vendor UNINDEXED,
+                number UNINDEXED,
+                heading,
+                text,
+                tokenize = 'porter unicode61'
+            )
+            """
+        )
+        self._conn.commit()
+
+    def hashes(self) -> Dict[str, str]:
+        """Content hash of every ingested document, by name."""
+        with self._lock:
+            rows = self._conn.execute("SELECT doc_name, content_hash FROM documents").fetchall()
+        return dict(rows)
+
+    def replace(
+        self, doc_name: str, content_hash: str, vendor: str, clauses: List[Clause]
+    ) -> None:
+        """Stores a document's clauses in place of any earlier version."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM clauses WHERE doc_name = ?", (doc_name,))
+            self._conn.executemany(
+                "INSERT INTO clauses (doc_name, vendor, number, heading, text)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(doc_name, vendor, c.number, c.heading, c.text) for c in clauses],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?)",
+                (doc_name, vendor, content_hash, len(clauses), time.time()),
+            )
+
+    def remove(self, doc_names: List[str]) -> None:
+        with self._lock, self._conn:
+            for doc_name in doc_names:
+                self._conn.execute("DELETE FROM clauses WHERE doc_name = ?", (doc_name,))
+                self._conn.execute("DELETE FROM documents WHERE doc_name = ?", (doc_name,))
+
+    def search(
+        self, query: str, vendor: Optional[str] = None, limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Clauses matching any word of the query, or of a legal concept it
+        names ("force majeure" also finds "non-performance"), best first.
+        vendor matches any part of the vendor name, case-insensitively.
+        """
+        words = _QUERY_WORD_PATTERN.findall(query)
+        if not words:
+            return []
+        words += _QUERY_WORD_PATTERN.findall(" ".join(related_words(query)))
+        # Quoted terms keep FTS5 from reading the user's text as query syntax.
+        match = " OR ".join(f'"{word}"' for word in words)
+        sql = (
+            "SELECT doc_name, vendor, number, heading, text, bm25(clauses, 0, 0, 0, 3.0, 1.0)"
+            " FROM clauses WHERE clauses MATCH ?"
+        )
+        params: List[Any] = [match]
+        if vendor:
+            sql += " AND vendor LIKE ?"
+            params.append(f"%{vendor}%")
+        sql += " ORDER BY bm25(clauses, 0, 0, 0, 3.0, 1.0) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                "doc_name": doc_name,
+                "vendor": doc_vendor,
+                "clause": number,
+                "heading": heading,
+                "text": text,
+                # bm25() is lower-is-better; report it as a positive relevance.
+                "score": round(-rank, 4),
+            }
+            for doc_name, doc_vendor, number, heading, text, rank in rows
+        ]
+
+
+def _load(
+    document: SourceDocument,
+) -> Tuple[SourceDocument, Optional[bytes], Optional[Exception]]:
+    try:
+        return document, document.load(), None
+    except Exception as e:
+        return document, None, e
+
+
+def ingest(
+    corpus: ClauseCorpus,
+    documents: Iterator[SourceDocument],
+    workers: Optional[int] = None,
+    prune: bool = False,
+) -> Dict[str, Any]:
+    """
+    Parses the new and changed documents in a process pool and stores their
+    clauses. Downloads run on a thread pool alongside. With prune, documents
+    the corpus holds but the source no longer lists are removed.
+    """
+    known = corpus.hashes()
+    listed, changed = set(), []
+    for document in documents:
+        listed.add(document.name)
+        if known.get(document.name) != document.content_hash:
+            changed.append(document)
+
+    summary: Dict[str, Any] = {
+        "listed": len(listed),
+        "unchanged": len(listed) - len(changed),
+        "ingested": 0,
+        "clauses": 0,
+        "failed": {},
+        "removed": 0,
+    }
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(workers) as downloads, ProcessPoolExecutor(workers) as parsers:
+        futures = {}
+        # A document that cannot be downloaded or read fails alone, like a parse error.
+        for document, data, error in downloads.map(_load, changed):
+            if error is not None:
+                logger.warning(f"Could not load {document.name}: {error}")
+                summary["failed"][document.name] = str(error)
+                continue
+            futures[parsers.submit(parse_contract, data)] = document
+        for future in as_completed(futures):
+            document = futures[future]
+            try:
+                text, clauses = future.result()
+            except Exception as e:
+                logger.warning(f"Could not parse {document.name}: {e}")
+                summary["failed"][document.name] = str(e)
+                continue
+            corpus.replace(document.name, document.content_hash, contract_vendor(text), clauses)
+            summary["ingested"] += 1
+            summary["clauses"] += len(clauses)
+
+    if prune:
+        missing = sorted(set(known) - listed)
+        corpus.remove(missing)
+        summary["removed"] = len(missing)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="Local directory, or gs://bucket/prefix")
+    parser.add_argument("--corpus", default=config.CLAUSE_CORPUS_PATH, help="SQLite file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.CLAUSE_INGEST_WORKERS or None,
+        help="Parser processes (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--prune", action="store_true", help="Drop documents no longer in the source"
+    )
+    args = parser.parse_args()
+
+    if args.source.startswith("gs://"):
+        from google.cloud import storage
+
+        bucket_name, _, prefix = args.source[len("gs://"):].partition("/")
+        documents = list_bucket_documents(storage.Client(), bucket_name, prefix)
+    elif os.path.isdir(args.source):
+        documents = list_local_documents(args.source)
+    else:
+        print(f"❌ Not a directory or gs:// prefix: {args.source}")
+        return 1
+
+    started = time.perf_counter()
+    summary = ingest(ClauseCorpus(args.corpus), documents, args.workers, args.prune)
+    print(
+        f"✅ {summary['listed']} documents listed: {summary['ingested']} ingested "
+        f"({summary['clauses']} clauses), {summary['unchanged']} unchanged, "
+        f"{len(summary['failed'])} failed, {summary['removed']} removed "
+        f"in {time.perf_counter() - started:.1f}s -> {args.corpus}"
+    )
+    for doc_name, error in summary["failed"].items():
+        print(f"❌ {doc_name}: {error}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
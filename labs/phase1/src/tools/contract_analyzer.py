@@ -12,18 +12,92 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
 from google.cloud import storage
 import vertexai
-from vertexai.generative_models import GenerativeModel, Part
+from pydantic import BaseModel
+from vertexai.generative_models import GenerationConfig, GenerativeModel, Part
+from tools.clause_corpus import ClauseCorpus
+from tools.clause_index import (
+    ContractIndexStore,
+    clauses_digest,
+    normalize_clause_type,
+    text_digest,
+)
+from utils.cache import DiskCache
 from utils.config import config
 
+logger = logging.getLogger(__name__)
+
+# Part of every cached analysis key: bump it when the prompt or the excerpt
+# selection changes, so answers produced the old way are no longer served.
+PROMPT_VERSION = 2
+
+
+class ClauseAnalysis(BaseModel):
+    # Position of the clause in the request (1-based), to match answers by.
+    index: Optional[int] = None
+    clause_type: str
+    found: bool
+    quote: str = ""
+    interpretation: str = ""
+
+
+class ClauseAnalyses(BaseModel):
+    """The JSON the model returns for analyze_contract_clauses."""
+
+    clauses: List[ClauseAnalysis]
+
+
+# ClauseAnalyses as a response_schema, so the model's JSON has its shape.
+CLAUSE_ANALYSES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "clauses": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "index": {"type": "integer"},
+                    "clause_type": {"type": "string"},
+                    "found": {"type": "boolean"},
+                    "quote": {"type": "string"},
+                    "interpretation": {"type": "string"},
+                },
+                "required": ["index", "clause_type", "found"],
+            },
+        }
+    },
+    "required": ["clauses"],
+}
+
 
 class ContractAnalyzer:
     def __init__(self):
         vertexai.init(project=config.PROJECT_ID, location=config.REGION)
-        self.model = GenerativeModel("gemini-3-pro-preview")
+        self.model_name = "gemini-3-pro-preview"
+        self.model = GenerativeModel(self.model_name)
+        self._clauses_config = GenerationConfig(
+            response_mime_type="application/json", response_schema=CLAUSE_ANALYSES_SCHEMA
+        )
         self.storage_client = storage.Client()
 
+        # Also tracks contract versions for the analysis cache; the index itself
+        # is only built when CLAUSE_INDEX_ENABLED.
+        self.contracts = ContractIndexStore(
+            self.storage_client, config.BUCKET_NAME, config.CLAUSE_INDEX_DIR or None
+        )
+        self.corpus = ClauseCorpus(config.CLAUSE_CORPUS_PATH)
+        self._analyses = None
+        if config.ANALYSIS_CACHE_ENABLED and config.ANALYSIS_CACHE_DIR:
+            self._analyses = DiskCache(
+                os.path.join(config.ANALYSIS_CACHE_DIR, "clause_analyses.sqlite"),
+                max_entries=config.ANALYSIS_CACHE_MAX_ENTRIES,
+                max_bytes=config.ANALYSIS_CACHE_MAX_BYTES,
+            )
+
     def analyze_contract_clause(self, doc_name: str, clause_type: str) -> str:
         """
         Analyzes the given legal document and extracts the specified clause.
@@ -36,11 +110,242 @@ class ContractAnalyzer:
             str: The extraction and interpretation of the clause.
         """
 
-        gcs_uri = f"gs://{config.BUCKET_NAME}/{doc_name}"
+        try:
+            keys, cached = self._cached_analysis(doc_name, clause_type)
+            if cached is not None:
+                return cached
+
+            excerpt, digests = self._contract_excerpt(doc_name, [clause_type])
+            keys, cached = self._reuse_analysis(keys, digests[0], clause_type)
+            if cached is not None:
+                return cached
+
+            response = self.model.generate_content(
+                self._contents(doc_name, excerpt, self._clause_prompt(clause_type, excerpt))
+            )
+            self._store_analysis(keys, response.text)
+            return response.text
+        except Exception as e:
+            return f"Error analyzing contract: {str(e)}"
+
+    def analyze_contract_clauses(self, doc_name: str, clause_types: List[str]) -> Dict[str, Any]:
+        """
+        Analyzes a legal document for several types of clause in a single pass.
+
+        Args:
+            doc_name (str): The filename in GCS (e.g., 'Master_Supply_Agreement.pdf').
+            clause_types (list[str]): The clauses to look for (e.g., ['Exclusivity', 'Force Majeure']).
+
+        Returns:
+            dict: One entry per clause type, with 'found', the 'quote' and its 'interpretation'.
+        """
+        try:
+            results, missing = self._cached_clause_analyses(doc_name, clause_types)
+            if missing:
+                missing = self._reuse_clause_analyses(doc_name, results, missing)
+            if missing:
+                pending = [clause_type for clause_type, _ in missing.values()]
+                excerpt, _ = self._contract_excerpt(doc_name, pending)
+                response = self.model.generate_content(
+                    self._contents(doc_name, excerpt, self._clauses_prompt(pending, excerpt)),
+                    generation_config=self._clauses_config,
+                )
+                results.update(self._parse_clause_analyses(response.text, missing))
+            return self._clauses_result(doc_name, clause_types, results)
+        except Exception as e:
+            return {"error": f"Error analyzing contract: {str(e)}"}
+
+    def search_clauses(self, query: str, vendor: str = "") -> Dict[str, Any]:
+        """
+        Searches the clauses of every ingested vendor contract at once.
+
+        Args:
+            query (str): Words to look for (e.g., 'force majeure', 'late delivery exceptions').
+            vendor (str): Optional vendor to restrict the search to (e.g., 'NVIDIA').
+
+        Returns:
+            dict: The best matching clauses, each with its document, vendor, number and text.
+        """
+        try:
+            matches = self.corpus.search(query, vendor or None, config.CLAUSE_SEARCH_LIMIT)
+        except Exception as e:
+            return {"error": f"Clause search failed: {str(e)}"}
+
+        result: Dict[str, Any] = {"query": query, "vendor": vendor, "matches": matches}
+        if not matches:
+            result["note"] = (
+                "No matching clauses. Only contracts ingested with "
+                "`python -m tools.clause_corpus` are searchable."
+            )
+        return result
+
+    def _analysis_key(self, source: str, clause_type: str, style: str) -> str:
+        name = normalize_clause_type(clause_type)
+        return "|".join([source, name, self.model_name, style, f"v{PROMPT_VERSION}"])
 
+    def _cached_analysis(
+        self, doc_name: str, clause_type: str, style: str = "text"
+    ) -> Tuple[List[str], Optional[Any]]:
+        """
+        The analysis cache keys for this question about the document's current
+        version, and the cached answer if there is one. No keys when caching
+        is off or the document's version can't be read.
+        """
+        if self._analyses is None:
+            return [], None
+        try:
+            version = self.contracts.version(doc_name)
+        except Exception as e:
+            logger.warning(f"Not caching analysis of {doc_name}, version unknown: {e}")
+            return [], None
+
+        key = self._analysis_key(f"doc={version}", clause_type, style)
+        return [key], self._analyses.get(key)
+
+    def _reuse_analysis(
+        self, keys: List[str], digest: Optional[str], clause_type: str, style: str = "text"
+    ) -> Tuple[List[str], Optional[Any]]:
+        """
+        Looks the question up by the hash of the clauses it reads (digest). An
+        answer from an earlier contract version whose matching clauses are
+        unchanged is reused, and saved under this version's keys too.
+        """
+        if self._analyses is None or digest is None:
+            return keys, None
+        keys = keys + [self._analysis_key(f"clauses={digest}", clause_type, style)]
+        cached = self._analyses.get(keys[-1])
+        if cached is not None:
+            logger.info(f"Reusing the '{clause_type}' analysis: its clauses are unchanged")
+            self._store_analysis(keys, cached)
+        return keys, cached
+
+    def _store_analysis(self, keys: List[str], analysis: Any) -> None:
+        if analysis:
+            for key in keys:
+                self._analyses.set(key, analysis)
+
+    def _cached_clause_analyses(
+        self, doc_name: str, clause_types: List[str]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Tuple[str, List[str]]]]:
+        """
+        Cached structured analyses by normalized clause type, and the clause
+        types still to analyze (as requested, with their cache keys).
+        """
+        results, missing = {}, {}
+        for clause_type in clause_types:
+            name = normalize_clause_type(clause_type)
+            if name in results or name in missing:
+                continue
+            keys, cached = self._cached_analysis(doc_name, clause_type, style="json")
+            if cached is not None:
+                results[name] = cached
+            else:
+                missing[name] = (clause_type, keys)
+        return results, missing
+
+    def _reuse_clause_analyses(
+        self,
+        doc_name: str,
+        results: Dict[str, Dict[str, Any]],
+        missing: Dict[str, Tuple[str, List[str]]],
+    ) -> Dict[str, Tuple[str, List[str]]]:
+        """
+        Fills results with analyses reused from unchanged clauses; returns the
+        clause types that still need the model.
+        """
+        pending = [clause_type for clause_type, _ in missing.values()]
+        _, digests = self._contract_excerpt(doc_name, pending)
+        remaining = {}
+        for (name, (clause_type, keys)), digest in zip(missing.items(), digests):
+            keys, cached = self._reuse_analysis(keys, digest, clause_type, style="json")
+            if cached is not None:
+                results[name] = cached
+            else:
+                remaining[name] = (clause_type, keys)
+        return remaining
+
+    def _parse_clause_analyses(
+        self, text: str, missing: Dict[str, Tuple[str, List[str]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Validates the model's JSON, caches each clause and returns them by
+        normalized type. Entries are matched to the request by index, then by
+        name; a clause the model left out is reported as not found, uncached.
+        """
+        analyses = ClauseAnalyses.model_validate_json(text).clauses
+        by_index = {a.index: a for a in analyses if a.index is not None}
+        by_type = {normalize_clause_type(a.clause_type): a for a in analyses}
+
+        results = {}
+        for index, (name, (clause_type, keys)) in enumerate(missing.items(), start=1):
+            analysis = by_index.get(index) or by_type.get(name)
+            if analysis is None:
+                logger.warning(f"Model response has no entry for '{clause_type}'")
+                analysis = ClauseAnalysis(clause_type=clause_type, found=False)
+                results[name] = analysis.model_dump(exclude={"index"})
+                continue
+            results[name] = {**analysis.model_dump(exclude={"index"}), "clause_type": clause_type}
+            self._store_analysis(keys, results[name])
+        return results
+
+    @staticmethod
+    def _clauses_result(
+        doc_name: str, clause_types: List[str], results: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        clauses, seen = [], set()
+        for clause_type in clause_types:
+            name = normalize_clause_type(clause_type)
+            if name not in seen:
+                seen.add(name)
+                clauses.append({**results[name], "clause_type": clause_type})
+        return {"doc_name": doc_name, "clauses": clauses}
+
+    def _contract_excerpt(
+        self, doc_name: str, clause_types: List[str]
+    ) -> Tuple[Optional[str], List[Optional[str]]]:
+        """
+        Text of the clauses matching the clause types, in contract order, or the
+        whole extracted text if any type matches nothing. None if there is no
+        usable text (index disabled or failing, or a scanned PDF without a text
+        layer); the PDF itself is sent then.
+
+        Also returns, per clause type, a hash of the text its answer rests on:
+        its matching clauses, or the whole text if none match.
+        """
+        if not config.CLAUSE_INDEX_ENABLED:
+            return None, [None] * len(clause_types)
+        try:
+            index = self.contracts.get(doc_name)
+        except Exception as e:
+            logger.warning(f"Clause index unavailable for {doc_name}, sending the PDF: {e}")
+            return None, [None] * len(clause_types)
+
+        text = index.text.strip() or None
+        found = index.search_many(clause_types, config.CLAUSE_MATCH_LIMIT)
+        digests = [
+            clauses_digest(clauses) if clauses else text and text_digest(text)
+            for clauses in found
+        ]
+        if not all(found):
+            return text, digests
+        matched = {id(clause) for clauses in found for clause in clauses}
+        excerpt = "\n\n".join(clause.render() for clause in index.clauses if id(clause) in matched)
+        return excerpt, digests
+
+    def _contents(self, doc_name: str, excerpt: Optional[str], prompt: str) -> List[Any]:
+        if excerpt is None:
+            # Loading the file as a Part for multimodal processing
+            gcs_uri = f"gs://{config.BUCKET_NAME}/{doc_name}"
+            document = Part.from_uri(uri=gcs_uri, mime_type="application/pdf")
+            return [document, prompt]
+        return [prompt]
+
+    @staticmethod
+    def _clause_prompt(clause_type: str, excerpt: Optional[str] = None) -> str:
+        source = "contract sections below" if excerpt else "provided document"
         prompt = f"""
         You are a specialized legal assistant.
-        Analyze the provided document specifically for the '{clause_type}' clause.
+        Analyze the {source} specifically for the '{clause_type}' clause.
         
         If the clause exists:
         1. Quote it directly.
@@ -48,11 +353,30 @@ class ContractAnalyzer:
         
         If it does not exist, state "No such clause found."
         """
+        if excerpt:
+            prompt += f"\nCONTRACT SECTIONS:\n{excerpt}\n"
+        return prompt
 
-        try:
-            # Loading the file as a Part for multimodal processing
-            document = Part.from_uri(uri=gcs_uri, mime_type="application/pdf")
-            response = self.model.generate_content([document, prompt])
-            return response.text
-        except Exception as e:
-            return f"Error analyzing contract: {str(e)}"
+    @staticmethod
+    def _clauses_prompt(clause_types: List[str], excerpt: Optional[str] = None) -> str:
+        source = "contract sections below" if excerpt else "provided document"
+        names = "\n".join(
+            f"        {index}. {clause_type}" for index, clause_type in enumerate(clause_types, 1)
+        )
+        prompt = f"""
+        You are a specialized legal assistant.
+        Analyze the {source} for each of these clauses:
+{names}
+
+        Reply with a JSON object only, in this form:
+        {{"clauses": [{{"index": <number of the clause above>,
+          "clause_type": "<clause name as given>", "found": true,
+          "quote": "<the clause, quoted directly>",
+          "interpretation": "<its conditions, e.g. timeframes, exceptions>"}}]}}
+
+        Include one entry per clause, in the order given. If a clause does not
+        exist, set "found" to false and leave "quote" and "interpretation" empty.
+        """
+        if excerpt:
+            prompt += f"\nCONTRACT SECTIONS:\n{excerpt}\n"
+        return prompt
@@ -13,31 +13,474 @@
 # limitations under the License.
 
 from google.cloud import bigquery
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional, Sequence, Tuple
+from utils.cache import DiskCache, TTLCache
 from utils.config import config
+import base64
+import hashlib
+import json
 import logging
+import os
+import re
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    # Optional (pip install .[arrow]): imported where used, so the module loads without them.
+    import pyarrow as pa
+    from google.cloud import bigquery_storage
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SAMPLE_ROW_COUNT = 5
+# Inventory columns the vectorized summaries may group by, and the quantity they total.
+INVENTORY_GROUP_COLUMNS = ("ITEM_REF_ID", "LOC_BIN_HEX", "STATUS_FLAG_9")
+INVENTORY_QUANTITY_COLUMN = "QOH_RAW_VAL"
+# Table types without managed storage; their rows cannot be listed without a query.
+_VIRTUAL_TABLE_TYPES = ("VIEW", "MATERIALIZED_VIEW", "EXTERNAL")
+
+# Quoted literals are kept verbatim; runs of whitespace and comments collapse to one space.
+_SQL_TOKEN_PATTERN = re.compile(
+    r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)"""
+    r"""|((?:\s|--[^\n]*|\#[^\n]*|/\*.*?\*/)+)""",
+    re.DOTALL,
+)
+_TABLE_REF_PATTERN = re.compile(
+    r"`([^`]+)`|\b(?:FROM|JOIN)\s+([A-Za-z_][\w-]*(?:\.[A-Za-z_][\w-]*){1,2})",
+    re.IGNORECASE,
+)
+_CACHEABLE_PATTERN = re.compile(r"^\(?\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+_NONDETERMINISTIC_PATTERN = re.compile(
+    r"\b(?:CURRENT_(?:DATE|DATETIME|TIME|TIMESTAMP)|RAND|GENERATE_UUID|SESSION_USER)\b",
+    re.IGNORECASE,
+)
+
+
+def _normalize_sql(sql_query: str) -> str:
+    """Strips comments and insignificant whitespace so equivalent queries share a key."""
+
+    def replace(match: re.Match) -> str:
+        literal, _ = match.groups()
+        return literal if literal is not None else " "
+
+    return _SQL_TOKEN_PATTERN.sub(replace, sql_query).strip().rstrip(";").strip()
+
+
+def _sql_fingerprint(sql_query: str) -> str:
+    return hashlib.sha256(_normalize_sql(sql_query).encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_page_token(sql_query: str, job_id: str, location: str, offset: int) -> str:
+    """
+    Packs the query job and the next row offset into an opaque, resumable
+    token, bound to the (normalized) SQL it pages through.
+    """
+    payload = json.dumps(
+        {"sql": _sql_fingerprint(sql_query), "job": job_id, "loc": location, "off": offset}
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_page_token(page_token: str, sql_query: str) -> Tuple[str, str, int]:
+    """
+    The token's job, location and offset. ValueError if it is malformed or
+    pages another query.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(page_token.encode("ascii")))
+        sql, job_id, location, offset = (
+            payload["sql"], payload["job"], payload["loc"], int(payload["off"])
+        )
+        if offset < 0:
+            raise ValueError(f"negative offset {offset}")
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(
+            "page_token is not valid; omit it to start from the first page."
+        ) from e
+    if sql != _sql_fingerprint(sql_query):
+        raise ValueError(
+            "page_token belongs to a different sql_query; "
+            "pass the same sql_query, or omit page_token to start over."
+        )
+    return job_id, location, offset
+
+
+class QueryResultCache:
+    """
+    Caches query results by normalized SQL in memory, and optionally on disk.
+    Each entry remembers the version (lastModified) of every table it read,
+    so a change to any of those tables invalidates it.
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: int, cache_dir: Optional[str] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._memory = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._disk = None
+        if cache_dir:
+            self._disk = DiskCache(
+                os.path.join(cache_dir, "query_results.sqlite"), max_entries=max_entries
+            )
+
+    def get(self, key: str, versions: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+        entry = self._memory.get(key)
+        if entry is None and self._disk is not None:
+            entry = self._disk.get(key)
+            if entry is not None:
+                self._memory.set(key, entry)
+
+        if entry is None:
+            return None
+
+        if entry["versions"] != versions:
+            self.delete(key)
+            return None
+
+        return [dict(row) for row in entry["rows"]]
+
+    def set(self, key: str, versions: Dict[str, str], rows: List[Dict[str, Any]]) -> None:
+        # A copy: the caller keeps using (and may change) the rows it was given.
+        entry = {"versions": dict(versions), "rows": [dict(row) for row in rows]}
+        self._memory.set(key, entry)
+        if self._disk is not None:
+            self._disk.set(key, entry, ttl_seconds=self.ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self._memory.delete(key)
+        if self._disk is not None:
+            self._disk.delete(key)
+
 
 class DatabaseTools:
     def __init__(self):
-        self.client = bigquery.Client(project=config.PROJECT_ID)
+        self.client = self._create_client()
+        self._result_cache = None
+        if config.QUERY_CACHE_ENABLED:
+            self._result_cache = QueryResultCache(
+                max_entries=config.QUERY_CACHE_MAX_ENTRIES,
+                ttl_seconds=config.QUERY_CACHE_TTL_SECONDS,
+                cache_dir=config.QUERY_CACHE_DIR or None,
+            )
+        # Table lastModified lookups are metadata calls; re-check them at most this often.
+        self._table_versions = TTLCache(
+            max_entries=128, ttl_seconds=config.QUERY_CACHE_VERSION_CHECK_SECONDS
+        )
+        self._bqstorage_client = None  # Lazy init, only needed for large results
+        self._schema_previews: Dict[str, Dict[str, Any]] = {}
+        self._schema_disk = None  # Opened on first use; backends without previews never need it
+
+    def _schema_cache(self) -> Optional[DiskCache]:
+        """The on-disk schema preview cache, or None if SCHEMA_CACHE_DIR is unset."""
+        if self._schema_disk is None and config.SCHEMA_CACHE_DIR:
+            self._schema_disk = DiskCache(
+                os.path.join(config.SCHEMA_CACHE_DIR, "schema_previews.sqlite"),
+                max_entries=256,
+            )
+        return self._schema_disk
+
+    def _create_client(self):
+        """Creates the engine client. Other backends override the engine hooks below."""
+        return bigquery.Client(project=config.PROJECT_ID)
+
+    def _execute(self, sql_query: str) -> List[Dict[str, Any]]:
+        """Runs a statement on the engine and materializes its rows."""
+        query_job = self.client.query(sql_query)
+        return [dict(row) for row in query_job.result()]
+
+    def _resolve_table_id(self, table_ref: str) -> Optional[str]:
+        """Expands a table reference to project.dataset.table (None for bare names)."""
+        parts = table_ref.split(".")
+        if len(parts) == 3:
+            return table_ref
+        if len(parts) == 2:
+            return f"{config.PROJECT_ID}.{table_ref}"
+        # A bare name is a CTE or an alias; it cannot be resolved without a dataset.
+        return None
+
+    def _table_version(self, table_id: str) -> str:
+        """Returns the table's lastModified timestamp, memoized for a short interval."""
+        version = self._table_versions.get(table_id)
+        if version is None:
+            table = self.client.get_table(table_id)
+            version = table.modified.isoformat() if table.modified else ""
+            self._table_versions.set(table_id, version)
+        return version
+
+    def _cache_key(self, sql_query: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Returns the cache key and the current versions of every referenced table.
+        The key is None when the statement must not be cached.
+        """
+        if self._result_cache is None:
+            return None, {}
+
+        normalized = _normalize_sql(sql_query)
+        if not _CACHEABLE_PATTERN.match(normalized):
+            return None, {}
+        if _NONDETERMINISTIC_PATTERN.search(normalized):
+            return None, {}
+
+        versions = {}
+        for quoted, unquoted in _TABLE_REF_PATTERN.findall(normalized):
+            table_id = self._resolve_table_id(quoted or unquoted)
+            if table_id is None or table_id in versions:
+                continue
+            try:
+                versions[table_id] = self._table_version(table_id)
+            except Exception as e:
+                logger.debug(f"Not caching query, could not read version of {table_id}: {e}")
+                return None, {}
+
+        digest = hashlib.sha256(f"{config.PROJECT_ID}\n{normalized}".encode("utf-8"))
+        return digest.hexdigest(), versions
+
+    def _schema_preview(self, table_id: str) -> Dict[str, Any]:
+        """
+        Returns the table's columns and sample rows, cached by table ID and lastModified.
+        The sample comes from the list-rows API, which is free and starts no query job.
+        """
+        table = self.client.get_table(table_id)
+        table_id = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        version = table.modified.isoformat() if table.modified else ""
+        self._table_versions.set(table_id, version)
+
+        schema_disk = self._schema_cache()
+        preview = self._schema_previews.get(table_id)
+        if preview is None and schema_disk is not None:
+            preview = schema_disk.get(table_id)
+        if preview is not None and preview["version"] == version:
+            self._schema_previews[table_id] = preview
+            return preview
+
+        if table.table_type in _VIRTUAL_TABLE_TYPES:
+            sample_rows = self.run_query(
+                f"SELECT * FROM `{table_id}` LIMIT {SAMPLE_ROW_COUNT}"
+            )
+        else:
+            rows = self.client.list_rows(table, max_results=SAMPLE_ROW_COUNT)
+            sample_rows = [dict(row) for row in rows]
+
+        preview = {
+            "version": version,
+            "schema_fields": [
+                f"{field.name} ({field.field_type})" for field in table.schema
+            ],
+            "sample_rows": sample_rows,
+        }
+        if not any("error" in row for row in sample_rows):
+            self._schema_previews[table_id] = preview
+            if schema_disk is not None:
+                schema_disk.set(table_id, preview)
+        return preview
 
     def run_query(self, sql_query: str) -> List[Dict[str, Any]]:
         """Executes the given SQL query and returns the list of rows or an error message."""
         print(f"\n[DB TOOL] Executing SQL:\n    {sql_query}")
         try:
-            query_job = self.client.query(sql_query)
-            results = [dict(row) for row in query_job.result()]
+            cache_key, versions = self._cache_key(sql_query)
+            if cache_key is not None:
+                cached = self._result_cache.get(cache_key, versions)
+                if cached is not None:
+                    print(f"[⚡ DB TOOL] Cache hit. Rows returned: {len(cached)}")
+                    return cached
+
+            results = self._execute(sql_query)
             print(f"[✅ DB TOOL] Success. Rows returned: {len(results)}")
+            if cache_key is not None:
+                self._result_cache.set(cache_key, versions, results)
             return results
         except Exception as e:
             print(f"[❌ DB TOOL] Error: {str(e)}")
             logger.error(f"Query failed: {e}")
             return [{"error": str(e)}]
 
+    def iter_query_pages(
+        self, sql_query: str, page_size: int = 100, max_rows: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Runs a query and lazily yields its rows one page at a time, so only the
+        current page is ever held in memory.
+
+        Args:
+            sql_query (str): The SQL query to execute.
+            page_size (int): Number of rows fetched per page.
+            max_rows (int, optional): Stop after this many rows in total.
+        """
+        query_job = self.client.query(sql_query)
+        row_iterator = query_job.result(page_size=page_size, max_results=max_rows)
+        for page in row_iterator.pages:
+            yield [dict(row) for row in page]
+
+    def fetch_query_page(
+        self, sql_query: str, page_size: int = 50, page_token: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Executes a SQL query and returns a single page of its rows.
+        Use this instead of run_query when a query may return many rows.
+        To get the next page, call it again with the same sql_query and the
+        returned next_page_token; the query is not re-run.
+
+        Args:
+            sql_query (str): The SQL query to execute.
+            page_size (int): Number of rows to return in this page.
+            page_token (str): next_page_token from the previous page, or empty for the first page.
+
+        Returns:
+            Dict: The rows, the total row count and the token for the next page (empty when done).
+        """
+        page_size = max(1, min(page_size, config.QUERY_MAX_PAGE_SIZE))
+        print(f"\n[DB TOOL] Fetching page (size {page_size}) for SQL:\n    {sql_query}")
+        try:
+            if page_token:
+                job_id, location, offset = _decode_page_token(page_token, sql_query)
+                query_job = self.client.get_job(job_id, location=location)
+            else:
+                query_job = self.client.query(sql_query)
+                offset = 0
+
+            row_iterator = query_job.result(
+                page_size=page_size, max_results=page_size, start_index=offset
+            )
+            rows = [dict(row) for row in row_iterator]
+            total_rows = row_iterator.total_rows or 0
+            next_offset = offset + len(rows)
+
+            next_page_token = ""
+            if rows and next_offset < total_rows:
+                next_page_token = _encode_page_token(
+                    sql_query, query_job.job_id, query_job.location, next_offset
+                )
+
+            print(f"[✅ DB TOOL] Rows {offset + 1}-{next_offset} of {total_rows}")
+            return {
+                "rows": rows,
+                "first_row": offset + 1,
+                "total_rows": total_rows,
+                "next_page_token": next_page_token,
+            }
+        except Exception as e:
+            print(f"[❌ DB TOOL] Error: {str(e)}")
+            logger.error(f"Paged query failed: {e}")
+            return {"error": str(e)}
+
+    def _read_client(
+        self, row_count: int
+    ) -> Optional["bigquery_storage.BigQueryReadClient"]:
+        """
+        Returns a Storage Read API client when a result is large enough to
+        benefit. None if it is not, or the API is not installed or usable, in
+        which case the rows are downloaded over the REST API.
+        """
+        if row_count < config.BQ_STORAGE_MIN_ROWS:
+            return None
+        if self._bqstorage_client is None:
+            try:
+                from google.cloud import bigquery_storage
+
+                self._bqstorage_client = bigquery_storage.BigQueryReadClient()
+            except Exception as e:
+                logger.warning(f"BigQuery Storage Read API unavailable, using REST: {e}")
+                return None
+        return self._bqstorage_client
+
+    def query_to_arrow(
+        self, sql_query: str, job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> "pa.Table":
+        """
+        Runs a query and returns the result as a columnar Arrow table.
+        Results of BQ_STORAGE_MIN_ROWS rows or more are downloaded in parallel
+        streams over the BigQuery Storage Read API.
+        """
+        row_iterator = self.client.query(sql_query, job_config=job_config).result()
+        return row_iterator.to_arrow(
+            bqstorage_client=self._read_client(row_iterator.total_rows or 0),
+            create_bqstorage_client=False,
+        )
+
+    def iter_arrow_batches(
+        self, sql_query: str, job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> Iterator["pa.RecordBatch"]:
+        """Runs a query and lazily yields the result as Arrow record batches."""
+        row_iterator = self.client.query(sql_query, job_config=job_config).result()
+        yield from row_iterator.to_arrow_iterable(
+            bqstorage_client=self._read_client(row_iterator.total_rows or 0)
+        )
+
+    def query_to_dataframe(
+        self, sql_query: str, job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> pd.DataFrame:
+        """
+        Runs a query and returns a pandas DataFrame whose columns stay backed
+        by the Arrow buffers (pd.ArrowDtype), so no data is copied.
+        """
+        arrow_table = self.query_to_arrow(sql_query, job_config=job_config)
+        return arrow_table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def summarize_inventory(
+        self,
+        group_by: Sequence[str] = ("STATUS_FLAG_9",),
+        item_ref_id: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Totals the quantity on hand per group (e.g. per status flag or per bin).
+        Each Arrow record batch is aggregated as it arrives and the partial
+        totals are merged, so memory stays proportional to the number of groups.
+
+        Args:
+            group_by (Sequence[str]): Columns from INVENTORY_GROUP_COLUMNS to group by.
+            item_ref_id (str, optional): Restrict the summary to one internal item ID.
+
+        Returns:
+            pd.DataFrame: One row per group with 'qoh_total' and 'row_count', largest first.
+        """
+        import pyarrow as pa
+
+        keys = list(group_by)
+        unknown = set(keys) - set(INVENTORY_GROUP_COLUMNS)
+        if not keys or unknown:
+            raise ValueError(
+                f"Inventory can only be grouped by {INVENTORY_GROUP_COLUMNS}, got {keys}"
+            )
+
+        table_id = f"{config.PROJECT_ID}.{config.DATASET_ID}.{config.TABLE_INVENTORY}"
+        sql_query = (
+            f"SELECT {', '.join(keys)}, {INVENTORY_QUANTITY_COLUMN} FROM `{table_id}`"
+        )
+        job_config = None
+        if item_ref_id:
+            sql_query += " WHERE ITEM_REF_ID = @item_ref_id"
+            job_config = bigquery.QueryJobConfig(
+                query_parameters=[
+                    bigquery.ScalarQueryParameter("item_ref_id", "STRING", item_ref_id)
+                ]
+            )
+
+        aggregations = [
+            (INVENTORY_QUANTITY_COLUMN, "sum"),
+            (INVENTORY_QUANTITY_COLUMN, "count"),
+        ]
+        partials = [
+            pa.Table.from_batches([batch]).group_by(keys).aggregate(aggregations)
+            for batch in self.iter_arrow_batches(sql_query, job_config=job_config)
+            if batch.num_rows
+        ]
+        if not partials:
+            return pd.DataFrame(columns=[*keys, "qoh_total", "row_count"])
+
+        sum_column = f"{INVENTORY_QUANTITY_COLUMN}_sum"
+        count_column = f"{INVENTORY_QUANTITY_COLUMN}_count"
+        totals = (
+            pa.concat_tables(partials)
+            .group_by(keys)
+            .aggregate([(sum_column, "sum"), (count_column, "sum")])
+            .select([*keys, f"{sum_column}_sum", f"{count_column}_sum"])
+            .rename_columns([*keys, "qoh_total", "row_count"])
+            .sort_by([("qoh_total", "descending")])
+        )
+        return totals.to_pandas(types_mapper=pd.ArrowDtype)
+
     def explore_schema(self, table_name: str) -> Dict[str, Any]:
         """Returns the list of columns for the specified table, and a sample of data from the first 5 rows."""
         print(f"\n[DB TOOL] Exploring Schema for: {table_name}")
@@ -49,19 +492,26 @@ class DatabaseTools:
             full_table_name = f"{config.PROJECT_ID}.{config.DATASET_ID}.{table_name}"
 
         try:
-            table = self.client.get_table(full_table_name)
-            schema_info = [
-                f"{field.name} ({field.field_type})" for field in table.schema
-            ]
-            sample_query = f"SELECT * FROM `{full_table_name}` LIMIT 5"
-            sample_rows = self.run_query(sample_query)
+            preview = self._schema_preview(full_table_name)
             return {
                 "table_name": table_name,
                 "fully_qualified_table_name": full_table_name,  # Help the agent learn the right name
-                "columns": schema_info,
-                "sample_rows": sample_rows,
+                "columns": preview["schema_fields"],
+                "sample_rows": preview["sample_rows"],
                 "note": f"Use only the fully_qualified_table_name in all SQL queries",
             }
         except Exception as e:
             print(f"[❌ DB TOOL] Schema Error: {str(e)}")
             return {"error": f"Exception while loading the database schema: {str(e)}"}
+
+
+def create_database_tools() -> DatabaseTools:
+    """Returns the DatabaseTools implementation selected by config.DB_BACKEND."""
+    if config.DB_BACKEND == "sqlite":
+        # Imported lazily: the local backend subclasses DatabaseTools.
+        from tools.local_database import SQLiteDatabaseTools
+
+        return SQLiteDatabaseTools()
+    if config.DB_BACKEND != "bigquery":
+        raise ValueError(f"Unknown DB_BACKEND '{config.DB_BACKEND}'")
+    return DatabaseTools()
@@ -0,0 +1,296 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.cloud import bigquery
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional
+from tools.database import (
+    DatabaseTools,
+    SAMPLE_ROW_COUNT,
+    _decode_page_token,
+    _encode_page_token,
+)
+from utils.config import config
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# The same seed files that assets/setup_db.py loads into BigQuery.
+SEED_FILES = ["legacy_inv_main_v2.sql", "ref_catalog_dump.sql"]
+DEFAULT_SQL_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "assets", "sql"
+)
+
+# BigQuery column types mapped to SQLite types with the matching affinity.
+_SQLITE_TYPES = {
+    "STRING": "TEXT",
+    "BYTES": "BLOB",
+    "INT64": "INTEGER",
+    "INTEGER": "INTEGER",
+    "FLOAT64": "REAL",
+    "FLOAT": "REAL",
+    "NUMERIC": "NUMERIC",
+    "BIGNUMERIC": "NUMERIC",
+    "BOOL": "INTEGER",
+    "BOOLEAN": "INTEGER",
+    "DATE": "TEXT",
+    "DATETIME": "TEXT",
+    "TIME": "TEXT",
+    "TIMESTAMP": "TEXT",
+}
+# Standard SQL type names as reported back by the BigQuery API (table.schema).
+_API_TYPE_NAMES = {"INT64": "INTEGER", "FLOAT64": "FLOAT", "BOOL": "BOOLEAN"}
+
+_LITERAL_PATTERN = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")""")
+_QUOTED_NAME_PATTERN = re.compile(r"`([^`]+)`")
+_QUALIFIED_NAME_PATTERN = re.compile(
+    r"\b(FROM|JOIN)\s+(?:[A-Za-z_][\w-]*\.){1,2}([A-Za-z_]\w*)", re.IGNORECASE
+)
+_PARAMETER_PATTERN = re.compile(r"@([A-Za-z_]\w*)")
+_BQ_TYPES = "|".join(_SQLITE_TYPES)
+# Types appear in column definitions and in CAST(... AS <type>).
+_COLUMN_TYPE_PATTERN = re.compile(
+    r"([(,]\s*[A-Za-z_]\w*\s+)(" + _BQ_TYPES + r")\b", re.IGNORECASE
+)
+# In a CAST the type closes the call; "AS <type>" elsewhere is a column alias.
+_CAST_TYPE_PATTERN = re.compile(
+    r"\b(AS\s+)(" + _BQ_TYPES + r")(?=\s*\))", re.IGNORECASE
+)
+_CREATE_OR_REPLACE_PATTERN = re.compile(
+    r"\bCREATE\s+OR\s+REPLACE\s+TABLE\s+(\"[^\"]+\")", re.IGNORECASE
+)
+_OPTIONS_PATTERN = re.compile(
+    r"\s*OPTIONS\s*\((?:[^()'\"]|'[^']*'|\"[^\"]*\")*\)", re.IGNORECASE
+)
+_CREATE_TABLE_PATTERN = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?TABLE\s+`([^`]+)`\s*\((.*?)\)\s*;",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def translate_sql(sql_query: str) -> str:
+    """
+    Rewrites the BigQuery dialect used by the lab into SQLite.
+    Backtick-qualified table names (`project.dataset.TABLE`) become "TABLE",
+    @params become :params, column OPTIONS are dropped and BigQuery types map
+    to SQLite types. String literals are kept, double-quoted ones re-quoted.
+    """
+
+    def translate_type(match: re.Match) -> str:
+        return match.group(1) + _SQLITE_TYPES[match.group(2).upper()]
+
+    def translate(segment: str) -> str:
+        segment = _QUOTED_NAME_PATTERN.sub(
+            lambda m: '"' + m.group(1).split(".")[-1] + '"', segment
+        )
+        segment = _QUALIFIED_NAME_PATTERN.sub(r'\1 "\2"', segment)
+        segment = _PARAMETER_PATTERN.sub(r":\1", segment)
+        segment = _CREATE_OR_REPLACE_PATTERN.sub(
+            r"DROP TABLE IF EXISTS \1; CREATE TABLE \1", segment
+        )
+        segment = _COLUMN_TYPE_PATTERN.sub(translate_type, segment)
+        return _CAST_TYPE_PATTERN.sub(translate_type, segment)
+
+    def requote(literal: str) -> str:
+        # BigQuery strings may use double quotes; in SQLite those are identifiers.
+        if literal.startswith('"'):
+            return "'" + literal[1:-1].replace('\\"', '"').replace("'", "''") + "'"
+        return literal
+
+    parts = _LITERAL_PATTERN.split(_OPTIONS_PATTERN.sub("", sql_query))
+    # split() with one capture group alternates code and literals.
+    return "".join(
+        requote(part) if index % 2 else translate(part)
+        for index, part in enumerate(parts)
+    )
+
+
+class SQLiteDatabaseTools(DatabaseTools):
+    """
+    DatabaseTools on an embedded SQLite database, hydrated from the seed SQL
+    in assets/sql. Needs no cloud project, so the agents can run offline and
+    tool latency benchmarks measure milliseconds instead of query jobs.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, sql_dir: Optional[str] = None):
+        """
+        Args:
+            db_path (str, optional): SQLite file, or ':memory:'. Defaults to config.LOCAL_DB_PATH.
+            sql_dir (str, optional): Directory of the seed files. Defaults to assets/sql.
+        """
+        self.db_path = db_path or config.LOCAL_DB_PATH
+        self.sql_dir = os.path.abspath(sql_dir or config.LOCAL_DB_SQL_DIR or DEFAULT_SQL_DIR)
+        self._lock = threading.RLock()
+        # Bumped on every write; stands in for BigQuery's table lastModified.
+        self._generation = 0
+        self._column_types: Dict[str, List[str]] = {}
+        super().__init__()
+        self.hydrate()
+
+    def _create_client(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def hydrate(self) -> None:
+        """(Re)creates the tables from the seed files, like assets/setup_db.py does."""
+        for filename in SEED_FILES:
+            file_path = os.path.join(self.sql_dir, filename)
+            with open(file_path, "r") as f:
+                sql = "\n".join(
+                    line for line in f.read().splitlines() if not line.strip().startswith("--")
+                )
+
+            for table_ref, columns in _CREATE_TABLE_PATTERN.findall(sql):
+                self._column_types[table_ref.split(".")[-1]] = [
+                    self._describe_column(column)
+                    for column in _OPTIONS_PATTERN.sub("", columns).split(",")
+                    if column.strip()
+                ]
+
+            with self._lock:
+                self.client.executescript(translate_sql(sql))
+                self._generation += 1
+            logger.info(f"Hydrated local database from {filename}")
+
+    @staticmethod
+    def _describe_column(column: str) -> str:
+        name, field_type = column.split()[:2]
+        field_type = field_type.upper()
+        return f"{name} ({_API_TYPE_NAMES.get(field_type, field_type)})"
+
+    def _table_exists(self, table_name: str) -> bool:
+        with self._lock:
+            row = self.client.execute(
+                "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?",
+                (table_name,),
+            ).fetchone()
+        return row is not None
+
+    def _execute(
+        self, sql_query: str, params: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self.client.execute(translate_sql(sql_query), params or {})
+            if cursor.description is None:
+                self.client.commit()
+                self._generation += 1
+                return []
+            return [dict(row) for row in cursor.fetchall()]
+
+    def _table_version(self, table_id: str) -> str:
+        table_name = table_id.split(".")[-1]
+        if not self._table_exists(table_name):
+            raise ValueError(f"Not found: Table {table_id}")
+        return str(self._generation)
+
+    def _schema_preview(self, table_id: str) -> Dict[str, Any]:
+        table_name = table_id.split(".")[-1]
+        if not self._table_exists(table_name):
+            raise ValueError(f"Not found: Table {table_id}")
+
+        schema_fields = self._column_types.get(table_name)
+        if schema_fields is None:
+            # Tables created after hydration only have their SQLite declared types.
+            with self._lock:
+                columns = self.client.execute(f'PRAGMA table_info("{table_name}")').fetchall()
+            schema_fields = [f"{column['name']} ({column['type']})" for column in columns]
+
+        return {
+            "version": str(self._generation),
+            "schema_fields": schema_fields,
+            "sample_rows": self._execute(
+                f'SELECT * FROM "{table_name}" LIMIT {SAMPLE_ROW_COUNT}'
+            ),
+        }
+
+    def iter_query_pages(
+        self, sql_query: str, page_size: int = 100, max_rows: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        cursor = self.client.cursor()
+        with self._lock:
+            cursor.execute(translate_sql(sql_query))
+
+        remaining = max_rows
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            with self._lock:
+                page = [dict(row) for row in cursor.fetchmany(size)]
+            if not page:
+                break
+            if remaining is not None:
+                remaining -= len(page)
+            yield page
+
+    def fetch_query_page(
+        self, sql_query: str, page_size: int = 50, page_token: str = ""
+    ) -> Dict[str, Any]:
+        page_size = max(1, min(page_size, config.QUERY_MAX_PAGE_SIZE))
+        print(f"\n[DB TOOL] Fetching page (size {page_size}) for SQL:\n    {sql_query}")
+        try:
+            offset = _decode_page_token(page_token, sql_query)[2] if page_token else 0
+            inner = sql_query.strip().rstrip(";")
+            total_rows = self._execute(f"SELECT COUNT(*) AS n FROM ({inner})")[0]["n"]
+            rows = self._execute(
+                f"SELECT * FROM ({inner}) LIMIT {page_size} OFFSET {offset}"
+            )
+            next_offset = offset + len(rows)
+
+            next_page_token = ""
+            if rows and next_offset < total_rows:
+                next_page_token = _encode_page_token(
+                    sql_query, "local", self.db_path, next_offset
+                )
+
+            print(f"[✅ DB TOOL] Rows {offset + 1}-{next_offset} of {total_rows}")
+            return {
+                "rows": rows,
+                "first_row": offset + 1,
+                "total_rows": total_rows,
+                "next_page_token": next_page_token,
+            }
+        except Exception as e:
+            print(f"[❌ DB TOOL] Error: {str(e)}")
+            logger.error(f"Paged query failed: {e}")
+            return {"error": str(e)}
+
+    @staticmethod
+    def _query_params(job_config: Optional[bigquery.QueryJobConfig]) -> Dict[str, Any]:
+        """Turns BigQuery scalar query parameters into SQLite named parameters."""
+        if job_config is None:
+            return {}
+        return {param.name: param.value for param in job_config.query_parameters}
+
+    def query_to_arrow(
+        self, sql_query: str, job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> "pa.Table":
+        import pyarrow as pa
+
+        return pa.Table.from_pylist(self._execute(sql_query, self._query_params(job_config)))
+
+    def iter_arrow_batches(
+        self, sql_query: str, job_config: Optional[bigquery.QueryJobConfig] = None
+    ) -> Iterator["pa.RecordBatch"]:
+        import pyarrow as pa
+
+        rows = self._execute(sql_query, self._query_params(job_config))
+        if rows:
+            yield pa.RecordBatch.from_pylist(rows)
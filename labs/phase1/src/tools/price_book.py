@@ -0,0 +1,123 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class PriceBook:
+    """
+    Local spot price book kept current by the vendor's server-sent event
+    stream (GET /v1/market/stream). A daemon thread consumes the stream and
+    reconnects with backoff when it drops. While disconnected, get() returns
+    None so callers fall back to polling the spot endpoint.
+    """
+
+    def __init__(self, base_url: str):
+        self.url = f"{base_url}/v1/market/stream"
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._stopped = threading.Event()
+        self._response: Optional[requests.Response] = None
+        self._thread: Optional[threading.Thread] = None
+        self.events_received = 0
+        self.reconnects = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="price-book", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        response = self._response
+        if response is not None:
+            response.close()
+
+    def get(self, chip: str) -> Optional[Dict[str, Any]]:
+        """The streamed quote for an exact chip key, or None if unknown or disconnected."""
+        if not self.connected:
+            return None
+        with self._lock:
+            quote = self._quotes.get(chip.strip().upper())
+        return dict(quote) if quote is not None else None
+
+    def _run(self) -> None:
+        attempt = 0
+        while not self._stopped.is_set():
+            try:
+                with requests.get(
+                    self.url,
+                    stream=True,
+                    headers={"Accept": "text/event-stream"},
+                    timeout=(config.HTTP_CONNECT_TIMEOUT, config.PRICE_STREAM_READ_TIMEOUT),
+                ) as response:
+                    response.raise_for_status()
+                    self._response = response
+                    attempt = 0
+                    self._consume(response)
+            except (requests.RequestException, ValueError) as e:
+                if self.connected and not self._stopped.is_set():
+                    logger.warning(f"Price stream dropped, polling until it reconnects: {e}")
+                else:
+                    logger.debug(f"Price stream unavailable: {e}")
+            finally:
+                self._connected.clear()
+                self._response = None
+
+            delay = min(config.HTTP_BACKOFF_FACTOR * (2**attempt), config.HTTP_BACKOFF_MAX)
+            attempt += 1
+            self.reconnects += 1
+            self._stopped.wait(delay)
+
+    def _consume(self, response: requests.Response) -> None:
+        """
+        Parses the SSE wire format: 'field: value' lines, events end at a blank
+        line. Snapshot and tick events both carry a full quote, so only the
+        data field matters here.
+        """
+        data = None
+        for line in response.iter_lines(decode_unicode=True):
+            if self._stopped.is_set():
+                return
+            if not line:
+                if data is not None:
+                    self._apply(data)
+                data = None
+                continue
+            if line.startswith(":"):
+                continue  # Heartbeat comment
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "data":
+                data = value if data is None else f"{data}\n{value}"
+
+    def _apply(self, data: str) -> None:
+        quote = json.loads(data)
+        with self._lock:
+            self._quotes[quote["chip"].upper()] = quote
+        self.events_received += 1
+        self._connected.set()
@@ -0,0 +1,25 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+# The unit tests run offline: no project lookup, the mock API in-process and
+# the on-disk caches in a scratch directory instead of labs/phaseN/cache.
+_CACHE_DIR = tempfile.mkdtemp(prefix="lab-tests-")
+os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "test-project")
+os.environ.setdefault("API_TRANSPORT", "asgi")
+for _name in ("SCHEMA_CACHE_DIR", "CLAUSE_INDEX_DIR", "ANALYSIS_CACHE_DIR"):
+    os.environ.setdefault(_name, _CACHE_DIR)
+os.environ.setdefault("CLAUSE_CORPUS_PATH", os.path.join(_CACHE_DIR, "clause_corpus.sqlite"))
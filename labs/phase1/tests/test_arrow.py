@@ -0,0 +1,159 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import importlib.util
+import sys
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from fakes import FakeBigQueryClient
+from tools import database
+from tools.database import DatabaseTools
+from tools.local_database import SQLiteDatabaseTools
+from utils.config import config
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+INVENTORY = "`gpu_procurement_db.LEGACY_INV_MAIN_V2`"
+ROWS = [
+    {"STATUS_FLAG_9": 0, "QOH_RAW_VAL": 100},
+    {"STATUS_FLAG_9": 9, "QOH_RAW_VAL": 5},
+    {"STATUS_FLAG_9": 0, "QOH_RAW_VAL": 20},
+    {"STATUS_FLAG_9": 1, "QOH_RAW_VAL": 7},
+    {"STATUS_FLAG_9": 9, "QOH_RAW_VAL": 1},
+]
+
+
+@contextlib.contextmanager
+def not_installed(*names):
+    """Makes `import name` fail for the given modules, as if they were not installed."""
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(sys.modules, {name: None for name in names}))
+        for name in names:
+            parent_name, _, attribute = name.rpartition(".")
+            parent = sys.modules.get(parent_name)
+            # `from package import module` finds an already imported submodule on the package.
+            if parent is not None and hasattr(parent, attribute):
+                stack.enter_context(mock.patch.object(parent, attribute))
+                delattr(parent, attribute)
+        yield
+
+
+class TestOptionalDependencies(unittest.TestCase):
+    def test_module_imports_without_arrow(self):
+        spec = importlib.util.spec_from_file_location("database_without_arrow", database.__file__)
+        module = importlib.util.module_from_spec(spec)
+        with not_installed("pyarrow", "google.cloud.bigquery_storage"):
+            spec.loader.exec_module(module)
+        self.assertTrue(hasattr(module, "DatabaseTools"))
+
+
+@unittest.skipUnless(HAS_ARROW, "pyarrow is not installed (pip install .[arrow])")
+class TestBigQueryArrow(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeBigQueryClient(rows=[dict(row) for row in ROWS])
+        with mock.patch.object(DatabaseTools, "_create_client", return_value=self.client):
+            self.db = DatabaseTools()
+
+    def test_small_result_downloads_over_rest(self):
+        with mock.patch("google.cloud.bigquery_storage.BigQueryReadClient") as read_client:
+            table = self.db.query_to_arrow(f"SELECT * FROM {INVENTORY}")
+        self.assertEqual(table.to_pylist(), ROWS)
+        self.assertEqual(self.client.read_clients, [None])
+        read_client.assert_not_called()
+
+    def test_large_result_uses_the_storage_read_api(self):
+        with mock.patch.object(config, "BQ_STORAGE_MIN_ROWS", len(ROWS)), mock.patch(
+            "google.cloud.bigquery_storage.BigQueryReadClient"
+        ) as read_client:
+            self.db.query_to_arrow(f"SELECT * FROM {INVENTORY}")
+            list(self.db.iter_arrow_batches(f"SELECT * FROM {INVENTORY}"))
+        # One client, created on first use and shared by later downloads.
+        read_client.assert_called_once_with()
+        self.assertEqual(self.client.read_clients, [read_client.return_value] * 2)
+
+    def test_unavailable_storage_read_api_falls_back_to_rest(self):
+        failures = {
+            "not installed": not_installed("google.cloud.bigquery_storage"),
+            "no credentials": mock.patch(
+                "google.cloud.bigquery_storage.BigQueryReadClient",
+                side_effect=RuntimeError("no credentials"),
+            ),
+        }
+        for reason, failure in failures.items():
+            with self.subTest(reason=reason):
+                self.client.read_clients.clear()
+                with mock.patch.object(config, "BQ_STORAGE_MIN_ROWS", 1), failure:
+                    table = self.db.query_to_arrow(f"SELECT * FROM {INVENTORY}")
+                self.assertEqual(table.num_rows, len(ROWS))
+                self.assertEqual(self.client.read_clients, [None])
+
+    def test_dataframe_columns_stay_arrow_backed(self):
+        frame = self.db.query_to_dataframe(f"SELECT * FROM {INVENTORY}")
+        self.assertEqual(frame.to_dict("records"), ROWS)
+        self.assertTrue(all(isinstance(dtype, pd.ArrowDtype) for dtype in frame.dtypes))
+
+    def test_summary_merges_the_batch_totals(self):
+        summary = self.db.summarize_inventory()
+        self.assertEqual(
+            summary.to_dict("records"),
+            [
+                {"STATUS_FLAG_9": 0, "qoh_total": 120, "row_count": 2},
+                {"STATUS_FLAG_9": 1, "qoh_total": 7, "row_count": 1},
+                {"STATUS_FLAG_9": 9, "qoh_total": 6, "row_count": 2},
+            ],
+        )
+        self.assertIn("SELECT STATUS_FLAG_9, QOH_RAW_VAL FROM", self.client.queries[0])
+
+    def test_summary_rejects_unknown_columns(self):
+        for group_by in ((), ("QOH_RAW_VAL",), ("STATUS_FLAG_9", "DROP TABLE")):
+            with self.subTest(group_by=group_by):
+                with self.assertRaises(ValueError):
+                    self.db.summarize_inventory(group_by)
+        self.assertEqual(self.client.calls, [])
+
+
+@unittest.skipUnless(HAS_ARROW, "pyarrow is not installed (pip install .[arrow])")
+class TestLocalArrow(unittest.TestCase):
+    def setUp(self):
+        self.db = SQLiteDatabaseTools(db_path=":memory:")
+
+    def test_summary_matches_sql_group_by(self):
+        expected = self.db.run_query(
+            f"SELECT STATUS_FLAG_9, SUM(QOH_RAW_VAL) AS qoh_total, "
+            f"COUNT(QOH_RAW_VAL) AS row_count FROM {INVENTORY} "
+            f"GROUP BY STATUS_FLAG_9 ORDER BY qoh_total DESC"
+        )
+        self.assertEqual(self.db.summarize_inventory().to_dict("records"), expected)
+
+    def test_summary_for_one_item(self):
+        item = self.db.run_query(f"SELECT ITEM_REF_ID FROM {INVENTORY} LIMIT 1")[0]
+        expected = self.db.run_query(
+            f"SELECT SUM(QOH_RAW_VAL) AS qoh_total FROM {INVENTORY} "
+            f"WHERE ITEM_REF_ID = '{item['ITEM_REF_ID']}'"
+        )
+        summary = self.db.summarize_inventory(item_ref_id=item["ITEM_REF_ID"])
+        self.assertEqual(summary["qoh_total"].sum(), expected[0]["qoh_total"])
+
+
+if __name__ == "__main__":
+    unittest.main()
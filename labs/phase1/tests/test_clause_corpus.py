@@ -0,0 +1,73 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from tools.clause_corpus import ClauseCorpus, SourceDocument, ingest, list_local_documents
+
+DOCS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "assets", "docs")
+
+
+def unreadable():
+    raise OSError("403 Forbidden")
+
+
+class TestClauseCorpus(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.documents = list(list_local_documents(DOCS_DIR))
+
+    def setUp(self):
+        self.corpus = ClauseCorpus(os.path.join(tempfile.mkdtemp(), "corpus.sqlite"))
+        self.summary = ingest(self.corpus, iter(self.documents), workers=1)
+
+    def test_ingest_and_reingest(self):
+        self.assertEqual(
+            (self.summary["listed"], self.summary["ingested"], self.summary["failed"]),
+            (2, 2, {}),
+        )
+        again = ingest(self.corpus, iter(self.documents), workers=1)
+        self.assertEqual((again["unchanged"], again["ingested"]), (2, 0))
+
+    def test_search_expands_legal_concepts(self):
+        matches = self.corpus.search("force majeure")
+        self.assertEqual(
+            [(m["doc_name"], m["clause"]) for m in matches[:1]],
+            [("Master_Supply_Agreement_NVIDIA.pdf", "7.B")],
+        )
+
+    def test_search_by_vendor(self):
+        self.assertEqual(self.corpus.search("exclusivity", vendor="nvidia")[0]["clause"], "2")
+        self.assertEqual(self.corpus.search("exclusivity", vendor="acme"), [])
+
+    def test_query_syntax_is_treated_as_words(self):
+        self.assertEqual(self.corpus.search('"'), [])
+        self.assertTrue(self.corpus.search('exclusivity AND (" NEAR'))
+
+    def test_unreadable_document_fails_alone(self):
+        documents = self.documents + [SourceDocument("bad.pdf", "x", unreadable)]
+        summary = ingest(ClauseCorpus(self.corpus.path + "2"), iter(documents), workers=1)
+        self.assertEqual(summary["ingested"], 2)
+        self.assertEqual(summary["failed"], {"bad.pdf": "403 Forbidden"})
+
+    def test_prune(self):
+        summary = ingest(self.corpus, iter(self.documents[:1]), workers=1, prune=True)
+        self.assertEqual(summary["removed"], 1)
+        self.assertEqual(set(self.corpus.hashes()), {self.documents[0].name})
+
+
+if __name__ == "__main__":
+    unittest.main()
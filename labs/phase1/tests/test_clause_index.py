@@ -0,0 +1,155 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fakes import FakeStorageClient
+from tools import clause_index
+from tools.clause_index import (
+    ClauseIndex,
+    ContractIndexStore,
+    clauses_digest,
+    extract_pdf_text,
+    normalize_clause_type,
+    split_clauses,
+    text_digest,
+)
+
+DOCS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "assets", "docs")
+
+CONTRACT = """MASTER SUPPLY AGREEMENT
+VENDOR: ACME | BUYER: YOU
+1. DEFINITIONS
+Terms used below.
+2. EXCLUSIVITY
+Buyer purchases exclusively from Vendor.
+7.A DELIVERY
+Units ship within 30 days.
+7.B NON-PERFORMANCE & EXCEPTIONS
+If Vendor fails to deliver for > 60 days, Section 2 is voided.
+SECTION 9: TERMINATION
+Either party may terminate with 90 days notice.
+"""
+
+
+class TestSplitClauses(unittest.TestCase):
+    def test_numbered_headings(self):
+        clauses = split_clauses(CONTRACT)
+        self.assertEqual(
+            [(c.number, c.heading) for c in clauses],
+            [
+                ("0", "PREAMBLE"),
+                ("1", "DEFINITIONS"),
+                ("2", "EXCLUSIVITY"),
+                ("7.A", "DELIVERY"),
+                ("7.B", "NON-PERFORMANCE & EXCEPTIONS"),
+                ("9", "TERMINATION"),
+            ],
+        )
+        self.assertEqual(clauses[2].text, "Buyer purchases exclusively from Vendor.")
+
+    def test_text_without_headings_is_one_preamble(self):
+        clauses = split_clauses("Just a letter.\nNo clauses here.")
+        self.assertEqual(
+            [(c.number, c.text) for c in clauses], [("0", "Just a letter.\nNo clauses here.")]
+        )
+
+    def test_bundled_contract(self):
+        with open(os.path.join(DOCS_DIR, "Master_Supply_Agreement_NVIDIA.pdf"), "rb") as f:
+            clauses = split_clauses(extract_pdf_text(f.read()))
+        self.assertEqual([c.number for c in clauses], ["0", "2", "7.B"])
+        self.assertIn("temporarily voided", clauses[2].text)
+
+
+class TestDigests(unittest.TestCase):
+    def test_text_digest_ignores_layout(self):
+        self.assertEqual(text_digest("a  b\nc"), text_digest(" a b c "))
+        self.assertNotEqual(text_digest("a b c"), text_digest("a b d"))
+
+    def test_clauses_digest_ignores_order(self):
+        clauses = split_clauses(CONTRACT)
+        self.assertEqual(clauses_digest(clauses[1:3]), clauses_digest(clauses[2:0:-1]))
+        self.assertNotEqual(clauses_digest(clauses[1:3]), clauses_digest(clauses[1:4]))
+
+    def test_normalize_clause_type(self):
+        self.assertEqual(normalize_clause_type(" Force-Majeure "), "force majeure")
+
+
+class TestClauseIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ClauseIndex("msa.pdf", "v1", CONTRACT, split_clauses(CONTRACT))
+
+    def numbers(self, query):
+        return [clause.number for clause in self.index.search(query)]
+
+    def test_by_number(self):
+        self.assertEqual(self.numbers("Section 2"), ["2"])
+        self.assertEqual(self.numbers("clause 7.b"), ["7.B"])
+        self.assertEqual(self.numbers("section 7"), ["7.A", "7.B"])
+
+    def test_by_retrieval(self):
+        self.assertEqual(self.numbers("Exclusivity")[0], "2")
+        self.assertEqual(self.numbers("Force Majeure")[0], "7.B")
+        self.assertEqual(self.numbers("Termination")[0], "9")
+        self.assertEqual(self.numbers("Quantum Entanglement"), [])
+
+    def test_search_many_matches_search(self):
+        queries = ["Force Majeure", "Section 2", "Termination"]
+        self.assertEqual(
+            self.index.search_many(queries), [self.index.search(query) for query in queries]
+        )
+
+
+class TestContractIndexStore(unittest.TestCase):
+    def setUp(self):
+        self.storage = FakeStorageClient()
+        self.bucket = self.storage.contracts
+        self.bucket.upload("msa.pdf", CONTRACT.encode())
+        self.cache_dir = tempfile.mkdtemp()
+        # The fake blobs hold plain text rather than PDFs.
+        patcher = mock.patch.object(clause_index, "extract_pdf_text", lambda data: data.decode())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def store(self):
+        return ContractIndexStore(self.storage, self.bucket.name, self.cache_dir)
+
+    def test_indexes_each_version_once(self):
+        store = self.store()
+        index = store.get("msa.pdf")
+        self.assertIs(store.get("msa.pdf"), index)
+        # A second process reads the index from the cache directory.
+        reloaded = self.store().get("msa.pdf")
+        self.assertEqual(reloaded.clauses, index.clauses)
+        self.assertEqual(self.bucket.downloads, 1)
+
+    def test_new_content_is_a_new_version(self):
+        store = self.store()
+        first = store.get("msa.pdf")
+        self.bucket.upload("msa.pdf", CONTRACT.replace("90 days", "30 days").encode())
+        store._versions.clear()
+        second = store.get("msa.pdf")
+        self.assertNotEqual(second.version, first.version)
+        self.assertIn("30 days", second.search("Termination")[0].text)
+
+    def test_missing_document(self):
+        with self.assertRaises(FileNotFoundError):
+            self.store().get("missing.pdf")
+
+
+if __name__ == "__main__":
+    unittest.main()
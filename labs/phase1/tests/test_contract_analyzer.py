@@ -0,0 +1,162 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import re
+import tempfile
+import unittest
+from unittest import mock
+
+from fakes import FakeModel, FakeStorageClient
+from tools import clause_index, contract_analyzer
+from utils.config import config
+
+CONTRACT = """MASTER SUPPLY AGREEMENT
+2. EXCLUSIVITY
+Buyer purchases exclusively from Vendor.
+7.B NON-PERFORMANCE & EXCEPTIONS
+If Vendor fails to deliver for > 60 days, Section 2 is voided.
+9. TERMINATION
+Either party may terminate with 90 days notice.
+"""
+
+
+def answer(prompt):
+    """Text for one clause; for several, JSON with each clause type reworded."""
+    if "these clauses:" not in prompt:
+        return "The clause says what it says."
+    requested = re.findall(r"^\s*(\d+)\. (.+)$", prompt.split("these clauses:")[1], re.M)
+    return json.dumps(
+        {
+            "clauses": [
+                {"index": int(index), "clause_type": f"{name} Clause", "found": True,
+                 "quote": f"quote of {name}"}
+                for index, name in requested
+            ]
+        }
+    )
+
+
+class ContractAnalyzerTestCase(unittest.TestCase):
+    """ContractAnalyzer on in-memory storage and model, with caches in a fresh directory."""
+
+    def setUp(self):
+        self.storage = FakeStorageClient()
+        self.bucket = self.storage.contracts
+        self.bucket.upload("msa.pdf", CONTRACT.encode())
+        self.model = FakeModel(answer)
+        cache_dir = tempfile.mkdtemp()
+        patchers = [
+            mock.patch.object(config, "CLAUSE_INDEX_DIR", cache_dir),
+            mock.patch.object(config, "ANALYSIS_CACHE_DIR", cache_dir),
+            mock.patch.object(config, "CLAUSE_CORPUS_PATH", f"{cache_dir}/corpus.sqlite"),
+            mock.patch.object(contract_analyzer.vertexai, "init"),
+            mock.patch.object(contract_analyzer, "GenerativeModel", return_value=self.model),
+            mock.patch.object(contract_analyzer.storage, "Client", return_value=self.storage),
+            # The fake blobs hold plain text rather than PDFs.
+            mock.patch.object(clause_index, "extract_pdf_text", lambda data: data.decode()),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.tools = contract_analyzer.ContractAnalyzer()
+
+    def upload(self, text):
+        self.bucket.upload("msa.pdf", text.encode())
+        self.tools.contracts._versions.clear()
+
+
+class TestAnalysisCache(ContractAnalyzerTestCase):
+    def test_repeated_question_is_answered_from_the_cache(self):
+        first = self.tools.analyze_contract_clause("msa.pdf", "Exclusivity")
+        again = self.tools.analyze_contract_clause("msa.pdf", " exclusivity ")
+        self.assertEqual(again, first)
+        self.assertEqual(len(self.model.prompts), 1)
+
+    def test_only_matching_clauses_are_sent(self):
+        self.tools.analyze_contract_clause("msa.pdf", "Force Majeure")
+        self.assertIn("7.B NON-PERFORMANCE", self.model.prompts[0])
+        self.assertNotIn("90 days notice", self.model.prompts[0])
+
+    def test_new_contract_version_misses_the_cache(self):
+        self.tools.analyze_contract_clause("msa.pdf", "Exclusivity")
+        self.upload(CONTRACT.replace("exclusively", "only"))
+        self.tools.analyze_contract_clause("msa.pdf", "Exclusivity")
+        self.assertEqual(len(self.model.prompts), 2)
+
+
+class TestAnalyzeContractClauses(ContractAnalyzerTestCase):
+    def test_one_call_for_several_clauses(self):
+        result = self.tools.analyze_contract_clauses(
+            "msa.pdf", ["Exclusivity", "Force Majeure", "exclusivity"]
+        )
+        # Entries are matched by index, whatever the model calls the clause.
+        self.assertEqual(
+            [(c["clause_type"], c["quote"]) for c in result["clauses"]],
+            [("Exclusivity", "quote of Exclusivity"), ("Force Majeure", "quote of Force Majeure")],
+        )
+        self.assertEqual(len(self.model.prompts), 1)
+
+    def test_only_uncached_clauses_are_asked_for(self):
+        self.tools.analyze_contract_clauses("msa.pdf", ["Exclusivity"])
+        self.tools.analyze_contract_clauses("msa.pdf", ["Exclusivity", "Termination"])
+        self.assertIn("1. Termination", self.model.prompts[-1])
+        self.assertNotIn("Exclusivity", self.model.prompts[-1].split("Reply")[0])
+
+    def test_clause_left_out_by_the_model_is_not_found(self):
+        self.model.answer = lambda prompt: json.dumps(
+            {"clauses": [{"index": 1, "clause_type": "Exclusivity", "found": True}]}
+        )
+        result = self.tools.analyze_contract_clauses("msa.pdf", ["Exclusivity", "Warranty"])
+        self.assertEqual([c["found"] for c in result["clauses"]], [True, False])
+        # The made-up answer is not cached: the next call asks again.
+        self.tools.analyze_contract_clauses("msa.pdf", ["Warranty"])
+        self.assertEqual(len(self.model.prompts), 2)
+
+    def test_invalid_json_is_an_error(self):
+        self.model.answer = lambda prompt: "not json"
+        result = self.tools.analyze_contract_clauses("msa.pdf", ["Exclusivity"])
+        self.assertIn("error", result)
+
+
+class TestClauseReuse(ContractAnalyzerTestCase):
+    """A new contract version only re-analyzes questions whose clauses changed."""
+
+    def test_unchanged_clause_is_reused(self):
+        first = self.tools.analyze_contract_clause("msa.pdf", "Exclusivity")
+        self.upload(CONTRACT.replace("90 days notice", "30 days notice"))
+        self.assertEqual(self.tools.analyze_contract_clause("msa.pdf", "Exclusivity"), first)
+        self.tools.analyze_contract_clause("msa.pdf", "Termination")
+        self.assertEqual(len(self.model.prompts), 2)
+        self.assertIn("30 days notice", self.model.prompts[-1])
+
+    def test_structured_analyses_are_reused_per_clause(self):
+        self.tools.analyze_contract_clauses("msa.pdf", ["Exclusivity", "Termination"])
+        self.upload(CONTRACT.replace("90 days notice", "30 days notice"))
+        result = self.tools.analyze_contract_clauses("msa.pdf", ["Exclusivity", "Termination"])
+        self.assertEqual(len(self.model.prompts), 2)
+        asked = self.model.prompts[-1].split("Reply")[0]
+        self.assertIn("1. Termination", asked)
+        self.assertNotIn("Exclusivity", asked)
+        self.assertEqual([c["found"] for c in result["clauses"]], [True, True])
+
+    def test_reformatting_is_not_a_change(self):
+        self.tools.analyze_contract_clause("msa.pdf", "Exclusivity")
+        self.upload(CONTRACT.replace("Buyer purchases", "Buyer   purchases\n"))
+        self.tools.analyze_contract_clause("msa.pdf", "Exclusivity")
+        self.assertEqual(len(self.model.prompts), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import json
+import unittest
+from unittest import mock
+
+from fakes import FakeBigQueryClient
+from tools.database import DatabaseTools, _decode_page_token, _encode_page_token
+from tools.local_database import SQLiteDatabaseTools
+
+TABLE = "`gpu_procurement_db.LEGACY_INV_MAIN_V2`"
+QUERY = f"SELECT * FROM {TABLE} ORDER BY ITEM_REF_ID"
+
+
+def rewrite(token, **changes):
+    """The token with some payload fields replaced, as a client could forge it."""
+    payload = json.loads(base64.urlsafe_b64decode(token))
+    payload.update(changes)
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+class TestPageToken(unittest.TestCase):
+    def test_round_trip(self):
+        token = _encode_page_token(QUERY, "job_1", "EU", 50)
+        self.assertEqual(_decode_page_token(token, QUERY), ("job_1", "EU", 50))
+
+    def test_equivalent_sql_may_resume(self):
+        token = _encode_page_token(QUERY, "job_1", "EU", 50)
+        reformatted = f"SELECT *\n  FROM {TABLE} -- all rows\n ORDER BY ITEM_REF_ID;"
+        self.assertEqual(_decode_page_token(token, reformatted), ("job_1", "EU", 50))
+
+    def test_other_sql_is_rejected(self):
+        token = _encode_page_token(QUERY, "job_1", "EU", 50)
+        with self.assertRaisesRegex(ValueError, "different sql_query"):
+            _decode_page_token(token, f"SELECT ITEM_REF_ID FROM {TABLE}")
+
+    def test_tampered_tokens_are_rejected(self):
+        token = _encode_page_token(QUERY, "job_1", "EU", 50)
+        for tampered in (
+            "not a token!",
+            token[:-4],
+            base64.urlsafe_b64encode(b"[1, 2]").decode(),
+            rewrite(token, off="fifty"),
+            rewrite(token, off=-1),
+            rewrite(token, sql=None),
+        ):
+            with self.subTest(token=tampered):
+                with self.assertRaises(ValueError):
+                    _decode_page_token(tampered, QUERY)
+
+
+class TestLocalFetchQueryPage(unittest.TestCase):
+    def setUp(self):
+        self.db = SQLiteDatabaseTools(db_path=":memory:")
+
+    def test_pages_cover_the_result_once(self):
+        expected = self.db.run_query(QUERY)
+        rows, token = [], ""
+        while True:
+            page = self.db.fetch_query_page(QUERY, page_size=2, page_token=token)
+            rows.extend(page["rows"])
+            token = page["next_page_token"]
+            if not token:
+                break
+        self.assertEqual(rows, expected)
+        self.assertEqual(page["total_rows"], len(expected))
+
+    def test_token_reused_with_other_sql_is_an_error(self):
+        token = self.db.fetch_query_page(QUERY, page_size=1)["next_page_token"]
+        other = self.db.fetch_query_page(f"SELECT * FROM {TABLE}", page_token=token)
+        self.assertIn("different sql_query", other["error"])
+
+
+class TestBigQueryFetchQueryPage(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeBigQueryClient(rows=[{"n": n} for n in range(5)])
+        with mock.patch.object(DatabaseTools, "_create_client", return_value=self.client):
+            self.db = DatabaseTools()
+
+    def test_next_page_resumes_the_same_job(self):
+        first = self.db.fetch_query_page(QUERY, page_size=2)
+        token = first["next_page_token"]
+        second = self.db.fetch_query_page(QUERY, page_size=2, page_token=token)
+        self.assertEqual([row["n"] for row in first["rows"] + second["rows"]], [0, 1, 2, 3])
+        self.assertEqual(second["first_row"], 3)
+        # The query ran once; the second page was read from its job.
+        self.assertEqual(self.client.calls, ["query", "get_job"])
+
+    def test_rejected_token_reads_no_job(self):
+        token = self.db.fetch_query_page(QUERY, page_size=2)["next_page_token"]
+        for sql_query, page_token in (
+            ("SELECT 1", token),
+            (QUERY, rewrite(token, sql="0" * 16)),
+            (QUERY, "garbage"),
+        ):
+            with self.subTest(page_token=page_token):
+                result = self.db.fetch_query_page(sql_query, page_token=page_token)
+                self.assertIn("page_token", result["error"])
+        self.assertEqual(self.client.calls, ["query"])
+
+
+if __name__ == "__main__":
+    unittest.main()
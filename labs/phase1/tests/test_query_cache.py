@@ -0,0 +1,98 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from tools.database import QueryResultCache, _normalize_sql
+from tools.local_database import SQLiteDatabaseTools
+
+TABLE = "`gpu_procurement_db.LEGACY_INV_MAIN_V2`"
+
+
+class TestNormalizeSql(unittest.TestCase):
+    def test_ignores_comments_whitespace_and_semicolon(self):
+        query = f"SELECT *\n  FROM {TABLE} -- all bins\nWHERE QOH_RAW_VAL > 0;"
+        self.assertEqual(
+            _normalize_sql(query), f"SELECT * FROM {TABLE} WHERE QOH_RAW_VAL > 0"
+        )
+
+    def test_keeps_string_literals(self):
+        query = "SELECT '--  not a comment' AS s"
+        self.assertEqual(_normalize_sql(query), query)
+
+
+class TestQueryResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = QueryResultCache(max_entries=8, ttl_seconds=60)
+
+    def test_hit_needs_same_table_versions(self):
+        self.cache.set("k", {"t": "1"}, [{"a": 1}])
+        self.assertEqual(self.cache.get("k", {"t": "1"}), [{"a": 1}])
+        self.assertIsNone(self.cache.get("k", {"t": "2"}))
+        # A stale entry is dropped, not kept for the old version.
+        self.assertIsNone(self.cache.get("k", {"t": "1"}))
+
+    def test_returns_copies(self):
+        self.cache.set("k", {}, [{"a": 1}])
+        self.cache.get("k", {})[0]["a"] = 2
+        self.assertEqual(self.cache.get("k", {}), [{"a": 1}])
+
+    def test_stores_copies(self):
+        rows = [{"a": 1}]
+        self.cache.set("k", {}, rows)
+        rows[0]["a"] = 2
+        rows.append({"a": 3})
+        self.assertEqual(self.cache.get("k", {}), [{"a": 1}])
+
+
+class TestRunQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.db = SQLiteDatabaseTools(db_path=":memory:")
+        self.execute = mock.patch.object(self.db, "_execute", wraps=self.db._execute).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_equivalent_queries_share_an_entry(self):
+        first = self.db.run_query(f"SELECT * FROM {TABLE}")
+        second = self.db.run_query(f"SELECT *\n FROM {TABLE}; -- again")
+        self.assertEqual(first, second)
+        self.assertEqual(self.execute.call_count, 1)
+
+    def test_caller_changes_do_not_reach_the_cache(self):
+        query = f"SELECT * FROM {TABLE}"
+        first = self.db.run_query(query)
+        expected = [dict(row) for row in first]
+        first[0]["ITEM_REF_ID"] = "CHANGED"
+        first.pop()
+        self.assertEqual(self.db.run_query(query), expected)
+        self.assertEqual(self.execute.call_count, 1)
+
+    def test_write_to_a_table_invalidates_its_results(self):
+        query = f"SELECT COUNT(*) AS n FROM {TABLE}"
+        before = self.db.run_query(query)[0]["n"]
+        self.db.run_query(f"INSERT INTO {TABLE} VALUES ('REF_X', 'A1', 1, 0, 0)")
+        self.assertEqual(self.db.run_query(query)[0]["n"], before + 1)
+        self.assertEqual(self.execute.call_count, 3)
+
+    def test_uncacheable_statements(self):
+        for query in (
+            f"SELECT CURRENT_DATE() AS d FROM {TABLE}",
+            f"DELETE FROM {TABLE} WHERE 1 = 0",
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(self.db._cache_key(query), (None, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
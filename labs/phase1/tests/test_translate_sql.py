@@ -0,0 +1,75 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from tools.local_database import SQLiteDatabaseTools, translate_sql
+
+
+class TestTranslateSql(unittest.TestCase):
+    def test_qualified_table_names(self):
+        self.assertEqual(
+            translate_sql("SELECT * FROM `my-project.gpu_procurement_db.REF_CATALOG_DUMP`"),
+            'SELECT * FROM "REF_CATALOG_DUMP"',
+        )
+        self.assertEqual(
+            translate_sql("SELECT * FROM gpu_procurement_db.REF_CATALOG_DUMP"),
+            'SELECT * FROM "REF_CATALOG_DUMP"',
+        )
+
+    def test_parameters(self):
+        self.assertEqual(
+            translate_sql("SELECT * FROM t WHERE chip = @chip"),
+            "SELECT * FROM t WHERE chip = :chip",
+        )
+
+    def test_cast_types(self):
+        self.assertEqual(
+            translate_sql("SELECT CAST(x AS INT64), CAST(SUM(y) AS float64 ) FROM t"),
+            "SELECT CAST(x AS INTEGER), CAST(SUM(y) AS REAL ) FROM t",
+        )
+
+    def test_column_aliases_named_like_types_are_kept(self):
+        query = "SELECT price AS numeric, qty AS STRING FROM t"
+        self.assertEqual(translate_sql(query), query)
+
+    def test_create_table(self):
+        sql = (
+            "CREATE OR REPLACE TABLE `ds.T` (\n"
+            "    ID STRING OPTIONS(description=\"An (odd) id\"),\n"
+            "    QTY INT64\n"
+            ");"
+        )
+        self.assertEqual(
+            translate_sql(sql),
+            'DROP TABLE IF EXISTS "T"; CREATE TABLE "T" (\n    ID TEXT,\n    QTY INTEGER\n);',
+        )
+
+    def test_string_literals(self):
+        self.assertEqual(
+            translate_sql("""SELECT 'AS INT64)', "it's" FROM `ds.T`"""),
+            """SELECT 'AS INT64)', 'it''s' FROM "T\"""",
+        )
+
+    def test_runs_on_sqlite(self):
+        db = SQLiteDatabaseTools(db_path=":memory:")
+        rows = db.run_query(
+            "SELECT ITEM_REF_ID, CAST(QOH_RAW_VAL AS STRING) AS qty"
+            " FROM `gpu_procurement_db.LEGACY_INV_MAIN_V2` WHERE LOC_BIN_HEX = \"55\""
+        )
+        self.assertEqual(rows, [{"ITEM_REF_ID": "REF_H100_XIE", "qty": "300"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
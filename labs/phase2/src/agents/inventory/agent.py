@@ -13,10 +13,11 @@
 # limitations under the License.
 
 from google.adk import Agent
-from tools.database import DatabaseTools
+from tools.database import create_database_tools
+from utils.async_tools import async_tool
 from utils.config import config
 
-db_tools = DatabaseTools()
+db_tools = create_database_tools()
 
 INVENTORY_SYSTEM_PROMPT = f"""
 You are the Inventory Investigator Agent.
@@ -43,6 +44,8 @@ CRITICAL RULES:
    c. NEVER filter the Inventory table using 'NV-' strings.
 
 5. Look specifically for 'Quarantine' or 'Hold' bins if standard stock is 0.
+6. If a query may return many rows, use 'fetch_query_page' instead of 'run_query'
+   and only request the next page (with its 'next_page_token') if you need it.
 """
 
 inventory_agent = Agent(
@@ -50,6 +53,10 @@ inventory_agent = Agent(
    model=config.MODEL_NAME,
    instruction=INVENTORY_SYSTEM_PROMPT,
    description="Agent for finding inventory information in the legacy database.",
-   tools=[db_tools.explore_schema, db_tools.run_query],
+   tools=[
+       async_tool(db_tools.explore_schema),
+       async_tool(db_tools.run_query),
+       async_tool(db_tools.fetch_query_page),
+   ],
    output_key="inventory_agent_result",
 )
@@ -14,8 +14,11 @@
 
 from google.adk import Agent
 from tools.rag import LegalTools
+from utils.async_tools import async_tool
 from utils.config import config
 
+legal_tools = LegalTools()
+
 LEGAL_SYSTEM_PROMPT = """
 You are the Legal Analyst Agent.
 Your goal is to interpret vendor contracts to find allowable exceptions for procurement.
@@ -25,8 +28,12 @@ ENVIRONMENT CONTEXT:
 
 CRITICAL RULES:
 1. You NEVER read whole documents. You use 'analyze_contract_clause' to fetch specific sections.
+   When you need several clauses from one document, fetch them together with
+   'analyze_contract_clauses' (one call, one result per clause).
 2. You are looking for 'Exclusivity' clauses (restrictions) and 'Force Majeure' clauses (exceptions).
 3. Interpret 'HOLD_LEGAL' status codes based on contract definitions.
+4. To find which contracts (or vendors) have a kind of clause, use 'search_clauses'
+   across the whole ingested contract corpus; then analyze the documents it names.
 """
 
 legal_agent = Agent(
@@ -34,6 +41,10 @@ legal_agent = Agent(
     model=config.MODEL_NAME,
     instruction=LEGAL_SYSTEM_PROMPT,
     description="Agent for extracting clauses from legal contracts",
-    tools=[LegalTools().analyze_contract_clause],
+    tools=[
+        async_tool(legal_tools.analyze_contract_clause),
+        async_tool(legal_tools.analyze_contract_clauses),
+        async_tool(legal_tools.search_clauses),
+    ],
     output_key="legal_agent_result",
 )
\ No newline at end of file
@@ -14,6 +14,7 @@
 
 from google.adk import Agent
 from tools.api import LogisticsTools
+from utils.async_tools import async_tool
 from utils.config import config
 
 tools = LogisticsTools()
@@ -21,6 +22,13 @@ tools = LogisticsTools()
 LOGISTICS_SYSTEM_PROMPT = """
 You are the Logistics Manager.
 Your goal is to find real-time pricing and shipping estimates from the external market.
+When you need quotes for more than one chip or route, use fetch_spot_prices_batch
+and estimate_shipping_batch to get them all in a single call.
+When one vendor cannot supply the full quantity, use quote_fill to split the order
+across vendors at the lowest total cost.
+Use plan_route for multi-leg shipping options, optimizing for "cost" or "time".
+If the requested chip is scarce, use find_available_chips to discover alternatives
+in the same family that are in stock.
 """
 
 logistics_agent = Agent(
@@ -28,6 +36,14 @@ logistics_agent = Agent(
     model=config.MODEL_NAME,
     instruction=LOGISTICS_SYSTEM_PROMPT,
     description="Agent for fetching price quotes from the API.",
-    tools=[tools.fetch_spot_prices, tools.estimate_shipping],
+    tools=[
+        async_tool(tools.fetch_spot_prices),
+        async_tool(tools.estimate_shipping),
+        async_tool(tools.fetch_spot_prices_batch),
+        async_tool(tools.estimate_shipping_batch),
+        async_tool(tools.quote_fill),
+        async_tool(tools.plan_route),
+        async_tool(tools.find_available_chips),
+    ],
     output_key="logistics_agent_result",
 )
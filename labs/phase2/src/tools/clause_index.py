@@ -0,0 +1,240 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import io
+import logging
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pypdf import PdfReader
+from tools.clause_retrieval import HybridIndex
+from utils.cache import DiskCache, TTLCache
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+# Clause headings: "2. EXCLUSIVITY", "7.B NON-PERFORMANCE & EXCEPTIONS", "SECTION 4: STATUS CODES".
+_HEADING_PATTERN = re.compile(
+    r"^\s*(?:SECTION\s+)?(\d+(?:\.[A-Z0-9]+)*)[.:]?\s+([A-Z][A-Z0-9 &/,'()\-]*)$"
+)
+_NUMBER_PATTERN = re.compile(r"\b(\d+(?:\.[A-Za-z0-9]+)*)\b")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class Clause:
+    number: str
+    heading: str
+    text: str
+
+    def render(self) -> str:
+        return f"{self.number} {self.heading}\n{self.text}".strip()
+
+    def digest(self) -> str:
+        """Content hash of the clause, including its number and heading."""
+        return text_digest(self.render())
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 of the text, ignoring how it is broken into lines and spaced."""
+    return hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+
+
+def clauses_digest(clauses: Sequence[Clause]) -> str:
+    """One hash for a set of clauses: what an analysis of exactly those clauses rests on."""
+    return text_digest(" ".join(sorted(clause.digest() for clause in clauses)))
+
+
+def extract_pdf_text(data: bytes) -> str:
+    """Plain text of every page of a PDF, in page order."""
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def split_clauses(text: str) -> List[Clause]:
+    """
+    Splits contract text at numbered clause headings. Text before the first
+    heading becomes a clause numbered "0" (title, parties).
+    """
+    clauses = [Clause("0", "PREAMBLE", "")]
+    body: List[str] = []
+    for line in text.splitlines():
+        match = _HEADING_PATTERN.match(line.strip())
+        if match and len(line.strip()) <= 80:
+            clauses[-1].text = "\n".join(body).strip()
+            clauses.append(Clause(match.group(1), match.group(2).strip(), ""))
+            body = []
+        elif line.strip():
+            body.append(line.strip())
+    clauses[-1].text = "\n".join(body).strip()
+    return [clause for clause in clauses if clause.text or clause.number != "0"]
+
+
+def normalize_clause_type(clause_type: str) -> str:
+    """Case, punctuation and spacing folded: "Force-Majeure " -> "force majeure"."""
+    return " ".join(_WORD_PATTERN.findall(clause_type.lower()))
+
+
+class ClauseIndex:
+    """
+    The clauses of one contract version, searchable by clause number
+    ("7.B", "Section 2") or by hybrid BM25 + TF-IDF retrieval over headings
+    and text. Retrieval expands legal concepts, so "Force Majeure" also finds
+    a clause headed "NON-PERFORMANCE & EXCEPTIONS" (see tools.clause_retrieval).
+    """
+
+    def __init__(
+        self,
+        doc_name: str,
+        version: str,
+        text: str,
+        clauses: List[Clause],
+        retrieval: Optional[HybridIndex] = None,
+    ):
+        self.doc_name = doc_name
+        self.version = version
+        self.text = text
+        self.clauses = clauses
+        self._by_number = {clause.number.upper(): clause for clause in clauses}
+        self.retrieval = retrieval or HybridIndex.build(
+            [(clause.heading, clause.text) for clause in clauses]
+        )
+
+    def _by_reference(self, query: str, limit: int) -> Optional[List[Clause]]:
+        """Clauses the query names by number, or None if it names none of them."""
+        for number in _NUMBER_PATTERN.findall(query):
+            number = number.upper()
+            if number in self._by_number:
+                return [self._by_number[number]]
+            children = [c for c in self.clauses if c.number.upper().startswith(f"{number}.")]
+            if children:
+                return children[:limit]
+        return None
+
+    def search_many(self, queries: Sequence[str], limit: int = 3) -> List[List[Clause]]:
+        """
+        Best matching clauses for each query, best first. Queries that name no
+        clause number are retrieved together in one batch.
+        """
+        results: List[List[Clause]] = []
+        pending: Dict[int, str] = {}
+        for position, query in enumerate(queries):
+            referenced = self._by_reference(query, limit)
+            results.append(referenced or [])
+            if referenced is None:
+                pending[position] = query
+        if pending:
+            hits = self.retrieval.search(list(pending.values()), limit)
+            for position, ranked in zip(pending, hits):
+                results[position] = [self.clauses[index] for index, _ in ranked]
+        return results
+
+    def search(self, query: str, limit: int = 3) -> List[Clause]:
+        """Best matching clauses first; empty if nothing in the contract matches."""
+        return self.search_many([query], limit)[0]
+
+
+class ContractIndexStore:
+    """
+    Clause indexes for the contracts in a GCS bucket. A contract is
+    downloaded, extracted and split once per version (its MD5 content hash).
+    The index is kept in memory and, with a cache directory, on disk across
+    runs: clause text in SQLite, retrieval arrays as memory-mapped .npy files.
+    Uploading changed content makes a new version, indexed on next use.
+    """
+
+    def __init__(self, storage_client, bucket_name: str, cache_dir: Optional[str] = None):
+        self.bucket = storage_client.bucket(bucket_name)
+        self._indexes: Dict[str, ClauseIndex] = {}
+        self._disk = None
+        self._vector_dir = None
+        if cache_dir:
+            self._disk = DiskCache(os.path.join(cache_dir, "clause_index.sqlite"), max_entries=512)
+            self._vector_dir = os.path.join(cache_dir, "clause_vectors")
+        # Blob metadata lookups are round trips; re-check a document at most this often.
+        self._versions = TTLCache(
+            max_entries=512, ttl_seconds=config.CONTRACT_VERSION_CHECK_SECONDS
+        )
+        self._lock = threading.Lock()
+
+    def _blob_version(self, doc_name: str) -> Tuple[str, int]:
+        """The document's content hash (MD5, or the generation if GCS has none) and generation."""
+        cached = self._versions.get(doc_name)
+        if cached is None:
+            blob = self.bucket.get_blob(doc_name)
+            if blob is None:
+                raise FileNotFoundError(f"gs://{self.bucket.name}/{doc_name} does not exist")
+            cached = (blob.md5_hash or str(blob.generation), blob.generation)
+            self._versions.set(doc_name, cached)
+        return cached
+
+    def version(self, doc_name: str) -> str:
+        return self._blob_version(doc_name)[0]
+
+    def get(self, doc_name: str) -> ClauseIndex:
+        """The clause index of the document's current version, building it if needed."""
+        version, generation = self._blob_version(doc_name)
+        key = f"{doc_name}@{version}"
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                return index
+
+            entry = self._disk.get(key) if self._disk is not None else None
+            if entry is None:
+                data = self.bucket.blob(doc_name, generation=generation).download_as_bytes()
+                text = extract_pdf_text(data)
+                entry = {"text": text, "clauses": split_clauses(text)}
+                logger.info(f"Indexed {len(entry['clauses'])} clauses of {key}")
+                if self._disk is not None:
+                    self._disk.set(key, entry)
+
+            retrieval = self._load_retrieval(doc_name, version, entry["clauses"])
+            index = ClauseIndex(doc_name, version, entry["text"], entry["clauses"], retrieval)
+            # Older versions of the document are no longer needed in memory.
+            self._indexes = {
+                k: v for k, v in self._indexes.items() if not k.startswith(f"{doc_name}@")
+            }
+            self._indexes[key] = index
+            return index
+
+    def _load_retrieval(
+        self, doc_name: str, version: str, clauses: List[Clause]
+    ) -> Optional[HybridIndex]:
+        """The version's retrieval arrays, mapped from disk, or built and saved there."""
+        if self._vector_dir is None:
+            return None
+        doc_key = hashlib.sha1(doc_name.encode()).hexdigest()[:16]
+        version_key = hashlib.sha1(version.encode()).hexdigest()[:16]
+        directory = os.path.join(self._vector_dir, f"{doc_key}-{version_key}")
+        try:
+            return HybridIndex.load(directory)
+        except (OSError, ValueError):
+            pass
+
+        retrieval = HybridIndex.build([(clause.heading, clause.text) for clause in clauses])
+        try:
+            retrieval.save(directory)
+            # Arrays of the document's earlier versions are no longer needed.
+            for name in os.listdir(self._vector_dir):
+                if name.startswith(f"{doc_key}-") and name != os.path.basename(directory):
+                    shutil.rmtree(os.path.join(self._vector_dir, name), ignore_errors=True)
+        except OSError as e:
+            logger.warning(f"Could not save retrieval index of {doc_name}: {e}")
+        return retrieval
@@ -0,0 +1,266 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "the", "and", "for", "clause", "clauses", "section", "sections", "any", "that", "this",
+    "with", "from", "shall", "will", "are", "was", "its", "into", "such", "per",
+}
+
+# Contracts rarely name a clause the way a question does ("Force Majeure" is
+# often "Non-Performance & Exceptions"). A query mentioning a concept is
+# expanded with the words such clauses are written in, at EXPANSION_WEIGHT.
+LEGAL_CONCEPTS = {
+    "force majeure": "non-performance exception excused fails deliver delay beyond control "
+    "act of god war pandemic disaster suspend void",
+    "exclusivity": "exclusive exclusively sole solely",
+    "termination": "terminate cancel cancellation expire expiry notice",
+    "limitation of liability": "liable liability cap damages indemnity",
+    "warranty": "warrant defect repair replace guarantee",
+    "confidentiality": "confidential disclose disclosure secret",
+    "payment": "invoice fees price net days",
+    "legal hold": "hold quarantine frozen status code override",
+}
+EXPANSION_WEIGHT = 0.5
+# Query words also match index words sharing their first PREFIX_LENGTH letters
+# ("exclusive" ~ "exclusivity"), at PREFIX_WEIGHT.
+PREFIX_LENGTH = 5
+PREFIX_WEIGHT = 0.8
+# Headings count this many times over clause text.
+HEADING_WEIGHT = 3
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Share of the hybrid score from BM25 (normalized per query); the rest is TF-IDF cosine.
+BM25_SHARE = 0.5
+# Hits scoring below this fraction of the best hit are dropped as noise.
+MIN_RELATIVE_SCORE = 0.25
+# Clauses scored per step of a batched search, bounding its temporary arrays.
+ROW_BATCH = 4096
+
+_ARRAYS = ("indptr", "indices", "bm25", "tfidf", "idf")
+
+
+def _stem(word: str) -> str:
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) > len(suffix) + 3:
+            return word[: -len(suffix)]
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def analyze(text: str) -> List[str]:
+    """Lowercased, stemmed terms of a text, without stopwords."""
+    words = _WORD_PATTERN.findall(text.lower())
+    return [_stem(w) for w in words if len(w) > 2 and w not in _STOPWORDS]
+
+
+def related_words(query: str) -> List[str]:
+    """Words of the LEGAL_CONCEPTS the query names, unstemmed and without stopwords."""
+    terms = set(analyze(query))
+    words: List[str] = []
+    for concept, related in LEGAL_CONCEPTS.items():
+        if all(term in terms for term in analyze(concept)):
+            words.extend(
+                w for w in related.split() if len(w) > 2 and w not in _STOPWORDS and w not in words
+            )
+    return words
+
+
+def expand_query(query: str) -> Dict[str, float]:
+    """Query terms with weights, plus the vocabulary of any legal concept it names."""
+    weights = {term: 1.0 for term in analyze(query)}
+    for term in analyze(" ".join(related_words(query))):
+        weights.setdefault(term, EXPANSION_WEIGHT)
+    return weights
+
+
+class HybridIndex:
+    """
+    BM25 plus TF-IDF cosine over a fixed set of documents (clauses), held in
+    NumPy arrays: a CSR matrix of term weights per document, with one BM25
+    and one L2-normalized TF-IDF value per stored entry. Searches score a
+    batch of queries at once, ROW_BATCH documents at a time. save() writes
+    the arrays as .npy files which load() maps read-only, so large indexes
+    open instantly and are paged in on demand.
+    """
+
+    def __init__(self, vocabulary: List[str], arrays: Dict[str, np.ndarray]):
+        self.vocabulary = vocabulary
+        self._columns = {term: column for column, term in enumerate(vocabulary)}
+        self._prefixes: Dict[str, List[int]] = {}
+        for column, term in enumerate(vocabulary):
+            if len(term) >= PREFIX_LENGTH:
+                self._prefixes.setdefault(term[:PREFIX_LENGTH], []).append(column)
+        self.indptr = arrays["indptr"]
+        self.indices = arrays["indices"]
+        self.bm25 = arrays["bm25"]
+        self.tfidf = arrays["tfidf"]
+        self.idf = arrays["idf"]
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    @classmethod
+    def build(cls, documents: Sequence[Tuple[str, str]]) -> "HybridIndex":
+        """Indexes (heading, text) pairs; results refer to them by position."""
+        counts = [
+            Counter(analyze(heading) * HEADING_WEIGHT + analyze(text))
+            for heading, text in documents
+        ]
+        vocabulary = sorted(set().union(*counts))
+        columns = {term: column for column, term in enumerate(vocabulary)}
+
+        n = len(counts)
+        frequencies = np.zeros(len(vocabulary), dtype=np.float32)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indices, tf = [], []
+        for row, terms in enumerate(counts):
+            row_columns = sorted(columns[term] for term in terms)
+            indices.extend(row_columns)
+            tf.extend(terms[vocabulary[column]] for column in row_columns)
+            indptr[row + 1] = len(indices)
+            frequencies[row_columns] += 1
+        indices = np.asarray(indices, dtype=np.int32)
+        tf = np.asarray(tf, dtype=np.float32)
+
+        idf = np.log1p((n - frequencies + 0.5) / (frequencies + 0.5)).astype(np.float32)
+        lengths = np.diff(indptr)
+        doc_lengths = np.add.reduceat(tf, indptr[:-1][lengths > 0]) if len(tf) else tf
+        row_lengths = np.zeros(n, dtype=np.float32)
+        row_lengths[lengths > 0] = doc_lengths
+        per_entry_length = np.repeat(row_lengths, lengths)
+        average = float(row_lengths.mean()) if n else 0.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * per_entry_length / (average or 1.0))
+        bm25 = idf[indices] * tf * (BM25_K1 + 1) / (tf + norm)
+
+        tfidf = (1 + np.log(tf)) * idf[indices] if len(tf) else tf
+        squares = np.zeros(n, dtype=np.float32)
+        if len(tf):
+            squares[lengths > 0] = np.add.reduceat(tfidf * tfidf, indptr[:-1][lengths > 0])
+        tfidf = tfidf / np.repeat(np.sqrt(squares), lengths).clip(min=1e-12)
+
+        arrays = {
+            "indptr": indptr,
+            "indices": indices,
+            "bm25": bm25.astype(np.float32),
+            "tfidf": tfidf.astype(np.float32),
+            "idf": idf,
+        }
+        return cls(vocabulary, arrays)
+
+    def save(self, directory: str) -> None:
+        """Writes the index to directory, staged alongside it and then moved into place."""
+        parent = os.path.dirname(os.path.abspath(directory))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent)
+        try:
+            for name in _ARRAYS:
+                np.save(os.path.join(staging, f"{name}.npy"), getattr(self, name))
+            with open(os.path.join(staging, "vocabulary.json"), "w") as f:
+                json.dump(self.vocabulary, f)
+            shutil.rmtree(directory, ignore_errors=True)
+            os.replace(staging, directory)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, directory: str) -> "HybridIndex":
+        with open(os.path.join(directory, "vocabulary.json"), "r") as f:
+            vocabulary = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in _ARRAYS
+        }
+        return cls(vocabulary, arrays)
+
+    def _query_weights(self, query: str) -> Dict[int, float]:
+        """Vocabulary columns matching the query, exactly, by expansion or by prefix."""
+        weights: Dict[int, float] = {}
+        for term, weight in expand_query(query).items():
+            matches = [(self._columns.get(term), weight)]
+            if weight == 1.0 and len(term) >= PREFIX_LENGTH:
+                prefixed = self._prefixes.get(term[:PREFIX_LENGTH], [])
+                matches.extend((column, PREFIX_WEIGHT) for column in prefixed)
+            for column, match_weight in matches:
+                if column is not None and weights.get(column, 0.0) < match_weight:
+                    weights[column] = match_weight
+        return weights
+
+    def _scores(self, data: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """(documents x queries) products of one CSR value array with the query matrix."""
+        scores = np.zeros((len(self), queries.shape[0]), dtype=np.float32)
+        active = (queries != 0).any(axis=0)
+        for start in range(0, len(self), ROW_BATCH):
+            stop = min(len(self), start + ROW_BATCH)
+            lo, hi = int(self.indptr[start]), int(self.indptr[stop])
+            columns = self.indices[lo:hi]
+            # Only entries for terms some query uses can contribute.
+            used = np.flatnonzero(active[columns])
+            if not len(used):
+                continue
+            rows = np.repeat(np.arange(start, stop), np.diff(self.indptr[start : stop + 1]))
+            contributions = data[lo:hi][used, None] * queries[:, columns[used]].T
+            np.add.at(scores, rows[used], contributions)
+        return scores
+
+    def search(self, queries: Sequence[str], limit: int = 3) -> List[List[Tuple[int, float]]]:
+        """
+        For each query, up to limit (document position, score) pairs, best
+        first. Scores blend BM25 (scaled to the query's best) and cosine.
+        """
+        results: List[List[Tuple[int, float]]] = [[] for _ in queries]
+        if not len(self) or not self.vocabulary:
+            return results
+
+        bm25_queries = np.zeros((len(queries), len(self.vocabulary)), dtype=np.float32)
+        for row, query in enumerate(queries):
+            for column, weight in self._query_weights(query).items():
+                bm25_queries[row, column] = weight
+        # Query vectors for the cosine: TF-IDF weighted, unit length.
+        cosine_queries = bm25_queries * self.idf
+        norms = np.linalg.norm(cosine_queries, axis=1, keepdims=True)
+        cosine_queries /= norms.clip(min=1e-12)
+
+        bm25 = self._scores(self.bm25, bm25_queries)
+        cosine = self._scores(self.tfidf, cosine_queries)
+        best_bm25 = bm25.max(axis=0).clip(min=1e-12)
+        hybrid = BM25_SHARE * bm25 / best_bm25 + (1 - BM25_SHARE) * cosine
+
+        for row in range(len(queries)):
+            column = hybrid[:, row]
+            top = min(limit, len(column))
+            candidates = np.argpartition(-column, top - 1)[:top]
+            ranked = candidates[np.argsort(-column[candidates], kind="stable")]
+            floor = column[ranked[0]] * MIN_RELATIVE_SCORE if len(ranked) else 0.0
+            results[row] = [
+                (int(index), float(column[index]))
+                for index in ranked
+                if column[index] > 0 and column[index] >= floor
+            ]
+        return results
@@ -0,0 +1,39 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import inspect
+from typing import Any, Awaitable, Callable
+
+
+def async_tool(method: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """
+    Returns the '<name>_async' variant of a bound tool method, exposed to the
+    agent under the original tool name and docstring.
+
+    ADK awaits coroutine tools on the event loop, so branches of a ParallelAgent
+    can overlap their I/O instead of blocking each other. Keeping the sync name
+    means prompts that refer to tools by name stay valid.
+    """
+    async_method = getattr(method.__self__, f"{method.__name__}_async")
+
+    @functools.wraps(async_method)
+    async def tool(*args, **kwargs):
+        return await async_method(*args, **kwargs)
+
+    tool.__name__ = method.__name__
+    tool.__qualname__ = method.__name__
+    # getdoc() also finds docstrings inherited from a base class.
+    tool.__doc__ = inspect.getdoc(method)
+    return tool
@@ -0,0 +1,207 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    In-memory LRU cache where every entry also expires after a time-to-live.
+    Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300):
+        """
+        Args:
+            max_entries (int): Least recently used entries are evicted past this size.
+            ttl_seconds (float): Default lifetime of an entry in seconds.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the cached value, or the default if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Stores a value, evicting the least recently used entries if full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    Persistent key/value store backed by a single SQLite file.
+    Values are pickled. Least recently used entries are evicted once the
+    entry count or total payload size exceeds the configured caps.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            path (str): Location of the SQLite file. Parent directories are created.
+            max_entries (int, optional): Maximum number of entries to keep.
+            max_bytes (int, optional): Maximum total size of the pickled values.
+        """
+        self.path = os.path.abspath(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL,
+                expires_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the stored value, or the default if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return default
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+
+        try:
+            return pickle.loads(value)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry '{key}': {e}")
+            self.delete(key)
+            return default
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Stores a value, then evicts least recently used entries over the caps."""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, expires_at),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Removes expired entries, then the least recently used ones over the caps."""
+        self._conn.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        )
+
+        if self.max_entries is not None:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+        if self.max_bytes is not None:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+                ).fetchall()
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    total -= size
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
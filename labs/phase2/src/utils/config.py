@@ -25,6 +25,11 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default home of the on-disk caches (labs/phaseN/cache), whatever the working directory.
+DEFAULT_CACHE_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "cache")
+)
+
 
 class ConfigLoader:
     """
@@ -96,11 +101,24 @@ class ConfigLoader:
                 return secret_val
 
         # 3. Default
-        if default:
+        if default is not None:
             return default
 
         raise ValueError(f"Configuration missing for {key}. Checked Env and Secrets.")
 
+    def get_int(self, key: str, default: int) -> int:
+        """Fetches an integer setting, falling back to the default."""
+        return int(self.get(key, default=str(default)))
+
+    def get_float(self, key: str, default: float) -> float:
+        """Fetches a float setting, falling back to the default."""
+        return float(self.get(key, default=str(default)))
+
+    def get_bool(self, key: str, default: bool) -> bool:
+        """Fetches a boolean setting ('1', 'true', 'yes' or 'on' are truthy)."""
+        value = self.get(key, default=str(default))
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
 
 # Instantiate the loader once
 _loader = ConfigLoader()
@@ -117,12 +135,64 @@ class ProjectConfig:
     TABLE_INVENTORY: str = _loader.get("TABLE_INVENTORY", "LEGACY_INV_MAIN_V2")
     TABLE_CATALOG: str = _loader.get("TABLE_CATALOG", "REF_CATALOG_DUMP")
 
+    # Database Backend: "bigquery", or "sqlite" for an embedded offline copy
+    # hydrated from assets/sql (LOCAL_DB_PATH defaults to an in-memory database).
+    DB_BACKEND: str = _loader.get("DB_BACKEND", default="bigquery").lower()
+    LOCAL_DB_PATH: str = _loader.get("LOCAL_DB_PATH", default=":memory:")
+    LOCAL_DB_SQL_DIR: str = _loader.get("LOCAL_DB_SQL_DIR", default="")
+
+    # Query Result Cache
+    # Results are keyed by normalized SQL and dropped when a referenced table changes.
+    # Set QUERY_CACHE_DIR to also persist results on disk across runs.
+    QUERY_CACHE_ENABLED: bool = _loader.get_bool("QUERY_CACHE_ENABLED", True)
+    QUERY_CACHE_MAX_ENTRIES: int = _loader.get_int("QUERY_CACHE_MAX_ENTRIES", 256)
+    QUERY_CACHE_TTL_SECONDS: int = _loader.get_int("QUERY_CACHE_TTL_SECONDS", 600)
+    QUERY_CACHE_VERSION_CHECK_SECONDS: int = _loader.get_int(
+        "QUERY_CACHE_VERSION_CHECK_SECONDS", 30
+    )
+    QUERY_CACHE_DIR: str = _loader.get("QUERY_CACHE_DIR", default="")
+
+    # Upper bound on rows returned per fetch_query_page call.
+    QUERY_MAX_PAGE_SIZE: int = _loader.get_int("QUERY_MAX_PAGE_SIZE", 500)
+
+    # Results at least this large are read over the BigQuery Storage Read API.
+    BQ_STORAGE_MIN_ROWS: int = _loader.get_int("BQ_STORAGE_MIN_ROWS", 50000)
+
+    # Schema previews (columns + sample rows) persist here, keyed by table and lastModified.
+    SCHEMA_CACHE_DIR: str = _loader.get("SCHEMA_CACHE_DIR", default=DEFAULT_CACHE_DIR)
+
     # GCS Assets
     BUCKET_NAME: str = _loader.get(
         "GCS_BUCKET_NAME",
         default=f"{_loader._project_id}-gpu-procurement-docs",  # Good default naming convention
     )
 
+    # Contract Clause Index
+    # Contracts are extracted and split into numbered clauses once per content
+    # version (MD5); only the clauses matching a question are sent to the model.
+    CLAUSE_INDEX_ENABLED: bool = _loader.get_bool("CLAUSE_INDEX_ENABLED", True)
+    CLAUSE_INDEX_DIR: str = _loader.get("CLAUSE_INDEX_DIR", default=DEFAULT_CACHE_DIR)
+    CLAUSE_MATCH_LIMIT: int = _loader.get_int("CLAUSE_MATCH_LIMIT", 3)
+    CONTRACT_VERSION_CHECK_SECONDS: int = _loader.get_int(
+        "CONTRACT_VERSION_CHECK_SECONDS", 60
+    )
+    # Clause store for a whole contract corpus, filled by `python -m tools.clause_corpus`
+    # and queried by search_clauses. 0 workers means one parser process per CPU.
+    CLAUSE_CORPUS_PATH: str = _loader.get(
+        "CLAUSE_CORPUS_PATH", default=os.path.join(DEFAULT_CACHE_DIR, "clause_corpus.sqlite")
+    )
+    CLAUSE_INGEST_WORKERS: int = _loader.get_int("CLAUSE_INGEST_WORKERS", 0)
+    CLAUSE_SEARCH_LIMIT: int = _loader.get_int("CLAUSE_SEARCH_LIMIT", 5)
+
+    # Clause analyses are kept on disk, keyed by contract content hash, clause,
+    # model and prompt version; a new contract upload misses the cache.
+    ANALYSIS_CACHE_ENABLED: bool = _loader.get_bool("ANALYSIS_CACHE_ENABLED", True)
+    ANALYSIS_CACHE_DIR: str = _loader.get("ANALYSIS_CACHE_DIR", default=DEFAULT_CACHE_DIR)
+    ANALYSIS_CACHE_MAX_ENTRIES: int = _loader.get_int("ANALYSIS_CACHE_MAX_ENTRIES", 4096)
+    ANALYSIS_CACHE_MAX_BYTES: int = _loader.get_int(
+        "ANALYSIS_CACHE_MAX_BYTES", 64 * 1024 * 1024
+    )
+
     # Mock API (Cloud Run Service)
     # We default to localhost, but allow overriding via Secret/Env for the deployed URL
     API_BASE_URL: str = _loader.get(
@@ -130,6 +200,65 @@ class ProjectConfig:
         default="http://localhost:8080",
         secret_name="GPU_PROCUREMENT_API_URL",
     )
+    # "http" talks to a running server; "asgi" calls the FastAPI app from
+    # assets/mock_api (or MOCK_API_DIR) in-process, with no server at all.
+    API_TRANSPORT: str = _loader.get("API_TRANSPORT", default="http").lower()
+    MOCK_API_DIR: str = _loader.get("MOCK_API_DIR", default="")
+    # Fault scenario the mock API applies to our calls (sent as X-Mock-Profile);
+    # empty uses the server's MOCK_FAULT_PROFILE. See assets/mock_api/data/fault_profiles.json.
+    MOCK_API_PROFILE: str = _loader.get("MOCK_API_PROFILE", default="")
+
+    # Vendor API HTTP Client
+    # One pooled keep-alive session; 429/5xx responses are retried with backoff + jitter.
+    HTTP_POOL_CONNECTIONS: int = _loader.get_int("HTTP_POOL_CONNECTIONS", 10)
+    HTTP_POOL_MAXSIZE: int = _loader.get_int("HTTP_POOL_MAXSIZE", 20)
+    HTTP_CONNECT_TIMEOUT: float = _loader.get_float("HTTP_CONNECT_TIMEOUT", 3.05)
+    HTTP_READ_TIMEOUT: float = _loader.get_float("HTTP_READ_TIMEOUT", 10.0)
+    HTTP_MAX_RETRIES: int = _loader.get_int("HTTP_MAX_RETRIES", 3)
+    HTTP_BACKOFF_FACTOR: float = _loader.get_float("HTTP_BACKOFF_FACTOR", 0.5)
+    HTTP_BACKOFF_MAX: float = _loader.get_float("HTTP_BACKOFF_MAX", 10.0)
+    HTTP_BACKOFF_JITTER: float = _loader.get_float("HTTP_BACKOFF_JITTER", 0.25)
+    # HTTP/2 applies to the async client (the requests session is HTTP/1.1 only).
+    HTTP2_ENABLED: bool = _loader.get_bool("HTTP2_ENABLED", False)
+
+    # Vendor Quote Cache
+    # Quotes stay fresh for a per-endpoint TTL, then are served stale for up to
+    # QUOTE_STALE_SECONDS more while a background refresh fetches a new one.
+    QUOTE_CACHE_ENABLED: bool = _loader.get_bool("QUOTE_CACHE_ENABLED", True)
+    QUOTE_CACHE_MAX_ENTRIES: int = _loader.get_int("QUOTE_CACHE_MAX_ENTRIES", 1024)
+    SPOT_PRICE_TTL_SECONDS: float = _loader.get_float("SPOT_PRICE_TTL_SECONDS", 30.0)
+    SHIPPING_QUOTE_TTL_SECONDS: float = _loader.get_float(
+        "SHIPPING_QUOTE_TTL_SECONDS", 3600.0
+    )
+    QUOTE_STALE_SECONDS: float = _loader.get_float("QUOTE_STALE_SECONDS", 120.0)
+
+    # Shipping estimates are answered from a local copy of the vendor's route
+    # matrix, revalidated (If-None-Match) at most this often.
+    SHIPPING_MATRIX_ENABLED: bool = _loader.get_bool("SHIPPING_MATRIX_ENABLED", True)
+    SHIPPING_MATRIX_REVALIDATE_SECONDS: float = _loader.get_float(
+        "SHIPPING_MATRIX_REVALIDATE_SECONDS", 300.0
+    )
+
+    # Spot prices pushed over the vendor's SSE stream into a local price book.
+    # The server sends a heartbeat every 15s; a silent stream is reconnected.
+    # Not used with the asgi transport, which can't hold a stream open.
+    PRICE_STREAM_ENABLED: bool = _loader.get_bool("PRICE_STREAM_ENABLED", False)
+    PRICE_STREAM_READ_TIMEOUT: float = _loader.get_float("PRICE_STREAM_READ_TIMEOUT", 45.0)
+
+    # Order Submission
+    # Lines go out ORDER_BATCH_SIZE per request with up to ORDER_PIPELINE_DEPTH
+    # requests in flight. Idempotency keys make resubmitting an order safe.
+    ORDER_BATCH_SIZE: int = _loader.get_int("ORDER_BATCH_SIZE", 100)
+    ORDER_PIPELINE_DEPTH: int = _loader.get_int("ORDER_PIPELINE_DEPTH", 4)
+
+    # Vendor catalog listing: chips fetched per page (the API allows up to 500).
+    CATALOG_PAGE_SIZE: int = _loader.get_int("CATALOG_PAGE_SIZE", 200)
+
+    # Async Tool Concurrency
+    # Per-tool limits on in-flight calls when agents run their async tool variants.
+    DB_MAX_CONCURRENCY: int = _loader.get_int("DB_MAX_CONCURRENCY", 4)
+    HTTP_MAX_CONCURRENCY: int = _loader.get_int("HTTP_MAX_CONCURRENCY", 16)
+    LLM_MAX_CONCURRENCY: int = _loader.get_int("LLM_MAX_CONCURRENCY", 4)
 
     # Model Configuration
     MODEL_NAME: str = _loader.get("MODEL_NAME", default="gemini-2.5-pro")
@@ -0,0 +1,191 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import concurrent.futures
+import importlib.util
+import os
+import random
+import sys
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from utils.config import config
+
+# Throttling and transient server errors are retried; other errors are final.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# The mock vendor API, for the in-process "asgi" transport.
+DEFAULT_MOCK_API_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "assets", "mock_api"
+)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_mock_api_app: Any = None
+
+
+def http_timeout() -> Tuple[float, float]:
+    """The (connect, read) timeout applied to every vendor API request."""
+    return (config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT)
+
+
+def load_mock_api_app() -> Any:
+    """Imports the FastAPI app from assets/mock_api/main.py into this process."""
+    global _mock_api_app
+    if _mock_api_app is None:
+        app_dir = os.path.abspath(config.MOCK_API_DIR or DEFAULT_MOCK_API_DIR)
+        # main.py imports its sibling modules (catalog, order_book, ...) by name.
+        if app_dir not in sys.path:
+            sys.path.insert(0, app_dir)
+        spec = importlib.util.spec_from_file_location(
+            "mock_api_main", os.path.join(app_dir, "main.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _mock_api_app = module.app
+    return _mock_api_app
+
+
+class ASGIAdapter(BaseAdapter):
+    """
+    requests transport adapter that hands each request straight to an ASGI
+    app in this process, with no server process or socket in between. The
+    app runs on a private event loop thread, through httpx's ASGI transport.
+    """
+
+    def __init__(self, app: Any):
+        super().__init__()
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=self._loop.run_forever, name="asgi-transport", daemon=True
+        ).start()
+        self._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        future = asyncio.run_coroutine_threadsafe(
+            self._client.request(
+                request.method, request.url, content=request.body, headers=dict(request.headers)
+            ),
+            self._loop,
+        )
+        timeout = kwargs.get("timeout")
+        try:
+            asgi_response = future.result(
+                timeout[-1] if isinstance(timeout, tuple) else timeout
+            )
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise requests.exceptions.ReadTimeout(f"In-process call timed out: {request.url}")
+
+        response = requests.Response()
+        response.status_code = asgi_response.status_code
+        response.reason = asgi_response.reason_phrase
+        response.headers = CaseInsensitiveDict(asgi_response.headers)
+        response._content = asgi_response.content
+        response.encoding = asgi_response.encoding
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def default_headers() -> Dict[str, str]:
+    """Headers sent on every vendor API call."""
+    if config.MOCK_API_PROFILE:
+        return {"X-Mock-Profile": config.MOCK_API_PROFILE}
+    return {}
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session. Connections are kept alive and
+    reused across calls, and 429/5xx responses are retried with exponential
+    backoff plus jitter (honouring Retry-After).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=config.HTTP_MAX_RETRIES,
+                backoff_factor=config.HTTP_BACKOFF_FACTOR,
+                backoff_max=config.HTTP_BACKOFF_MAX,
+                backoff_jitter=config.HTTP_BACKOFF_JITTER,
+                status_forcelist=RETRY_STATUSES,
+                # Retrying POST is only safe because every vendor POST can be
+                # replayed: spot:batch and estimate:batch only quote, and each
+                # orders:batch line carries an idempotency key (see
+                # LogisticsTools._order_batches), so a replayed order returns its
+                # original confirmation instead of ordering twice.
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=config.HTTP_POOL_MAXSIZE,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.headers.update(default_headers())
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if config.API_TRANSPORT == "asgi":
+                session.mount(config.API_BASE_URL, ASGIAdapter(load_mock_api_app()))
+                # No proxies in-process; skips requests' per-call scan of the environment.
+                session.trust_env = False
+            _session = session
+        return _session
+
+
+def create_async_http_client(base_url: str) -> httpx.AsyncClient:
+    """Creates a pooled async client with the same timeouts, optionally over HTTP/2."""
+    if config.API_TRANSPORT == "asgi":
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=default_headers(),
+            transport=httpx.ASGITransport(app=load_mock_api_app()),
+        )
+    return httpx.AsyncClient(
+        base_url=base_url,
+        headers=default_headers(),
+        timeout=httpx.Timeout(config.HTTP_READ_TIMEOUT, connect=config.HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=config.HTTP_POOL_MAXSIZE,
+            max_keepalive_connections=config.HTTP_POOL_MAXSIZE,
+        ),
+        http2=config.HTTP2_ENABLED,
+    )
+
+
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based): the server's
+    Retry-After if given, else exponential backoff with random jitter.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), config.HTTP_BACKOFF_MAX)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+    backoff = min(config.HTTP_BACKOFF_FACTOR * (2**attempt), config.HTTP_BACKOFF_MAX)
+    return backoff + random.uniform(0, config.HTTP_BACKOFF_JITTER)
@@ -0,0 +1,176 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory stand-ins for the BigQuery, Cloud Storage and Vertex AI clients."""
+
+import base64
+import datetime
+import hashlib
+import itertools
+from typing import Any, Dict, List, Optional
+
+
+class FakeRowIterator(list):
+    """The rows of one result page, with the query's total row count."""
+
+    ARROW_BATCH_ROWS = 2
+
+    def __init__(self, client: "FakeBigQueryClient", rows: List[Dict], total_rows: int):
+        super().__init__(rows)
+        self.client = client
+        self.total_rows = total_rows
+
+    def to_arrow(self, bqstorage_client=None, create_bqstorage_client=True):
+        import pyarrow as pa
+
+        self.client.read_clients.append(bqstorage_client)
+        return pa.Table.from_pylist(list(self))
+
+    def to_arrow_iterable(self, bqstorage_client=None):
+        import pyarrow as pa
+
+        self.client.read_clients.append(bqstorage_client)
+        for start in range(0, len(self), self.ARROW_BATCH_ROWS):
+            yield pa.RecordBatch.from_pylist(self[start : start + self.ARROW_BATCH_ROWS])
+
+
+class FakeQueryJob:
+    def __init__(self, client: "FakeBigQueryClient", job_id: str, rows: List[Dict[str, Any]]):
+        self.client = client
+        self.job_id = job_id
+        self.location = "US"
+        self.rows = rows
+
+    def result(self, page_size=None, max_results=None, start_index=0) -> FakeRowIterator:
+        stop = None if max_results is None else start_index + max_results
+        return FakeRowIterator(self.client, self.rows[start_index:stop], len(self.rows))
+
+
+class FakeSchemaField:
+    def __init__(self, name: str, field_type: str):
+        self.name = name
+        self.field_type = field_type
+
+
+class FakeTable:
+    def __init__(
+        self, table_id: str, rows: List[Dict[str, Any]], table_type: str = "TABLE"
+    ):
+        self.project, self.dataset_id, self.table_id = table_id.split(".")
+        self.table_type = table_type
+        self.rows = rows
+        self.schema = [FakeSchemaField(name, "STRING") for name in (rows[0] if rows else {})]
+        self.modified = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def touch(self) -> None:
+        """Bumps lastModified, as a write to the table would."""
+        self.modified += datetime.timedelta(seconds=1)
+
+
+class FakeBigQueryClient:
+    """
+    The part of bigquery.Client the database tools use. Every query answers
+    with `rows`; calls are recorded by method name, and the Storage Read
+    client each Arrow download was given in read_clients.
+    """
+
+    def __init__(self, rows: Optional[List[Dict[str, Any]]] = None):
+        self.rows = rows or []
+        self.tables: Dict[str, FakeTable] = {}
+        self.jobs: Dict[str, FakeQueryJob] = {}
+        self.calls: List[str] = []
+        self.queries: List[str] = []
+        self.read_clients: List[Any] = []
+        self._job_ids = itertools.count(1)
+
+    def query(self, sql_query: str, job_config=None) -> FakeQueryJob:
+        self.calls.append("query")
+        self.queries.append(sql_query)
+        job = FakeQueryJob(self, f"job_{next(self._job_ids)}", list(self.rows))
+        self.jobs[job.job_id] = job
+        return job
+
+    def get_job(self, job_id: str, location: Optional[str] = None) -> FakeQueryJob:
+        self.calls.append("get_job")
+        return self.jobs[job_id]
+
+    def get_table(self, table_id: str) -> FakeTable:
+        self.calls.append("get_table")
+        return self.tables[table_id]
+
+    def list_rows(self, table: FakeTable, max_results: Optional[int] = None) -> List[Dict]:
+        self.calls.append("list_rows")
+        return table.rows[:max_results]
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str, data: bytes, generation: int):
+        self.bucket = bucket
+        self.name = name
+        self.data = data
+        self.generation = generation
+        self.md5_hash = base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+    def download_as_bytes(self) -> bytes:
+        self.bucket.downloads += 1
+        return self.data
+
+
+class FakeBucket:
+    """The part of storage.Bucket the contract tools use."""
+
+    name = "contracts"
+
+    def __init__(self):
+        self.blobs = {}
+        self.downloads = 0
+
+    def upload(self, name: str, data: bytes) -> None:
+        previous = self.blobs.get(name)
+        generation = previous.generation + 1 if previous else 1
+        self.blobs[name] = FakeBlob(self, name, data, generation)
+
+    def get_blob(self, name: str):
+        return self.blobs.get(name)
+
+    def blob(self, name: str, generation=None) -> FakeBlob:
+        return self.blobs[name]
+
+
+class FakeStorageClient:
+    def __init__(self):
+        self.contracts = FakeBucket()
+
+    def bucket(self, name: str) -> FakeBucket:
+        return self.contracts
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeModel:
+    """A GenerativeModel answering from a function of the prompt, recording each call."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    def generate_content(self, contents, **kwargs) -> FakeResponse:
+        self.prompts.append(contents[-1])
+        return FakeResponse(self.answer(contents[-1]))
+
+    async def generate_content_async(self, contents, **kwargs) -> FakeResponse:
+        return self.generate_content(contents, **kwargs)
@@ -0,0 +1,135 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import inspect
+import threading
+import unittest
+import warnings
+from unittest import mock
+
+from google.adk.tools import FunctionTool
+
+from fakes import FakeBigQueryClient
+from tools.api import LogisticsTools
+from tools.database import DatabaseTools
+from utils.async_tools import async_tool
+
+
+class GatedTools:
+    """A tool whose async variant waits until `expected` calls are in flight."""
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.in_flight = 0
+        self.gate = None
+
+    def lookup(self, key: str) -> str:
+        """Looks a key up."""
+        return key.upper()
+
+    async def lookup_async(self, key: str) -> str:
+        if self.gate is None:
+            self.gate = asyncio.Event()
+        self.in_flight += 1
+        if self.in_flight == self.expected:
+            self.gate.set()
+        await self.gate.wait()
+        return key.upper()
+
+
+class BarrierClient(FakeBigQueryClient):
+    """A BigQuery fake whose queries block until `parties` of them are running."""
+
+    def __init__(self, parties: int):
+        super().__init__(rows=[{"n": 1}])
+        self.barrier = threading.Barrier(parties, timeout=2)
+
+    def query(self, sql_query: str, job_config=None):
+        self.barrier.wait()
+        return super().query(sql_query, job_config)
+
+
+def declaration(function):
+    """The function declaration ADK sends to the model for a tool."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return FunctionTool(function)._get_declaration()
+
+
+class TestToolMetadata(unittest.TestCase):
+    def setUp(self):
+        self.tools = LogisticsTools()
+
+    def test_keeps_the_sync_name_and_docstring(self):
+        tool = async_tool(self.tools.find_available_chips)
+        self.assertTrue(inspect.iscoroutinefunction(tool))
+        self.assertEqual(tool.__name__, "find_available_chips")
+        self.assertEqual(tool.__doc__, inspect.getdoc(self.tools.find_available_chips))
+
+    def test_adk_sees_the_same_tool(self):
+        for method in (
+            self.tools.fetch_spot_prices,
+            self.tools.estimate_shipping_batch,
+            self.tools.find_available_chips,
+        ):
+            with self.subTest(tool=method.__name__):
+                wrapped = declaration(async_tool(method))
+                self.assertEqual(wrapped, declaration(method))
+                self.assertEqual(wrapped.name, method.__name__)
+
+    def test_inherited_docstring(self):
+        class Tools(GatedTools):
+            def lookup(self, key: str) -> str:
+                return key
+
+        self.assertEqual(async_tool(Tools(1).lookup).__doc__, "Looks a key up.")
+
+    def test_missing_async_variant(self):
+        class Tools:
+            def lookup(self, key: str) -> str:
+                return key
+
+        with self.assertRaises(AttributeError):
+            async_tool(Tools().lookup)
+
+
+class TestConcurrency(unittest.TestCase):
+    """Calls that each wait for the other only finish if they run concurrently."""
+
+    def run_concurrently(self, *calls):
+        async def gather():
+            return await asyncio.wait_for(asyncio.gather(*calls), timeout=2)
+
+        return asyncio.run(gather())
+
+    def test_branches_overlap(self):
+        tool = async_tool(GatedTools(expected=2).lookup)
+        self.assertEqual(self.run_concurrently(tool("a"), tool("b")), ["A", "B"])
+
+    def test_adk_awaits_the_tool(self):
+        tool = FunctionTool(async_tool(GatedTools(expected=2).lookup))
+        calls = [tool.run_async(args={"key": key}, tool_context=mock.Mock()) for key in "ab"]
+        self.assertEqual(self.run_concurrently(*calls), ["A", "B"])
+
+    def test_blocking_queries_overlap_in_worker_threads(self):
+        client = BarrierClient(parties=2)
+        with mock.patch.object(DatabaseTools, "_create_client", return_value=client):
+            run_query = async_tool(DatabaseTools().run_query)
+        results = self.run_concurrently(run_query("SELECT 1"), run_query("SELECT 2"))
+        self.assertEqual(results, [[{"n": 1}], [{"n": 1}]])
+
+
+if __name__ == "__main__":
+    unittest.main()
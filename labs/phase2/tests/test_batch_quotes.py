@@ -0,0 +1,90 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+from unittest import mock
+
+from tools.api import LogisticsTools
+from utils.config import config
+
+# Known and unknown chips and routes, mixed within one batch.
+CHIPS = ["H100", "a100", "NO_SUCH_CHIP", " h100 ", "MI300X"]
+ROUTES = [("TW", "US"), ("XX", "US"), ("kr", "us"), ("TW", "ZZ"), ("TW", "DE")]
+
+
+class TestBatchEndpoints(unittest.TestCase):
+    """The mock API's batch endpoints answer like their per-item endpoints."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tools = LogisticsTools()
+
+    def test_spot_batch(self):
+        batch = self.tools._post_json("/v1/market/spot:batch", {"chips": CHIPS})
+        singles = [self.tools._get_json("/v1/market/spot", {"chip": chip}) for chip in CHIPS]
+        self.assertEqual(batch["quotes"], singles)
+        self.assertEqual(singles[2]["availability"], 0)
+
+    def test_shipping_batch(self):
+        routes = [{"origin": origin, "dest": dest} for origin, dest in ROUTES]
+        batch = self.tools._post_json("/v1/shipping/estimate:batch", {"routes": routes})
+        singles = [self.tools._get_json("/v1/shipping/estimate", route) for route in routes]
+        self.assertEqual(batch["quotes"], singles)
+
+    def test_empty_batches(self):
+        for path, body in [
+            ("/v1/market/spot:batch", {"chips": []}),
+            ("/v1/shipping/estimate:batch", {"routes": []}),
+        ]:
+            with self.subTest(path=path):
+                self.assertEqual(self.tools._post_json(path, body), {"quotes": []})
+
+
+class TestBatchTools(unittest.TestCase):
+    """fetch_spot_prices_batch and estimate_shipping_batch against per-item calls."""
+
+    def setUp(self):
+        # The per-call endpoints, not the locally answered shipping matrix.
+        patcher = mock.patch.object(config, "SHIPPING_MATRIX_ENABLED", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Separate clients, so neither answers from the other's quote cache.
+        self.batch_tools, self.single_tools = LogisticsTools(), LogisticsTools()
+
+    def test_spot_prices(self):
+        singles = [self.single_tools.fetch_spot_prices(chip) for chip in CHIPS]
+        self.assertEqual(self.batch_tools.fetch_spot_prices_batch(CHIPS), {"quotes": singles})
+        batch = asyncio.run(LogisticsTools().fetch_spot_prices_batch_async(CHIPS))
+        self.assertEqual(batch, {"quotes": singles})
+
+    def test_shipping_estimates(self):
+        routes = [f"{origin}-{dest}" for origin, dest in ROUTES]
+        singles = [self.single_tools.estimate_shipping(*route) for route in ROUTES]
+        self.assertEqual(self.batch_tools.estimate_shipping_batch(routes), {"quotes": singles})
+        batch = asyncio.run(LogisticsTools().estimate_shipping_batch_async(routes))
+        self.assertEqual(batch, {"quotes": singles})
+
+    def test_one_request_per_batch(self):
+        with mock.patch.object(
+            self.batch_tools, "_post_json", wraps=self.batch_tools._post_json
+        ) as post, mock.patch.object(self.batch_tools, "_get_json") as get:
+            self.batch_tools.fetch_spot_prices_batch(CHIPS)
+            self.batch_tools.estimate_shipping_batch(["TW-US", "XX-US"])
+        self.assertEqual(post.call_count, 2)
+        get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
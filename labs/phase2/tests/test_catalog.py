@@ -0,0 +1,184 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+from unittest import mock
+
+import requests
+
+import catalog as catalog_module
+from catalog import Catalog, load_catalog_data
+from tools.api import LogisticsTools
+
+
+def make_catalog():
+    chips = [
+        {"chip": f"{family}{number}", "vendor": "Acme", "price": 100, "availability": number % 3}
+        for family in ("A", "H", "MI")
+        for number in range(100, 120)
+    ]
+    return Catalog({"chips": chips})
+
+
+def walk(catalog, limit, **filters):
+    """The chip keys of every page of a listing, following its cursors."""
+    pages, after = [], None
+    while True:
+        page, after = catalog.list_chips(after, limit, **filters)
+        pages.append([quote["chip"] for quote in page])
+        if after is None:
+            return pages
+
+
+class TestCatalogPagination(unittest.TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def test_pages_cover_the_catalog_once_in_order(self):
+        pages = walk(self.catalog, 7)
+        chips = [chip for page in pages for chip in page]
+        self.assertEqual(chips, sorted(self.catalog.chips))
+        self.assertEqual([len(page) for page in pages], [7] * 8 + [4])
+
+    def test_family_and_availability_filters(self):
+        pages = walk(self.catalog, 5, family="h", min_availability=1)
+        chips = [chip for page in pages for chip in page]
+        expected = [f"H{n}" for n in range(100, 120) if n % 3]
+        self.assertEqual(chips, expected)
+
+    def test_sparse_filter_returns_short_pages_with_a_cursor(self):
+        with mock.patch.object(catalog_module, "MAX_SCAN_PER_PAGE", 4):
+            page, after = self.catalog.list_chips(None, 10, min_availability=2)
+        self.assertEqual([quote["chip"] for quote in page], ["A101"])
+        self.assertEqual(after, "A103")
+
+    def test_unknown_family_is_empty(self):
+        self.assertEqual(self.catalog.list_chips(None, 10, family="Z"), ([], None))
+
+
+# The spot quotes the mock API hard-coded before the catalog moved to data/catalog.json.
+BASELINE_QUOTES = {
+    "H100": {
+        "chip": "H100",
+        "price": 32000,
+        "currency": "USD",
+        "availability": 250,
+        "vendor": "FastChips_Reseller_LLC",
+    },
+    "A100": {
+        "chip": "A100",
+        "price": 15000,
+        "availability": 50,
+        "vendor": "Legacy_Systems_Inc",
+    },
+}
+
+
+class TestResolveChip(unittest.TestCase):
+    """
+    Chip lookups used to be a substring match ("H100" in the query, then "A100").
+    They now try the exact key, then each alphanumeric token, then the longest
+    catalog key the query starts with.
+    """
+
+    def setUp(self):
+        self.catalog = Catalog(load_catalog_data())
+
+    def test_baseline_quotes_are_unchanged(self):
+        for chip, quote in BASELINE_QUOTES.items():
+            with self.subTest(chip=chip):
+                self.assertEqual(self.catalog.find_chip(chip), quote)
+
+    def test_lookups_that_resolve_as_before(self):
+        for query, chip in [
+            ("h100", "H100"),
+            (" H100 ", "H100"),
+            ("NVIDIA H100", "H100"),
+            ("nvidia_h100", "H100"),
+            ("H100-SXM", "H100"),
+            ("H100 80GB", "H100"),
+            ("NVIDIA-A100-40GB", "A100"),
+            ("A100X", "A100"),
+            ("H1000", "H100"),
+            ("H100/A100", "H100"),
+            ("H10", None),
+            ("H 100", None),
+            ("B200", None),
+            ("", None),
+        ]:
+            with self.subTest(query=query):
+                self.assertEqual(self.catalog.resolve_chip(query), chip)
+
+    def test_lookups_that_resolve_differently(self):
+        for query, before, now in [
+            # The first token that names a chip wins, not H100 over A100.
+            ("A100 or H100", "H100", "A100"),
+            # A chip key inside a longer token no longer matches.
+            ("GH100", "H100", None),
+            ("xH100", "H100", None),
+        ]:
+            with self.subTest(query=query, before=before):
+                self.assertEqual(self.catalog.resolve_chip(query), now)
+
+
+class TestCatalogClient(unittest.TestCase):
+    """LogisticsTools' catalog paging against the mock API, in-process."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tools = LogisticsTools()
+
+    def test_iter_catalog_follows_cursors(self):
+        everything = list(self.tools.iter_catalog())
+        with mock.patch.object(self.tools, "_get_json", wraps=self.tools._get_json) as get:
+            paged = list(self.tools.iter_catalog(page_size=1))
+        self.assertEqual(paged, everything)
+        self.assertEqual(get.call_count, len(everything))
+
+    def test_find_available_chips_stops_at_the_limit(self):
+        with mock.patch.object(
+            self.tools, "_get_json_async", wraps=self.tools._get_json_async
+        ) as get:
+            result = asyncio.run(self.tools.find_available_chips_async(limit=1))
+            self.assertEqual((result["count"], get.call_count), (1, 1))
+            result = asyncio.run(self.tools.find_available_chips_async(limit=0))
+            self.assertEqual((result["count"], get.call_count), (0, 1))
+
+    def test_find_available_chips_without_a_positive_limit(self):
+        empty = {"chips": [], "count": 0}
+        with mock.patch.object(self.tools, "_get_json") as get, mock.patch.object(
+            self.tools, "_get_json_async"
+        ) as get_async:
+            for limit in (0, -1):
+                with self.subTest(limit=limit):
+                    self.assertEqual(self.tools.find_available_chips(limit=limit), empty)
+                    result = asyncio.run(self.tools.find_available_chips_async(limit=limit))
+                    self.assertEqual(result, empty)
+        get.assert_not_called()
+        get_async.assert_not_called()
+
+    def test_spot_endpoint_returns_the_baseline_quotes(self):
+        for chip, quote in BASELINE_QUOTES.items():
+            with self.subTest(chip=chip):
+                self.assertEqual(self.tools._get_json("/v1/market/spot", {"chip": chip}), quote)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(requests.HTTPError) as raised:
+            self.tools._get_json("/v1/market/catalog", {"cursor": "!!"})
+        self.assertEqual(raised.exception.response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
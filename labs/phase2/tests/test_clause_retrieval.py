@@ -0,0 +1,86 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import tempfile
+import unittest
+
+from tools.clause_retrieval import HybridIndex, analyze, expand_query, related_words
+
+CLAUSES = [
+    ("EXCLUSIVITY", "Buyer purchases all hardware exclusively from Vendor."),
+    ("NON-PERFORMANCE & EXCEPTIONS", "If Vendor fails to deliver for 60 days, Buyer is excused."),
+    ("TERMINATION", "Either party may terminate this agreement with 90 days notice."),
+    ("PAYMENT", "Invoices are due net 30 days."),
+]
+
+
+class TestQueryAnalysis(unittest.TestCase):
+    def test_analyze(self):
+        self.assertEqual(
+            analyze("The Parties shall deliver Deliveries"), ["party", "deliver", "delivery"]
+        )
+
+    def test_expand_query(self):
+        weights = expand_query("Force Majeure")
+        self.assertEqual((weights["force"], weights["majeure"]), (1.0, 1.0))
+        self.assertEqual(weights["excus"], 0.5)
+        self.assertEqual(expand_query("late delivery"), {"late": 1.0, "delivery": 1.0})
+
+    def test_related_words(self):
+        self.assertIn("non-performance", related_words("force majeure clause"))
+        self.assertEqual(related_words("force"), [])
+
+
+class TestHybridIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = HybridIndex.build(CLAUSES)
+
+    def positions(self, query, limit=3):
+        return [position for position, _ in self.index.search([query], limit)[0]]
+
+    def test_ranking(self):
+        self.assertEqual(self.positions("terminate agreement")[0], 2)
+        self.assertEqual(self.positions("invoice")[0], 3)
+
+    def test_concept_expansion_and_prefixes(self):
+        self.assertEqual(self.positions("Force Majeure")[0], 1)
+        self.assertEqual(self.positions("Exclusivity")[0], 0)
+        # "terminating" shares its first letters with "terminate".
+        self.assertEqual(self.positions("terminating")[0], 2)
+
+    def test_no_match(self):
+        self.assertEqual(self.positions("quantum entanglement"), [])
+
+    def test_batch_matches_single_queries(self):
+        queries = ["Force Majeure", "termination", "payment terms"]
+        self.assertEqual(
+            self.index.search(queries, 2), [self.index.search([q], 2)[0] for q in queries]
+        )
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp() + "/index"
+        self.index.save(directory)
+        loaded = HybridIndex.load(directory)
+        self.assertEqual(loaded.vocabulary, self.index.vocabulary)
+        self.assertEqual(
+            loaded.search(["Force Majeure", "invoice"]),
+            self.index.search(["Force Majeure", "invoice"]),
+        )
+
+    def test_empty_index(self):
+        self.assertEqual(HybridIndex.build([]).search(["anything"]), [[]])
+
+
+if __name__ == "__main__":
+    unittest.main()
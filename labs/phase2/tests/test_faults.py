@@ -0,0 +1,90 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import faults
+from faults import FaultInjector, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(faults.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        self.assertEqual([bucket.take() for _ in range(3)], [None, None, None])
+        self.assertEqual(bucket.take(), 1)
+
+    def test_refills_at_rate_up_to_burst(self):
+        bucket = TokenBucket(rate=2, burst=3)
+        for _ in range(3):
+            bucket.take()
+        self.clock.now += 0.5
+        self.assertIsNone(bucket.take())
+        self.assertIsNotNone(bucket.take())
+        self.clock.now += 60
+        self.assertEqual([bucket.take() for _ in range(4)], [None, None, None, 1])
+
+    def test_retry_after_reflects_the_deficit(self):
+        bucket = TokenBucket(rate=0.25, burst=1)
+        bucket.take()
+        self.assertEqual(bucket.take(), 4)
+        self.clock.now += 2
+        self.assertEqual(bucket.take(), 2)
+
+
+class TestFaultInjector(unittest.TestCase):
+    def setUp(self):
+        self.injector = FaultInjector(
+            {
+                "none": {},
+                "throttled": {"rate_limit": {"requests_per_second": 0.5, "burst": 1}},
+                "flaky": {"errors": {"/v1/market/spot": {"rate": 1.0, "statuses": [502]}}},
+            }
+        )
+
+    def test_throttled_requests_are_rejected_up_front(self):
+        profile = self.injector.profile("throttled")
+        self.assertEqual(self.injector.plan(profile, "/v1/market/spot"), (None, 0.0, None))
+        self.assertEqual(self.injector.plan(profile, "/v1/market/spot"), (2, 0.0, None))
+        # The readiness probe is never throttled.
+        self.assertEqual(self.injector.plan(profile, "/"), (None, 0.0, None))
+
+    def test_errors_by_path(self):
+        profile = self.injector.profile("flaky")
+        self.assertEqual(self.injector.plan(profile, "/v1/market/spot")[2], 502)
+        self.assertIsNone(self.injector.plan(profile, "/v1/market/fill")[2])
+
+    def test_profiles(self):
+        self.assertIs(self.injector.profile(""), self.injector.profiles["none"])
+        self.assertIsNone(self.injector.profile("missing"))
+        with self.assertRaises(ValueError):
+            FaultInjector({}, default="none")
+
+
+if __name__ == "__main__":
+    unittest.main()
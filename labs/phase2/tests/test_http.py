@@ -0,0 +1,267 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import httpx
+import requests
+
+from tools.api import LogisticsTools
+from utils import http
+from utils.config import config
+from utils.http import RETRY_STATUSES, ASGIAdapter, http_timeout
+
+
+async def slow_app(scope, receive, send):
+    """An ASGI app that answers every request after a second."""
+    await asyncio.sleep(1)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def echo_app(scope, receive, send):
+    """An ASGI app that returns the method, path, query, body and headers it got."""
+    body = (await receive())["body"]
+    payload = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "query": scope["query_string"].decode(),
+        "body": body.decode(),
+        "headers": {k.decode(): v.decode() for k, v in scope["headers"]},
+    }
+    headers = [(b"content-type", b"application/json"), (b"x-echo", b"1")]
+    await send({"type": "http.response.start", "status": 418, "headers": headers})
+    await send({"type": "http.response.body", "body": json.dumps(payload).encode()})
+
+
+class TestASGIAdapter(unittest.TestCase):
+    def setUp(self):
+        self.session = requests.Session()
+        self.adapter = ASGIAdapter(echo_app)
+        self.session.mount("http://vendor", self.adapter)
+        self.addCleanup(self.adapter.close)
+
+    def test_request_reaches_the_app_and_response_comes_back(self):
+        response = self.session.post(
+            "http://vendor/v1/x", params={"a": "1"}, json={"b": 2}, headers={"X-Test": "y"}
+        )
+        self.assertEqual(response.status_code, 418)
+        self.assertEqual(response.headers["X-Echo"], "1")
+        echoed = response.json()
+        self.assertEqual((echoed["method"], echoed["path"]), ("POST", "/v1/x"))
+        self.assertEqual((echoed["query"], json.loads(echoed["body"])), ("a=1", {"b": 2}))
+        self.assertEqual(echoed["headers"]["x-test"], "y")
+        with self.assertRaises(requests.HTTPError):
+            response.raise_for_status()
+
+    def test_read_timeout(self):
+        adapter = ASGIAdapter(slow_app)
+        self.addCleanup(adapter.close)
+        self.session.mount("http://slow", adapter)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.session.get("http://slow/", timeout=(1, 0.05))
+
+
+class TestInProcessLogisticsTools(unittest.TestCase):
+    """LogisticsTools over API_TRANSPORT=asgi: the mock API with no server."""
+
+    def setUp(self):
+        patchers = [
+            mock.patch.object(config, "API_TRANSPORT", "asgi"),
+            mock.patch.object(http, "_session", None),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.tools = LogisticsTools()
+
+    def test_sync_session_uses_the_app(self):
+        self.assertIsInstance(self.tools.session.get_adapter(config.API_BASE_URL), ASGIAdapter)
+        self.assertEqual(self.tools.fetch_spot_prices("H100")["chip"], "H100")
+        batch = self.tools.fetch_spot_prices_batch(["A100", "NOPE"])
+        self.assertEqual([quote["chip"] for quote in batch["quotes"]], ["A100", "NOPE"])
+
+    def test_async_client_uses_the_app(self):
+        async def quotes():
+            client = self.tools._get_async_client()
+            self.assertIsInstance(client._transport, httpx.ASGITransport)
+            try:
+                return await asyncio.gather(
+                    self.tools.fetch_spot_prices_async("H100"),
+                    self.tools.plan_route_async("CN", "DE", optimize="time"),
+                )
+            finally:
+                await client.aclose()
+
+        spot, route = asyncio.run(quotes())
+        self.assertEqual(spot, self.tools.fetch_spot_prices("H100"))
+        self.assertEqual(route, self.tools.plan_route("CN", "DE", optimize="time"))
+
+    def test_http_errors_surface_like_a_server(self):
+        with self.assertRaises(requests.HTTPError) as raised:
+            self.tools._get_json("/v1/market/fill", {"chip": "H100", "qty": 0})
+        self.assertEqual(raised.exception.response.status_code, 422)
+
+        async def fill():
+            try:
+                return await self.tools.quote_fill_async("H100", 0)
+            finally:
+                await self.tools._get_async_client().aclose()
+
+        self.assertIn("422", asyncio.run(fill())["error"])
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Answers with the server's queued statuses, then 200, recording each method."""
+
+    def _answer(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.methods.append(self.command)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = json.dumps({"status": status}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = _answer
+
+    def log_message(self, *args):
+        pass
+
+
+class RecordingAdapter(requests.adapters.BaseAdapter):
+    """Answers every request with an empty order result, recording its timeout."""
+
+    def __init__(self):
+        super().__init__()
+        self.timeouts = []
+
+    def send(self, request, **kwargs):
+        self.timeouts.append(kwargs.get("timeout"))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"confirmations": []}'
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """The pooled session's retries, against a local HTTP server."""
+
+    def setUp(self):
+        patchers = [
+            mock.patch.object(config, "API_TRANSPORT", "http"),
+            mock.patch.object(config, "HTTP_BACKOFF_FACTOR", 0),
+            mock.patch.object(config, "HTTP_BACKOFF_JITTER", 0),
+            mock.patch.object(http, "_session", None),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.session = http.get_http_session()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        self.server.statuses, self.server.methods = [], []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/orders:batch"
+
+    def send(self, method, *statuses):
+        self.server.statuses[:] = statuses
+        self.server.methods.clear()
+        response = self.session.request(method, self.url, json={}, timeout=http_timeout())
+        return response.status_code, len(self.server.methods)
+
+    def test_throttling_and_server_errors_are_retried_for_get_and_post(self):
+        for status in RETRY_STATUSES:
+            for method in ("GET", "POST"):
+                with self.subTest(status=status, method=method):
+                    self.assertEqual(self.send(method, status), (200, 2))
+
+    def test_client_errors_are_final(self):
+        for status in (400, 404, 409, 422):
+            with self.subTest(status=status):
+                self.assertEqual(self.send("POST", status), (status, 1))
+
+    def test_gives_up_after_max_retries(self):
+        attempts = config.HTTP_MAX_RETRIES + 1
+        self.assertEqual(self.send("POST", *[503] * 10), (503, attempts))
+
+    def test_vendor_calls_apply_the_timeouts(self):
+        adapter = RecordingAdapter()
+        self.session.mount(config.API_BASE_URL, adapter)
+        tools = LogisticsTools()
+        with mock.patch.object(config, "SHIPPING_MATRIX_ENABLED", False):
+            tools.quote_fill("H100", 1)
+            tools.estimate_shipping("TW", "US")
+            tools.submit_orders([{"chip": "H100", "quantity": 1}], "PO-1")
+        expected = (config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT)
+        self.assertEqual(adapter.timeouts, [expected] * 3)
+
+
+class TestAsyncRetries(unittest.TestCase):
+    """LogisticsTools._request_async retries with the same policy as the session."""
+
+    def setUp(self):
+        self.calls = []
+        self.statuses = []
+        self.tools = LogisticsTools()
+
+        async def app(scope, receive, send):
+            await receive()
+            self.calls.append(scope["method"])
+            status = self.statuses.pop(0) if self.statuses else 200
+            await send({"type": "http.response.start", "status": status, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        self.app = app
+
+    def request(self, method, *statuses):
+        self.statuses[:] = statuses
+        self.calls.clear()
+
+        async def send():
+            async with httpx.AsyncClient(
+                base_url="http://vendor", transport=httpx.ASGITransport(app=self.app)
+            ) as client:
+                self.tools._async_client = client
+                return (await self.tools._request_async(method, "/v1/x")).status_code
+
+        # No backoff between attempts.
+        with mock.patch("tools.api.retry_delay", return_value=0):
+            try:
+                return asyncio.run(send()), len(self.calls)
+            except httpx.HTTPStatusError as e:
+                return e.response.status_code, len(self.calls)
+
+    def test_retried_and_final_statuses(self):
+        self.assertEqual(self.request("POST", 503, 429), (200, 3))
+        self.assertEqual(self.request("GET", 404), (404, 1))
+        attempts = config.HTTP_MAX_RETRIES + 1
+        self.assertEqual(self.request("POST", *[502] * 10), (502, attempts))
+
+
+if __name__ == "__main__":
+    unittest.main()
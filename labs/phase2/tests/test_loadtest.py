@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import functools
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+
+import loadtest
+from utils.http import load_mock_api_app
+
+LATENCY_KEYS = {"mean", "p50", "p95", "p99", "max"}
+
+
+class TestLoadtestSmoke(unittest.TestCase):
+    """A short loadtest.py run against the mock API in-process, with no server."""
+
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.output = os.path.join(tmp_dir, "results.json")
+        transport = httpx.ASGITransport(app=load_mock_api_app())
+        client = functools.partial(httpx.AsyncClient, transport=transport)
+        patcher = mock.patch.object(loadtest.httpx, "AsyncClient", client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_loadtest(self, *args):
+        argv = ["loadtest.py", "--url", "http://mock", "--duration", "0.3", "--warmup", "0.1"]
+        with mock.patch("sys.argv", argv + list(args)), contextlib.redirect_stdout(io.StringIO()):
+            return loadtest.main()
+
+    def test_results_file(self):
+        self.assertEqual(self.run_loadtest("--concurrency", "1,4", "-o", self.output), 0)
+        with open(self.output) as f:
+            results = json.load(f)
+        self.assertEqual(results["duration_seconds"], 0.3)
+        self.assertEqual([run["settings"]["concurrency"] for run in results["runs"]], [1, 4])
+
+        for run in results["runs"]:
+            self.assertGreater(run["requests"], 0)
+            self.assertGreater(run["rps"], 0)
+            self.assertEqual(set(run["latency_ms"]), LATENCY_KEYS)
+            self.assertEqual(set(run["statuses"]), {"200"})
+            self.assertEqual(set(run["endpoints"]), set(loadtest.ENDPOINTS))
+            for name, endpoint in run["endpoints"].items():
+                with self.subTest(concurrency=run["settings"]["concurrency"], endpoint=name):
+                    self.assertEqual(set(endpoint["latency_ms"]), LATENCY_KEYS)
+                    latency = endpoint["latency_ms"]
+                    self.assertLessEqual(latency["p50"], latency["p95"])
+                    self.assertLessEqual(latency["p95"], latency["p99"])
+            self.assertEqual(
+                sum(endpoint["requests"] for endpoint in run["endpoints"].values()),
+                run["requests"],
+            )
+
+    def test_baseline_comparison(self):
+        self.run_loadtest("--mix", "spot", "-o", self.output)
+        with open(self.output) as f:
+            results = json.load(f)
+        # Ten times the throughput and a tenth of the p99: this run regresses against it.
+        for run in results["runs"]:
+            run["rps"] *= 10
+            run["latency_ms"]["p99"] /= 10
+        with open(self.output, "w") as f:
+            json.dump(results, f)
+        self.assertEqual(self.run_loadtest("--mix", "spot", "--baseline", self.output), 1)
+
+
+class TestSerializers(unittest.TestCase):
+    def test_json_is_always_available(self):
+        self.assertEqual(loadtest.parse_serializers("json"), ["json"])
+
+    def test_unknown_or_missing_serializers_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Unknown serializers"):
+            loadtest.parse_serializers("json,pickle")
+        with mock.patch.object(loadtest.importlib.util, "find_spec", return_value=None):
+            with self.assertRaisesRegex(ValueError, r"not installed: \['ujson'\]"):
+                loadtest.parse_serializers("json,ujson")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from catalog import Catalog
+from order_book import Market, Offer, OrderBook
+
+
+def ladder(fills):
+    return [(fill["offer_id"], fill["quantity"]) for fill in fills]
+
+
+class TestOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.book = OrderBook()
+        self.book.upsert(Offer("a", "Acme", price=300, quantity=10, lead_time_days=5))
+        self.book.upsert(Offer("b", "Bolt", price=100, quantity=5, lead_time_days=9))
+        self.book.upsert(Offer("c", "Core", price=100, quantity=5, lead_time_days=2))
+
+    def test_fill_walks_cheapest_first(self):
+        # Equal asks go to the shorter lead time.
+        self.assertEqual(ladder(self.book.fill(12)), [("c", 5), ("b", 5), ("a", 2)])
+
+    def test_fill_is_partial_when_liquidity_runs_out(self):
+        self.assertEqual(sum(f["quantity"] for f in self.book.fill(100)), 20)
+
+    def test_fill_does_not_consume(self):
+        first = self.book.fill(12)
+        self.assertEqual(self.book.fill(12), first)
+
+    def test_upsert_reprices_and_remove_drops(self):
+        self.book.upsert(Offer("a", "Acme", price=50, quantity=10, lead_time_days=5))
+        self.book.remove("c")
+        self.assertEqual(ladder(self.book.fill(12)), [("a", 10), ("b", 2)])
+
+    def test_take_consumes_liquidity(self):
+        self.assertEqual(ladder(self.book.take(7)), [("c", 5), ("b", 2)])
+        self.assertEqual(ladder(self.book.fill(20)), [("b", 3), ("a", 10)])
+        # A sold-out offer comes back when an update restocks it.
+        self.book.upsert(Offer("c", "Core", price=100, quantity=1, lead_time_days=2))
+        self.assertEqual(ladder(self.book.fill(1)), [("c", 1)])
+
+    def test_take_by_vendor_and_max_price(self):
+        self.assertEqual(ladder(self.book.take(20, vendor="Acme")), [("a", 10)])
+        self.assertEqual(ladder(self.book.take(20, max_price=100)), [("c", 5), ("b", 5)])
+        self.assertEqual(self.book.take(1, max_price=100), [])
+
+    def test_orphaned_entries_are_compacted(self):
+        for price in range(1000):
+            self.book.upsert(Offer("a", "Acme", price=price, quantity=1, lead_time_days=1))
+        self.assertLessEqual(len(self.book._heap), 2 * len(self.book.offers) + 64)
+        # Only the latest version of the offer is live.
+        self.assertEqual(ladder(self.book.fill(11)), [("c", 5), ("b", 5), ("a", 1)])
+        self.assertEqual(self.book.fill(11)[-1]["price"], 999)
+
+
+class TestMarket(unittest.TestCase):
+    def test_quote_fill_combines_catalog_and_offers(self):
+        catalog = Catalog(
+            {"chips": [{"chip": "H100", "vendor": "Acme", "price": 200, "availability": 4}]}
+        )
+        market = Market(
+            catalog,
+            {
+                "offers": [
+                    {"chip": "h100", "vendor": "Bolt", "price": 150, "quantity": 3,
+                     "lead_time_days": 7}
+                ]
+            },
+        )
+        quote = market.quote_fill("NVIDIA H100 80GB", 5)
+        self.assertEqual(quote["chip"], "H100")
+        self.assertTrue(quote["complete"])
+        self.assertEqual(quote["total_cost"], 3 * 150 + 2 * 200)
+        self.assertEqual(quote["max_lead_time_days"], 7)
+        self.assertEqual(market.quote_fill("ZZZ", 1)["filled"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
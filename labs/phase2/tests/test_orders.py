@@ -0,0 +1,122 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+import uuid
+
+import requests
+
+from catalog import Catalog
+from order_book import Market
+from orders import OrderDesk
+from tools.api import LogisticsTools
+
+
+def line(key, quantity, **extra):
+    return {"idempotency_key": key, "chip": "H100", "quantity": quantity, **extra}
+
+
+class TestOrderDesk(unittest.TestCase):
+    def setUp(self):
+        catalog = Catalog(
+            {"chips": [{"chip": "H100", "vendor": "Acme", "price": 200, "availability": 10}]}
+        )
+        self.market = Market(catalog, {})
+        self.desk = OrderDesk(self.market)
+
+    def test_replay_returns_the_original_confirmation(self):
+        first = self.desk.submit([line("po:0", 4)])[0]
+        again = self.desk.submit([line("po:0", 4)])[0]
+        self.assertEqual(first["status"], "confirmed")
+        self.assertFalse(first["replayed"])
+        self.assertTrue(again["replayed"])
+        self.assertEqual(again["order_id"], first["order_id"])
+        # The replay did not take from the book again.
+        self.assertEqual(self.market.quote_fill("H100", 100)["filled"], 6)
+
+    def test_reused_key_for_a_different_line_is_rejected(self):
+        self.desk.submit([line("po:0", 4)])
+        conflict = self.desk.submit([line("po:0", 5)])[0]
+        self.assertEqual(conflict["status"], "rejected")
+        self.assertIn("different order line", conflict["note"])
+        self.assertEqual(self.market.quote_fill("H100", 100)["filled"], 6)
+
+    def test_partial_and_rejected_lines(self):
+        results = self.desk.submit(
+            [
+                line("a", 12),
+                line("b", 1),
+                {"idempotency_key": "c", "chip": "ZZZ", "quantity": 1},
+                line("d", 1, max_price=100),
+            ]
+        )
+        self.assertEqual([r["status"] for r in results], ["partial"] + ["rejected"] * 3)
+        self.assertEqual(results[0]["filled"], 10)
+
+
+class TestSubmitOrders(unittest.TestCase):
+    """LogisticsTools.submit_orders against the mock API, in-process."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tools = LogisticsTools()
+
+    def setUp(self):
+        self.order_ref = f"PO-{uuid.uuid4().hex[:8]}"
+
+    def test_resubmitting_an_order_replays_it(self):
+        lines = [{"chip": "A100", "quantity": 1}, {"chip": "A100", "quantity": 2}]
+        first = self.tools.submit_orders(lines, self.order_ref)
+        again = self.tools.submit_orders(lines, self.order_ref)
+        self.assertEqual(first["confirmed"], 2)
+        self.assertEqual(
+            [c["order_id"] for c in again["confirmations"]],
+            [c["order_id"] for c in first["confirmations"]],
+        )
+        self.assertTrue(all(c["replayed"] for c in again["confirmations"]))
+
+    def test_changed_line_under_the_same_order_ref_is_rejected(self):
+        self.tools.submit_orders([{"chip": "A100", "quantity": 1}], self.order_ref)
+        result = self.tools.submit_orders([{"chip": "A100", "quantity": 3}], self.order_ref)
+        self.assertEqual(result["rejected"], 1)
+
+    def test_async_variant_replays_the_sync_one(self):
+        lines = [{"chip": "A100", "quantity": 1}]
+        first = self.tools.submit_orders(lines, self.order_ref)
+        again = asyncio.run(self.tools.submit_orders_async(lines, self.order_ref))
+        self.assertEqual(
+            again["confirmations"][0]["order_id"], first["confirmations"][0]["order_id"]
+        )
+
+    def test_http_errors_show_the_server_detail(self):
+        result = self.tools.submit_orders([{"chip": "A100", "quantity": -1}], self.order_ref)
+        self.assertEqual(result["failed"], 1)
+        self.assertTrue(result["confirmations"][0]["note"].startswith("Order API returned 422"))
+
+    def test_connection_errors_are_unreachable(self):
+        error = requests.ConnectionError("connection refused")
+        note = LogisticsTools._failed_lines([line("k", 1)], error)[0]["note"]
+        self.assertEqual(note, "Order API unreachable: connection refused")
+
+    def test_unconfirmed_lines_are_reported_failed(self):
+        summary = LogisticsTools._order_summary(
+            "PO", ["a", "b"], [[{"idempotency_key": "a", "status": "confirmed"}]]
+        )
+        self.assertEqual((summary["confirmed"], summary["failed"]), (1, 1))
+        self.assertEqual(summary["confirmations"][1]["idempotency_key"], "b")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from unittest import mock
+
+import requests
+
+from tools import price_book
+from tools.api import LogisticsTools
+from tools.price_book import PriceBook
+from utils.config import config
+
+
+def event(chip, price, name="tick"):
+    return [f"event: {name}", f"data: {json.dumps({'chip': chip, 'price': price})}", ""]
+
+
+class FakeStream:
+    """A streamed response whose lines are checked against the book as they are read."""
+
+    def __init__(self, lines, on_line=None):
+        self.lines = lines
+        self.on_line = on_line
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def iter_lines(self, decode_unicode=False):
+        for line in self.lines:
+            if self.on_line is not None:
+                self.on_line(line)
+            yield line
+
+
+class TestEventParsing(unittest.TestCase):
+    def setUp(self):
+        self.book = PriceBook("http://vendor")
+
+    def test_events_update_the_book(self):
+        self.book._consume(FakeStream(event("H100", 1, "snapshot") + event("h100", 2)))
+        self.assertEqual(self.book.get(" h100 "), {"chip": "h100", "price": 2})
+        self.assertEqual(self.book.events_received, 2)
+
+    def test_comments_and_unknown_fields_are_ignored(self):
+        lines = [": heartbeat", "id: 7", "retry: 1000"]
+        lines += ['data:{"chip": "A100",', 'data: "price": 5}', ""]
+        self.book._consume(FakeStream(lines))
+        # Multi-line data is joined with newlines; "data:" needs no space.
+        self.assertEqual(self.book.get("A100"), {"chip": "A100", "price": 5})
+
+    def test_partial_event_is_dropped(self):
+        lines = event("H100", 1) + ["event: tick", 'data: {"chip": "H100", "price": 9}']
+        self.book._consume(FakeStream(lines))
+        self.assertEqual(self.book.get("H100")["price"], 1)
+        self.assertEqual(self.book.events_received, 1)
+
+    def test_unknown_chip_and_empty_book(self):
+        self.assertIsNone(self.book.get("H100"))
+        self.book._consume(FakeStream(event("H100", 1)))
+        self.assertIsNone(self.book.get("B200"))
+
+
+class TestReconnects(unittest.TestCase):
+    def setUp(self):
+        self.book = PriceBook("http://vendor")
+        self.delays = []
+        self.connected_while_streaming = []
+
+        def wait(delay):
+            # Stands in for the backoff sleep; stop after a few reconnects.
+            self.delays.append(delay)
+            if len(self.delays) == 4:
+                self.book._stopped.set()
+
+        patcher = mock.patch.object(self.book._stopped, "wait", side_effect=wait)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def record_connection(self, line):
+        self.connected_while_streaming.append(self.book.get("H100") is not None)
+
+    def run_with(self, responses):
+        with mock.patch.object(price_book.requests, "get", side_effect=responses) as get:
+            self.book._run()
+        return get
+
+    def test_backoff_resets_after_a_connection(self):
+        refused = requests.ConnectionError("refused")
+        stream = FakeStream(event("H100", 1), on_line=self.record_connection)
+        get = self.run_with([refused, refused, stream, refused])
+
+        self.assertEqual(get.call_count, 4)
+        factor = config.HTTP_BACKOFF_FACTOR
+        self.assertEqual(self.delays, [factor, factor * 2, factor, factor * 2])
+        self.assertEqual(self.book.reconnects, 4)
+        self.assertTrue(stream.closed)
+
+    def test_get_returns_none_once_disconnected(self):
+        stream = FakeStream(event("H100", 1) + [": heartbeat"], on_line=self.record_connection)
+        self.run_with([stream] + [requests.ConnectionError("refused")] * 3)
+        # Connected from the first event until the stream ended.
+        self.assertEqual(self.connected_while_streaming, [False, False, False, True])
+        self.assertFalse(self.book.connected)
+        self.assertIsNone(self.book.get("H100"))
+
+    def test_malformed_event_drops_the_connection(self):
+        stream = FakeStream(["data: not json", ""])
+        self.run_with([stream] + [requests.ConnectionError("refused")] * 3)
+        self.assertEqual(self.book.events_received, 0)
+        self.assertEqual(len(self.delays), 4)
+
+
+class TestStreamedSpotPrices(unittest.TestCase):
+    """fetch_spot_prices with a price book, against the mock API in-process."""
+
+    def setUp(self):
+        self.tools = LogisticsTools()
+        self.tools.price_book = PriceBook(self.tools.base_url)
+        patcher = mock.patch.object(self.tools, "_get_json", wraps=self.tools._get_json)
+        self.get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_live_book_answers_without_a_request(self):
+        self.tools.price_book._consume(FakeStream(event("H100", 1)))
+        self.assertEqual(self.tools.fetch_spot_prices("h100"), {"chip": "H100", "price": 1})
+        batch = self.tools.fetch_spot_prices_batch(["H100"])
+        self.assertEqual(batch, {"quotes": [{"chip": "H100", "price": 1}]})
+        self.get.assert_not_called()
+
+    def test_disconnected_book_falls_back_to_polling(self):
+        self.tools.price_book._consume(FakeStream(event("H100", 1)))
+        self.tools.price_book._connected.clear()
+        quote = self.tools.fetch_spot_prices("H100")
+        self.assertNotEqual(quote["price"], 1)
+        self.get.assert_called_once_with("/v1/market/spot", {"chip": "H100"})
+
+    def test_chip_missing_from_the_book_is_polled(self):
+        self.tools.price_book._consume(FakeStream(event("H100", 1)))
+        with mock.patch.object(
+            self.tools, "_post_json", wraps=self.tools._post_json
+        ) as post:
+            batch = self.tools.fetch_spot_prices_batch(["H100", "A100"])
+        self.assertEqual(len(batch["quotes"]), 2)
+        post.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from tools import api
+from tools.api import SPOT_ENDPOINT, LogisticsTools, QuoteCache
+
+TTL = 30
+STALE = 120
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Source:
+    """A quote fetch that counts its calls and can be made to fail."""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {"chip": "H100", "price": 100 + self.calls}
+
+
+class ClockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        # utils.cache shares the time module, so entry expiry follows the clock too.
+        patcher = mock.patch.object(api.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestQuoteCache(ClockTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = QuoteCache({SPOT_ENDPOINT: TTL}, stale_seconds=STALE, max_entries=8)
+        self.cache.store(SPOT_ENDPOINT, "H100", {"price": 1})
+
+    def test_fresh_then_stale_then_expired(self):
+        self.assertEqual(self.cache.lookup(SPOT_ENDPOINT, "H100"), ({"price": 1}, "fresh"))
+        self.clock.now += TTL
+        self.assertEqual(self.cache.lookup(SPOT_ENDPOINT, "H100"), ({"price": 1}, "stale"))
+        self.clock.now += STALE
+        self.assertEqual(self.cache.lookup(SPOT_ENDPOINT, "H100"), (None, "miss"))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["stale_hits"], stats["misses"]), (1, 1, 1))
+
+    def test_lookups_return_copies(self):
+        quote, _ = self.cache.lookup(SPOT_ENDPOINT, "H100")
+        quote["price"] = 2
+        self.assertEqual(self.cache.lookup(SPOT_ENDPOINT, "H100")[0], {"price": 1})
+
+    def test_one_refresh_at_a_time(self):
+        self.assertTrue(self.cache.claim_refresh(SPOT_ENDPOINT, "H100"))
+        self.assertFalse(self.cache.claim_refresh(SPOT_ENDPOINT, "H100"))
+        self.assertTrue(self.cache.claim_refresh(SPOT_ENDPOINT, "A100"))
+        self.cache.release_refresh(SPOT_ENDPOINT, "H100", succeeded=True)
+        self.assertTrue(self.cache.claim_refresh(SPOT_ENDPOINT, "H100"))
+
+
+class TestCachedQuote(ClockTestCase):
+    """LogisticsTools._cached_quote, with background refreshes run by hand."""
+
+    def setUp(self):
+        super().setUp()
+        self.tools = LogisticsTools()
+        self.tools._quotes = QuoteCache(
+            {SPOT_ENDPOINT: TTL}, stale_seconds=STALE, max_entries=8
+        )
+        self.tools._refresher = mock.Mock()
+        self.source = Source()
+
+    def quote(self):
+        return self.tools._cached_quote(SPOT_ENDPOINT, "H100", self.source)
+
+    def run_refreshes(self):
+        for submitted in self.tools._refresher.submit.call_args_list:
+            function, *args = submitted.args
+            function(*args)
+        self.tools._refresher.submit.reset_mock()
+
+    def test_fresh_hit_does_not_fetch(self):
+        self.assertEqual(self.quote()["price"], 101)
+        self.clock.now += TTL - 1
+        self.assertEqual(self.quote()["price"], 101)
+        self.assertEqual(self.source.calls, 1)
+        self.tools._refresher.submit.assert_not_called()
+
+    def test_stale_hit_refreshes_once_in_the_background(self):
+        self.quote()
+        self.clock.now += TTL
+        # Both callers get the old quote at once; only one refresh is started.
+        self.assertEqual([self.quote()["price"], self.quote()["price"]], [101, 101])
+        self.assertEqual(self.tools._refresher.submit.call_count, 1)
+        self.assertEqual(self.source.calls, 1)
+
+        self.run_refreshes()
+        self.assertEqual(self.source.calls, 2)
+        self.assertEqual(self.quote()["price"], 102)
+        self.assertEqual(self.tools.quote_cache_stats()["refreshes"], 1)
+
+    def test_expired_quote_is_fetched_inline(self):
+        self.quote()
+        self.clock.now += TTL + STALE
+        self.assertEqual(self.quote()["price"], 102)
+        self.tools._refresher.submit.assert_not_called()
+
+    def test_failed_refresh_keeps_serving_the_stale_quote(self):
+        self.quote()
+        self.clock.now += TTL
+        self.source.error = RuntimeError("vendor down")
+        self.quote()
+        self.run_refreshes()
+        self.assertEqual(self.tools.quote_cache_stats()["refresh_errors"], 1)
+
+        # The stale quote is still served, and the next lookup may refresh again.
+        self.assertEqual(self.quote()["price"], 101)
+        self.assertEqual(self.tools._refresher.submit.call_count, 1)
+
+
+class TestSpotPriceKeys(unittest.TestCase):
+    """Spot quotes against the mock API, in-process."""
+
+    def setUp(self):
+        self.tools = LogisticsTools()
+        patcher = mock.patch.object(self.tools, "_get_json", wraps=self.tools._get_json)
+        self.get = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_spellings_of_a_chip_share_one_entry(self):
+        quotes = [self.tools.fetch_spot_prices(chip) for chip in ("H100", "h100", " H100 ")]
+        self.assertEqual(quotes[0]["chip"], "H100")
+        self.assertEqual(quotes[1:], quotes[:1] * 2)
+        self.assertEqual(self.get.call_count, 1)
+
+    def test_batch_reuses_single_quotes(self):
+        single = self.tools.fetch_spot_prices("h100")
+        with mock.patch.object(
+            self.tools, "_post_json", wraps=self.tools._post_json
+        ) as post:
+            batch = self.tools.fetch_spot_prices_batch(["H100", "a100", "A100 "])
+        self.assertEqual(batch["quotes"][0], single)
+        self.assertEqual(batch["quotes"][1], batch["quotes"][2])
+        post.assert_called_once_with("/v1/market/spot:batch", {"chips": ["A100"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from routing import HubGraph
+
+
+def leg(src, dst, days, cost, method="sea", **extra):
+    return {"from": src, "to": dst, "method": method, "days": days, "cost_per_unit": cost,
+            **extra}
+
+
+class TestHubGraph(unittest.TestCase):
+    def setUp(self):
+        # TW-US direct by air is fast and dear; via SG and NL by sea is slow and cheap.
+        self.graph = HubGraph(
+            {
+                "legs": [
+                    leg("TW", "US", 2, 90, method="air"),
+                    leg("TW", "SG", 4, 10),
+                    leg("SG", "NL", 12, 15),
+                    leg("NL", "US", 8, 20),
+                    leg("SG", "US", 20, 60),
+                    leg("US", "MX", 1, 5, one_way=True),
+                    leg("JP", "KR", 1, 5),
+                ],
+                "hot_origins": ["tw"],
+            }
+        )
+
+    def test_cheapest_route(self):
+        route = self.graph.plan("tw", "us", "cost")
+        self.assertEqual(route["route"], "TW-SG-NL-US")
+        self.assertEqual((route["cost_per_unit"], route["days"]), (45, 24))
+        self.assertEqual([l["from"] for l in route["legs"]], ["TW", "SG", "NL"])
+
+    def test_fastest_route(self):
+        route = self.graph.plan("TW", "US", "time")
+        self.assertEqual(route["route"], "TW-US")
+        self.assertEqual(route["legs"][0]["method"], "air")
+
+    def test_legs_run_both_ways_unless_one_way(self):
+        self.assertEqual(self.graph.plan("US", "TW", "cost")["route"], "US-NL-SG-TW")
+        self.assertEqual(self.graph.plan("TW", "MX", "cost")["route"], "TW-SG-NL-US-MX")
+        self.assertEqual(self.graph.plan("MX", "US")["note"], "No route between these hubs.")
+
+    def test_unknown_and_unreachable_hubs(self):
+        self.assertEqual(self.graph.plan("TW", "XX")["note"], "Unknown shipping hub.")
+        self.assertEqual(self.graph.plan("TW", "KR")["legs"], [])
+
+    def test_same_hub(self):
+        route = self.graph.plan("TW", "TW")
+        self.assertEqual((route["route"], route["days"], route["legs"]), ("TW", 0, []))
+
+    def test_hot_origin_trees_are_precomputed(self):
+        before = self.graph._trees.cache_info()
+        self.assertEqual(before.currsize, 2)
+        self.graph.plan("TW", "US", "time")
+        self.assertEqual(self.graph._trees.cache_info().hits, before.hits + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from fakes import FakeBigQueryClient, FakeTable
+from tools.database import SAMPLE_ROW_COUNT, DatabaseTools
+from tools.local_database import SQLiteDatabaseTools
+from utils.config import config
+
+TABLE_ID = "test-project.gpu_procurement_db.LEGACY_INV_MAIN_V2"
+VIEW_ID = "test-project.gpu_procurement_db.INVENTORY_VIEW"
+
+
+class TestSchemaPreview(unittest.TestCase):
+    """explore_schema on a BigQuery fake, with the schema cache in a scratch directory."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        patcher = mock.patch.object(config, "SCHEMA_CACHE_DIR", self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = FakeBigQueryClient(rows=[{"ITEM_REF_ID": "from a query"}])
+        rows = [{"ITEM_REF_ID": f"REF_{n}", "QOH_RAW_VAL": str(n)} for n in range(8)]
+        self.table = FakeTable(TABLE_ID, rows)
+        self.client.tables = {TABLE_ID: self.table, VIEW_ID: FakeTable(VIEW_ID, [], "VIEW")}
+
+    def tools(self):
+        """A new DatabaseTools, as a fresh process would create, on the same client."""
+        with mock.patch.object(DatabaseTools, "_create_client", return_value=self.client):
+            return DatabaseTools()
+
+    def explore(self, table_name, tools=None):
+        self.client.calls.clear()
+        return (tools or self.tools()).explore_schema(table_name)
+
+    def test_table_sample_is_listed_without_a_query(self):
+        result = self.explore("LEGACY_INV_MAIN_V2")
+        self.assertEqual(result["fully_qualified_id"], TABLE_ID)
+        self.assertEqual(
+            result["schema_fields"], ["ITEM_REF_ID (STRING)", "QOH_RAW_VAL (STRING)"]
+        )
+        self.assertEqual(result["sample_rows"], self.table.rows[:SAMPLE_ROW_COUNT])
+        self.assertEqual(self.client.calls, ["get_table", "list_rows"])
+
+    def test_view_sample_falls_back_to_a_query(self):
+        result = self.explore(VIEW_ID)
+        self.assertEqual(result["sample_rows"], [{"ITEM_REF_ID": "from a query"}])
+        self.assertIn("query", self.client.calls)
+        self.assertNotIn("list_rows", self.client.calls)
+
+    def test_preview_is_reused_across_instances(self):
+        tools = self.tools()
+        first = self.explore(TABLE_ID, tools)
+        self.assertEqual(self.explore(TABLE_ID, tools), first)
+        self.assertEqual(self.client.calls, ["get_table"])
+        # A new instance reads the preview back from disk.
+        self.assertEqual(self.explore(TABLE_ID), first)
+        self.assertEqual(self.client.calls, ["get_table"])
+
+    def test_table_change_invalidates_the_preview(self):
+        tools = self.tools()
+        self.explore(TABLE_ID, tools)
+        self.table.rows.insert(0, {"ITEM_REF_ID": "REF_NEW", "QOH_RAW_VAL": "1"})
+        self.table.touch()
+        for fresh in (tools, self.tools()):
+            with self.subTest(fresh_instance=fresh is not tools):
+                result = self.explore(TABLE_ID, fresh)
+                self.assertEqual(result["sample_rows"][0]["ITEM_REF_ID"], "REF_NEW")
+        # The first instance re-listed the rows and cached them for the second.
+        self.assertEqual(self.client.calls, ["get_table"])
+
+    def test_cache_file_is_created_on_first_preview(self):
+        cache_file = os.path.join(self.cache_dir, "schema_previews.sqlite")
+        tools = self.tools()
+        self.assertFalse(os.path.exists(cache_file))
+        self.explore(TABLE_ID, tools)
+        self.assertTrue(os.path.exists(cache_file))
+
+    def test_sqlite_creates_no_schema_cache(self):
+        db = SQLiteDatabaseTools(db_path=":memory:")
+        self.assertNotIn("error", db.explore_schema("LEGACY_INV_MAIN_V2"))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_missing_table(self):
+        result = self.explore("NO_SUCH_TABLE")
+        self.assertIn("error", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
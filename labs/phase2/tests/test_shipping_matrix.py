@@ -0,0 +1,151 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+from unittest import mock
+
+import requests
+
+from catalog import Catalog
+from tools import api
+from tools.api import LogisticsTools, ShippingMatrix
+from utils.config import config
+
+ROUTES = [
+    {"origin": "TW", "dest": "US", "days": 14, "method": "AIR_FREIGHT_RUSH", "cost_per_unit": 150},
+    {"origin": "KR", "dest": "US", "days": 30, "method": "STANDARD_SEA", "cost_per_unit": 80.5},
+    {"origin": "TW", "dest": "DE", "days": 20, "method": "AIR_FREIGHT_RUSH", "cost_per_unit": 120},
+]
+DEFAULT_ROUTE = {"days": 45, "method": "STANDARD_SEA", "cost_per_unit": 50}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestShippingMatrix(unittest.TestCase):
+    def setUp(self):
+        self.catalog = Catalog({"routes": ROUTES, "default_route": DEFAULT_ROUTE})
+        self.matrix = ShippingMatrix(self.catalog.shipping_matrix(), '"v1"')
+
+    def test_arrays_decode_to_the_table_shape(self):
+        self.assertEqual(self.matrix._arrays["days"].shape, (2, 2))
+        self.assertEqual(self.matrix._arrays["cost_per_unit"].dtype.name, "float64")
+
+    def test_estimates_match_the_vendor(self):
+        for origin, dest in [("TW", "US"), ("kr", "us"), (" TW", "DE "), ("KR", "DE")]:
+            with self.subTest(route=f"{origin}-{dest}"):
+                self.assertEqual(
+                    self.matrix.estimate(origin, dest), self.catalog.find_route(origin, dest)
+                )
+
+    def test_unlisted_locations_are_not_answered(self):
+        self.assertIsNone(self.matrix.estimate("XX", "US"))
+        self.assertIsNone(self.matrix.estimate("TW", "ZZ"))
+
+
+class TestShippingEstimates(unittest.TestCase):
+    """estimate_shipping against the mock API, in-process."""
+
+    def setUp(self):
+        self.tools = LogisticsTools()
+        self.clock = FakeClock()
+        self.session_get = self.tools.session.get
+        patchers = [
+            mock.patch.object(api.time, "monotonic", self.clock),
+            mock.patch.object(self.tools.session, "get", wraps=self.session_get),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def requests_to(self, path):
+        return [
+            call for call in self.tools.session.get.call_args_list if call.args[0].endswith(path)
+        ]
+
+    def test_known_route_is_answered_locally(self):
+        expected = self.tools._get_json("/v1/shipping/estimate", {"origin": "TW", "dest": "US"})
+        self.assertEqual(self.tools.estimate_shipping("tw", "us"), expected)
+        self.assertEqual(self.tools.estimate_shipping("TW", "US"), expected)
+        self.assertEqual(len(self.requests_to("/v1/shipping/matrix")), 1)
+        self.assertEqual(len(self.requests_to("/v1/shipping/estimate")), 1)
+
+    def test_unknown_location_asks_the_endpoint(self):
+        quote = self.tools.estimate_shipping("XX", "US")
+        self.assertEqual(quote, {"route": "XX-US", **self.tools._matrix._default_route})
+        self.assertEqual(len(self.requests_to("/v1/shipping/estimate")), 1)
+
+    def test_batch_asks_only_for_unknown_routes(self):
+        with mock.patch.object(
+            self.tools, "_post_json", wraps=self.tools._post_json
+        ) as post:
+            quotes = self.tools.estimate_shipping_batch(["TW-US", "XX-US", "tw-us", "KR"])
+        self.assertEqual(
+            [quote["route"] for quote in quotes["quotes"]], ["TW-US", "XX-US", "TW-US", "KR-US"]
+        )
+        post.assert_called_once_with(
+            "/v1/shipping/estimate:batch",
+            {"routes": [{"origin": "XX", "dest": "US"}, {"origin": "KR", "dest": "US"}]},
+        )
+
+    def test_async_matches_sync(self):
+        routes = ["TW-US", "XX-US", "TW-DE"]
+        expected = self.tools.estimate_shipping_batch(routes)
+        tools = LogisticsTools()
+        self.assertEqual(asyncio.run(tools.estimate_shipping_batch_async(routes)), expected)
+        self.assertEqual(
+            asyncio.run(tools.estimate_shipping_async("XX", "US")), expected["quotes"][1]
+        )
+
+    def test_matrix_is_revalidated_with_its_etag(self):
+        self.tools.estimate_shipping("TW", "US")
+        matrix = self.tools._matrix
+        self.clock.now += config.SHIPPING_MATRIX_REVALIDATE_SECONDS - 1
+        self.tools.estimate_shipping("TW", "US")
+        self.assertEqual(len(self.requests_to("/v1/shipping/matrix")), 1)
+
+        # Unchanged: 304 Not Modified, and the same copy stays in use.
+        self.clock.now += 1
+        self.tools.estimate_shipping("TW", "US")
+        revalidation = self.requests_to("/v1/shipping/matrix")[-1]
+        self.assertEqual(revalidation.kwargs["headers"], {"If-None-Match": matrix.etag})
+        self.assertIs(self.tools._matrix, matrix)
+
+        # Changed (the ETag no longer matches): the new table replaces it.
+        matrix.etag = '"outdated"'
+        self.clock.now += config.SHIPPING_MATRIX_REVALIDATE_SECONDS
+        self.tools.estimate_shipping("TW", "US")
+        self.assertIsNot(self.tools._matrix, matrix)
+        self.assertEqual(self.tools._matrix.version, matrix.version)
+
+    def test_unavailable_matrix_falls_back_to_the_endpoint(self):
+        def no_matrix(url, **kwargs):
+            if url.endswith("/v1/shipping/matrix"):
+                raise requests.ConnectionError("matrix unavailable")
+            return self.session_get(url, **kwargs)
+
+        self.tools.session.get.side_effect = no_matrix
+        self.assertEqual(self.tools.estimate_shipping("TW", "US")["route"], "TW-US")
+        self.assertIsNone(self.tools._matrix)
+        self.assertEqual(len(self.requests_to("/v1/shipping/estimate")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -43,18 +43,26 @@ echo -e "${BLUE}🚀 Running Vertex AI L400 Lab 2 Demo for Phase $PHASE_NUM...${
 # --- Step 1: The External World (Mock API) ---
 echo -e "\n${BLUE}[1/2] Launching Mock Spot Market API...${NC}"
 
-# Kill any existing process on port 8080 to avoid conflicts
-fuser -k $API_PORT/tcp > /dev/null 2>&1
-
-# Start API in background
-cd assets/mock_api
-uvicorn main:app --host $API_HOST --port $API_PORT > ../../api_logs.txt 2>&1 &
-API_PID=$!
-cd ../..
-
-echo "✅ API running in background (PID: $API_PID). Logs at ./api_logs.txt"
-echo "   Waiting 5 seconds for API to warm up..."
-sleep 5
+if [ "$API_TRANSPORT" = "asgi" ]; then
+    # The agents call the mock API in-process (utils/http.py); no server to start.
+    echo "✅ API_TRANSPORT=asgi: serving the mock API in-process."
+else
+    # Kill any existing process on port 8080 to avoid conflicts
+    fuser -k $API_PORT/tcp > /dev/null 2>&1
+
+    # Start API in background
+    cd assets/mock_api
+    uvicorn main:app --host $API_HOST --port $API_PORT > ../../api_logs.txt 2>&1 &
+    API_PID=$!
+    cd ../..
+
+    echo "✅ API running in background (PID: $API_PID). Logs at ./api_logs.txt"
+    echo "   Waiting for the API to answer..."
+    if ! scripts/wait_for_api.sh "http://$API_HOST:$API_PORT/" 30 $API_PID; then
+        echo -e "${RED}❌ Mock API failed to start. See ./api_logs.txt${NC}"
+        exit 1
+    fi
+fi
 
 # --- Step 2: The War Room (Agents) ---
 echo -e "\n${BLUE}[2/2] 🛡️ Launching ADK Web UI...${NC}"
@@ -70,7 +78,9 @@ adk web
 
 # --- Cleanup ---
 echo -e "\n${BLUE}🧹 Cleaning up...${NC}"
-#kill $API_PID
-fuser -k $API_PORT/tcp > /dev/null 2>&1
-echo "✅ Mock API stopped."
+if [ "$API_TRANSPORT" != "asgi" ]; then
+    #kill $API_PID
+    fuser -k $API_PORT/tcp > /dev/null 2>&1
+    echo "✅ Mock API stopped."
+fi
 echo -e "${GREEN}🏁 Demo Complete.${NC}"
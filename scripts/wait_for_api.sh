@@ -0,0 +1,40 @@
+#!/bin/bash
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Readiness probe: polls a URL until it answers 2xx, instead of sleeping a fixed time.
+# Usage: scripts/wait_for_api.sh <url> [timeout_seconds] [server_pid]
+# Exits non-zero on timeout, or as soon as the server process (if given) dies.
+
+URL=$1
+TIMEOUT=${2:-30}
+SERVER_PID=$3
+
+if [ -z "$URL" ]; then
+    echo "Usage: $0 <url> [timeout_seconds] [server_pid]"
+    exit 1
+fi
+
+DEADLINE=$((SECONDS + TIMEOUT))
+until curl --silent --fail --output /dev/null --max-time 1 "$URL"; do
+    if [ -n "$SERVER_PID" ] && ! kill -0 "$SERVER_PID" 2> /dev/null; then
+        echo "❌ Server process $SERVER_PID exited before becoming ready."
+        exit 1
+    fi
+    if [ $SECONDS -ge $DEADLINE ]; then
+        echo "❌ $URL not ready after ${TIMEOUT}s."
+        exit 1
+    fi
+    sleep 0.1
+done